@@ -0,0 +1,82 @@
+"""Estimate-mode benchmark: time of `estimate` against a full `generate_schedule`, and
+how often the full scheduler's result falls inside the estimate's bounds.
+
+    python -m benchmarks.bench_estimate
+    python -m benchmarks.bench_estimate --configs n50 n200 --seeds 20
+"""
+from pathlib import Path
+from time import perf_counter_ns
+import argparse
+import contextlib
+import datetime as dt
+import io
+import statistics
+import tempfile
+
+import src.services as ser
+from src.scheduling.estimate import estimate_user
+from benchmarks.bench_stages import PRESETS
+from benchmarks.synthetic import generate_catalog
+
+DEFAULT_CONFIGS = ["n50", "n200", "n500_grad"]
+
+
+def compare(name: str, seed: int, as_of: dt.date) -> dict | None:
+    """One catalog: schedule fully and estimate. None if the full scheduler fails."""
+    cat = generate_catalog(seed=seed, as_of=as_of, **PRESETS[name])
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        csv_path = cat.write_csv(str(Path(tmp) / f"{name}.csv"))
+        courses = ser.get_courses_pipeline(csv_path, True, cat.inperson_courses)
+        gib = ser.create_gib(27120.0, (8, 1), (23, 10), cat.first_ses_dt)
+        user = ser.create_new_user(cat.first_ses_dt, "bench", courses, 2015.0, gib)
+        restraints = ser.generate_restraints(**cat.restraints_kwargs())
+
+        t0 = perf_counter_ns()
+        est = estimate_user(user, restraints, as_of=as_of)
+        est_ns = perf_counter_ns() - t0
+        t0 = perf_counter_ns()
+        try:
+            ser.generate_schedule(user, restraints, cat.spread_between, as_of=as_of)
+        except Exception:
+            return None
+        full_ns = perf_counter_ns() - t0
+
+    future = [s for s in sorted(user.schedule) if s.start_date >= as_of and s.courses]
+    actual = {
+        "sessions": len(future),
+        "graduation": future[-1].end_date if future else as_of,
+        "cost": sum(s.adj_cost for s in future),
+    }
+    bounds = {"sessions": est.sessions, "graduation": est.graduation, "cost": est.cost}
+    return {
+        "est_us": est_ns / 1e3,
+        "full_ms": full_ns / 1e6,
+        "inside": {k: bounds[k][0] <= actual[k] <= bounds[k][1] for k in actual},
+        "sessions": (actual["sessions"], *est.sessions),
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--configs", nargs="+", default=DEFAULT_CONFIGS, choices=list(PRESETS))
+    ap.add_argument("--seeds", type=int, default=10)
+    args = ap.parse_args(argv)
+    as_of = dt.date.today()
+
+    print(f"{'config':<10} {'runs':>5} {'est us':>8} {'full ms':>8} {'ses in':>7} {'date in':>8} "
+          f"{'cost in':>8} {'ses lo/act/hi':>15}")
+    for name in args.configs:
+        rows = [r for r in (compare(name, s, as_of) for s in range(args.seeds)) if r]
+        if not rows:
+            print(f"{name:<10} {0:>5}  (full scheduler failed on every seed)")
+            continue
+        inside = {k: sum(r["inside"][k] for r in rows) / len(rows) for k in ("sessions", "graduation", "cost")}
+        act, lo, hi = (statistics.mean(r["sessions"][i] for r in rows) for i in range(3))
+        print(f"{name:<10} {len(rows):>5} {statistics.median(r['est_us'] for r in rows):>8.0f} "
+              f"{statistics.median(r['full_ms'] for r in rows):>8.1f} {inside['sessions']:>7.0%} "
+              f"{inside['graduation']:>8.0%} {inside['cost']:>8.0%} {lo:>5.1f}/{act:.1f}/{hi:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
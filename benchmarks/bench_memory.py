@@ -0,0 +1,91 @@
+"""Memory-bounded batch benchmark: peak RSS of a cohort run that keeps every scheduled
+User alive until export, against schedule_bounded with an RSS budget, plus per-stage
+peaks from MemoryProfile. Each mode runs in a fresh process so peaks don't mix.
+
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --config n200 --users 2000 --budget-mb 120
+"""
+from pathlib import Path
+import argparse
+import contextlib
+import copy
+import datetime as dt
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import src.services as ser
+from src.telemetry import MemoryProfile, rss_bytes
+from benchmarks.bench_stages import PRESETS
+from benchmarks.synthetic import generate_catalog
+
+
+def run(mode: str, config: str, users: int, budget_mb: float, trace: bool) -> dict:
+    as_of = dt.date.today()
+    cat = generate_catalog(seed=0, as_of=as_of, **PRESETS[config])
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        csv_path = cat.write_csv(str(Path(tmp) / f"{config}.csv"))
+        courses = ser.get_courses_pipeline(csv_path, True, cat.inperson_courses)
+        restraints = ser.generate_restraints(**cat.restraints_kwargs())
+
+        def cohort():
+            for i in range(users):
+                yield ser.create_new_user(cat.first_ses_dt, f"u{i}", copy.deepcopy(courses), 2015.0, None)
+
+        out = str(Path(tmp) / "cohort.ndjson")
+        start_rss = rss_bytes()
+        mem = MemoryProfile(trace=trace)
+        if mode == "hold_all":
+            held = []
+            for user in cohort():
+                with mem.stage("schedule"):
+                    ser.generate_schedule(user, restraints, cat.spread_between, as_of=as_of)
+                held.append(user)
+            with mem.stage("export"):
+                ser.export_batch(held, "ndjson", out)
+            stats = {"users": len(held), "spilled": 0}
+        else:
+            with ser.schedule_bounded(cohort(), restraints, cat.spread_between, catalog=courses,
+                                      budget_mb=budget_mb, memory=mem, as_of=as_of) as buf:
+                with mem.stage("export"):
+                    ser.export_batch(buf, "ndjson", out)
+                stats = buf.stats()
+        mem.close()
+    summary = mem.summary()
+    mb = 1 << 20
+    return {"mode": mode, "start_rss_mb": start_rss / mb,
+            "peak_rss_mb": max(v["peak_rss_bytes"] for v in summary.values()) / mb, **stats,
+            "stages": {k: {"peak_rss_mb": round(v["peak_rss_bytes"] / mb, 1),
+                           "peak_traced_mb": round(v["peak_traced_bytes"] / mb, 1), "count": v["count"]}
+                       for k, v in summary.items()}}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", default="n50", choices=list(PRESETS))
+    ap.add_argument("--users", type=int, default=2000)
+    ap.add_argument("--budget-mb", type=float, default=80)
+    ap.add_argument("--trace", action="store_true", help="Also record tracemalloc peaks (slower)")
+    ap.add_argument("--mode", default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.mode:
+        print(json.dumps(run(args.mode, args.config, args.users, args.budget_mb, args.trace)))
+        return 0
+    for mode in ("hold_all", "bounded"):
+        cmd = [sys.executable, "-m", "benchmarks.bench_memory", "--mode", mode, "--config", args.config,
+               "--users", str(args.users), "--budget-mb", str(args.budget_mb)] + (["--trace"] if args.trace else [])
+        r = json.loads(subprocess.run(cmd, capture_output=True, text=True, check=True).stdout)
+        print(f"{mode:<9} RSS start {r['start_rss_mb']:6.1f} MiB  peak {r['peak_rss_mb']:6.1f} MiB  "
+              f"users {r['users']}  spilled {r['spilled']}")
+        for stage, st in r["stages"].items():
+            print(f"    {stage:<9} x{st['count']:<5} peak RSS {st['peak_rss_mb']:6.1f} MiB"
+                  + (f"  traced {st['peak_traced_mb']:6.1f} MiB" if args.trace else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""Serialization benchmark: size and dumps/loads time of a scheduled User with
+default __dict__ pickling, the compact __getstate__ pickling and the binary codec.
+
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --configs n50 n200 --repeat 20
+"""
+from pathlib import Path
+from time import perf_counter_ns
+import argparse
+import contextlib
+import copyreg
+import io
+import pickle
+import sys
+import tempfile
+
+import src.services as ser
+from src.scheduling import Course, Session
+from src.storage import Catalog, encode_user, decode_user
+from src.user import User, GIB
+from src.user.gib import BenefitYear
+from benchmarks.bench_stages import PRESETS
+from benchmarks.synthetic import generate_catalog
+
+DEFAULT_CONFIGS = ["n50", "n200"]
+_MODEL_TYPES = (User, Course, Session, GIB, BenefitYear)
+
+
+def _set_dict(obj, state):
+    obj.__dict__.update(state)
+
+
+class DictPickler(pickle.Pickler):
+    """Pickles the model classes by their plain __dict__, as before they had
+    __getstate__/__reduce__. Used as the size/time reference."""
+    def reducer_override(self, obj):
+        if isinstance(obj, _MODEL_TYPES):
+            return copyreg.__newobj__, (type(obj),), dict(obj.__dict__), None, None, _set_dict
+        return NotImplemented
+
+
+def dict_dumps(obj) -> bytes:
+    buf = io.BytesIO()
+    DictPickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buf.getvalue()
+
+
+def scheduled_user(name: str, seed: int = 0):
+    """Schedule one user on a synthetic catalog. Returns (user, Catalog)."""
+    cat = generate_catalog(seed=seed, **PRESETS[name])
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        csv_path = cat.write_csv(str(Path(tmp) / f"{name}.csv"))
+        courses = ser.get_courses_pipeline(csv_path, True, cat.inperson_courses)
+        gib = ser.create_gib(27120.0, (8, 1), (23, 10), cat.first_ses_dt)
+        user = ser.create_new_user(cat.first_ses_dt, "bench", courses, 2015.0, gib)
+        ser.generate_schedule(user, ser.generate_restraints(**cat.restraints_kwargs()), cat.spread_between)
+    return user, Catalog(courses)
+
+
+def _best_us(fn, arg, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        t0 = perf_counter_ns()
+        fn(arg)
+        t = perf_counter_ns() - t0
+        best = t if best is None else min(best, t)
+    return best / 1e3
+
+
+def bench_config(name: str, repeat: int = 10, seed: int = 0) -> dict:
+    """Returns {method: {"bytes", "dumps_us", "loads_us"}} for one preset."""
+    user, catalog = scheduled_user(name, seed)
+    methods = {
+        "dict_pickle": (dict_dumps, pickle.loads),
+        "compact_pickle": (lambda u: pickle.dumps(u, pickle.HIGHEST_PROTOCOL), pickle.loads),
+        "codec": (lambda u: encode_user(u, catalog), lambda b: decode_user(b, catalog)),
+    }
+    out = {}
+    for method, (dumps, loads) in methods.items():
+        data = dumps(user)
+        out[method] = {
+            "bytes": len(data),
+            "dumps_us": round(_best_us(dumps, user, repeat), 1),
+            "loads_us": round(_best_us(loads, data, repeat), 1),
+        }
+    return out
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--configs", nargs="+", default=DEFAULT_CONFIGS, choices=sorted(PRESETS))
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for name in args.configs:
+        res = bench_config(name, repeat=args.repeat, seed=args.seed)
+        base = res["dict_pickle"]["bytes"]
+        for method, r in res.items():
+            print(f"{name:<6} {method:<15} {r['bytes']:>9} B  x{base / r['bytes']:5.1f}  "
+                  f"dumps={r['dumps_us']:>9.1f}us  loads={r['loads_us']:>9.1f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
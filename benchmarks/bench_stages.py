@@ -0,0 +1,181 @@
+"""Stage-level benchmark: times intake, prioritization, session creation, free scheduling
+and export on synthetic catalogs, tracks peak memory, and flags regressions against
+stored baselines.
+
+    python -m benchmarks.bench_stages                    # default configs vs baselines
+    python -m benchmarks.bench_stages --configs n5k      # opt-in larger catalogs
+    python -m benchmarks.bench_stages --update           # re-record baselines
+
+Exit code is 1 if any stage regressed past tolerance.
+"""
+from pathlib import Path
+from time import perf_counter_ns
+import argparse
+import contextlib
+import datetime as dt
+import io
+import json
+import sys
+import tempfile
+import tracemalloc
+
+import src.services as ser
+from src.telemetry import RunProfile
+from benchmarks.synthetic import generate_catalog
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+
+# Named catalog shapes. Defaults run in seconds; larger ones are opt-in.
+PRESETS = {
+    "n50": dict(n_courses=50, depth=4),
+    "n200": dict(n_courses=200, depth=6, or_density=0.3),
+    "n500": dict(n_courses=500, depth=8, inperson_frac=0.05),
+    "n500_grad": dict(n_courses=500, depth=8, grad_frac=0.3, fan_out=3),
+    "n5k": dict(n_courses=5_000, depth=12),
+    "n50k": dict(n_courses=50_000, depth=16),
+}
+DEFAULT_CONFIGS = ["n50", "n200", "n500"]
+
+# Reported stage -> RunProfile span names summed into it
+STAGES = {
+    "intake": ["fetch_data", "create_courses", "organize_courses", "prioritize_courses"],
+    "prioritization": ["prioritize_courses"],
+    "session_creation": ["create_all_sessions"],
+    "free_scheduling": ["schedule_free"],
+    "export": ["export_schedule"],
+}
+
+# Regressions smaller than this are treated as timer noise
+NOISE_FLOOR_MS = 2.0
+
+
+def run_pipeline(csv_path: str, cat, out_path: str) -> RunProfile:
+    """One full run on a synthetic catalog, timed into a RunProfile. Output is silenced."""
+    prof = RunProfile(csv_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        gib = ser.create_gib(
+            yearly_amount=27120.0,
+            start_dt=(8, 1),
+            remaining_time=(23, 10),
+            days_as_of=dt.date.today(),
+        )
+        courses = ser.get_courses_pipeline(
+            course_path=csv_path,
+            course_path_abs=True,
+            in_person=cat.inperson_courses,
+            profile=prof,
+        )
+        user = ser.create_new_user(
+            first_ses_dt=cat.first_ses_dt,
+            user_id="bench",
+            courses=courses,
+            grant_amnt_per_ses=2015.0,
+            gib=gib,
+            profile=prof,
+        )
+        restraints = ser.generate_restraints(**cat.restraints_kwargs())
+        ser.generate_schedule(user, restraints, cat.spread_between)
+        ser.export_schedule(user, path=out_path, absoloute=True)
+    return prof
+
+
+def bench_config(name: str, repeat: int = 3, seed: int = 0) -> dict:
+    """
+    Benchmark one preset.
+
+    Wall times are the best of `repeat` untraced runs, per stage. Peak memory comes
+    from one extra run under tracemalloc, so tracing overhead never skews timings.
+
+    Returns:
+        dict: {"wall_ms": {stage: float, "total": float}, "peak_kib": int}
+    """
+    cat = generate_catalog(seed=seed, **PRESETS[name])
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = cat.write_csv(str(Path(tmp) / f"{name}.csv"))
+        out_path = str(Path(tmp) / "schedule.csv")
+
+        best: dict[str, float] = {}
+        for _ in range(repeat):
+            t0 = perf_counter_ns()
+            prof = run_pipeline(csv_path, cat, out_path)
+            total = perf_counter_ns() - t0
+            totals = prof.totals()
+            times = {st: sum(totals.get(sp, 0) for sp in spans) / 1e6 for st, spans in STAGES.items()}
+            times["total"] = total / 1e6
+            for st, ms in times.items():
+                best[st] = min(best.get(st, ms), ms)
+
+        tracemalloc.start()
+        try:
+            run_pipeline(csv_path, cat, out_path)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "wall_ms": {k: round(v, 3) for k, v in best.items()},
+        "peak_kib": peak // 1024,
+    }
+
+
+def compare(results: dict, baselines: dict, tolerance: float) -> list[str]:
+    """Return one message per stage/memory figure over baseline * (1 + tolerance)."""
+    regressions = []
+    for name, res in results.items():
+        base = baselines.get(name)
+        if not base:
+            continue
+        for st, ms in res["wall_ms"].items():
+            b = base["wall_ms"].get(st)
+            if b is not None and ms > b * (1 + tolerance) and ms - b > NOISE_FLOOR_MS:
+                regressions.append(f"{name}.{st}: {ms:.1f} ms vs baseline {b:.1f} ms")
+        b = base.get("peak_kib")
+        if b is not None and res["peak_kib"] > b * (1 + tolerance):
+            regressions.append(f"{name}.peak: {res['peak_kib']} KiB vs baseline {b} KiB")
+    return regressions
+
+
+def load_baselines(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--configs", nargs="+", default=DEFAULT_CONFIGS, choices=sorted(PRESETS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown/growth as a fraction of baseline.")
+    parser.add_argument("--baselines", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true", help="Record results as new baselines.")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.configs:
+        res = bench_config(name, repeat=args.repeat, seed=args.seed)
+        results[name] = res
+        stages = "  ".join(f"{st}={ms:.1f}ms" for st, ms in res["wall_ms"].items())
+        print(f"{name:<10} {stages}  peak={res['peak_kib']}KiB")
+
+    baselines = load_baselines(args.baselines)
+    if args.update:
+        baselines.update(results)
+        with open(args.baselines, mode="w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baselines written to {args.baselines}")
+        return 0
+
+    regressions = compare(results, baselines, args.tolerance)
+    for msg in regressions:
+        print(f"REGRESSION {msg}")
+    if not regressions:
+        print("No regressions.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
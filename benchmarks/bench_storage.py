@@ -0,0 +1,55 @@
+"""Storage benchmark: bulk save/load time of many scheduled users in the SQLite store.
+
+    python -m benchmarks.bench_storage                 # 10k users
+    python -m benchmarks.bench_storage --users 100000
+"""
+from pathlib import Path
+from time import perf_counter
+import argparse
+import pickle
+import sys
+import tempfile
+
+from src.storage import SQLiteStore
+from benchmarks.bench_serialization import scheduled_user
+
+
+def clone_users(name: str, n: int, seed: int = 0) -> list:
+    """n copies of one scheduled synthetic user, with distinct ids."""
+    user, _ = scheduled_user(name, seed)
+    data = pickle.dumps(user)
+    users = []
+    for i in range(n):
+        u = pickle.loads(data)
+        u.id_ = f"U{i:07d}"
+        users.append(u)
+    return users
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--config", default="n50")
+    parser.add_argument("--batch-users", type=int, default=1_000)
+    args = parser.parse_args(argv)
+
+    users = clone_users(args.config, args.users)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db")
+        with SQLiteStore(path, batch_users=args.batch_users) as store:
+            t0 = perf_counter()
+            store.save_users(users)
+            save_s = perf_counter() - t0
+
+            t0 = perf_counter()
+            loaded = sum(1 for _ in store.iter_users())
+            load_s = perf_counter() - t0
+        size_kib = Path(path).stat().st_size // 1024
+
+    print(f"{args.users} users ({args.config}): save={save_s:.2f}s  load={load_s:.2f}s  "
+          f"({loaded} loaded, {size_kib} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""Synthetic course catalogs in the exact `course_input.csv` schema, for benchmarks and tests.
+
+Catalogs are layered prerequisite DAGs: a course in layer L requires at least one
+course from layer L-1, plus up to `fan_out - 1` more requirements from any lower
+layer. Each requirement is an OR group with probability `or_density`.
+
+Completed and in-progress courses are taken from the lowest layers and packed into
+past sessions, so the file is schedulable as-is when paired with `first_ses_dt` and
+`spread_between` from the returned SyntheticCatalog.
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+import csv
+import datetime as dt
+import random
+
+from config.course_enums import LevelENUM, StatusENUM
+from config.settings import SESSION_MONTHS
+
+CSV_COLUMNS = [
+    "Course ID",
+    "Credit Hours",
+    "Status",
+    "Level",
+    "PreReqs",
+    "Capstone",
+    "Session",
+    "Transfer Intent",
+    "Challenge Intent",
+]
+
+CREDIT_HOURS = (2, 3, 4)
+
+
+@dataclass
+class SyntheticCatalog:
+    """
+    A generated catalog plus the run inputs it was built for.
+
+    Attributes:
+        rows (list[dict]): One dict per course, keyed by CSV_COLUMNS.
+        first_ses_dt (dt.date): First session target date (past sessions hold completed courses).
+        spread_between (int): Session count that leaves slack for the free courses.
+        inperson_courses (list[str]): Course IDs offered in-person.
+        in_person_end_dt (dt.date | None): Last date in-person sections are offered.
+        ses_max_class (int): Max courses per session the catalog was packed for.
+    """
+    rows: list[dict]
+    first_ses_dt: dt.date
+    spread_between: int
+    inperson_courses: list[str] = field(default_factory=list)
+    in_person_end_dt: Optional[dt.date] = None
+    ses_max_class: int = 4
+
+    def write_csv(self, path: str) -> str:
+        with open(path, mode="w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.rows)
+        return path
+
+    def restraints_kwargs(self) -> dict:
+        """Keyword args for `generate_restraints` matching this catalog."""
+        return {
+            "inperson_courses": self.inperson_courses,
+            "in_person_end_dt": self.in_person_end_dt,
+            "min_inperson": 1 if self.inperson_courses else None,
+            "max_inperson": 1 if self.inperson_courses else None,
+            "ses_min_class": 1,
+            "ses_max_class": self.ses_max_class,
+            "exceed_benefits": True,
+        }
+
+
+def session_month_starts(first: dt.date, count: int) -> list[dt.date]:
+    """First-of-month targets for `count` consecutive sessions starting at `first`."""
+    months = sorted(SESSION_MONTHS)
+    i = months.index(first.month)
+    yr = first.year
+    out = []
+    for _ in range(count):
+        out.append(dt.date(yr, months[i], 1))
+        i += 1
+        if i >= len(months):
+            i = 0
+            yr += 1
+    return out
+
+
+def _past_session_starts(as_of: dt.date, count: int) -> list[dt.date]:
+    """The `count` most recent session targets that started before `as_of` even after
+    the +-1 week start rounding, oldest first."""
+    months = sorted(SESSION_MONTHS)
+    cutoff = as_of - dt.timedelta(days=8)
+    yr = cutoff.year
+    cands = [m for m in months if dt.date(yr, m, 1) <= cutoff]
+    if cands:
+        i = months.index(cands[-1])
+    else:
+        i = len(months) - 1
+        yr -= 1
+    out = []
+    for _ in range(count):
+        out.append(dt.date(yr, months[i], 1))
+        i -= 1
+        if i < 0:
+            i = len(months) - 1
+            yr -= 1
+    return out[::-1]
+
+
+def _layer_sizes(n: int, depth: int) -> list[int]:
+    layers = min(depth + 1, n)
+    base, rem = divmod(n, layers)
+    return [base + (1 if i < rem else 0) for i in range(layers)]
+
+
+def _build_level(
+        rng: random.Random,
+        level: int,
+        n: int,
+        depth: int,
+        fan_out: int,
+        or_density: float,
+        ) -> list[dict]:
+    """One level's layered DAG. Returns rows ordered by layer, lowest first."""
+    rows = []
+    layers: list[list[str]] = []
+    idx = 0
+    lower: list[str] = []
+    for li, size in enumerate(_layer_sizes(n, depth)):
+        if layers:
+            lower.extend(layers[-1])
+        layer = []
+        for _ in range(size):
+            cid = f"SYN{level}{idx:05d}"
+            idx += 1
+            reqs = []
+            if li > 0:
+                n_reqs = rng.randint(1, max(fan_out, 1))
+                for r in range(n_reqs):
+                    # First requirement pins the course to this layer's depth
+                    pool = layers[-1] if r == 0 else lower
+                    if rng.random() < or_density and len(pool) > 1:
+                        group = rng.sample(pool, min(len(pool), rng.randint(2, 3)))
+                        reqs.append("[" + "|".join(group) + "]")
+                    else:
+                        reqs.append(rng.choice(pool))
+            rows.append({
+                "Course ID": cid,
+                "Credit Hours": rng.choice(CREDIT_HOURS),
+                "Status": StatusENUM.NONE.value,
+                "Level": level,
+                "PreReqs": "|".join(dict.fromkeys(reqs)),
+                "Capstone": "",
+                "Session": "",
+                "Transfer Intent": "",
+                "Challenge Intent": "",
+                "_layer": li,
+            })
+            layer.append(cid)
+        layers.append(layer)
+
+    # Capstone: one top-layer course per level, nothing depends on top layer
+    if len(layers) > 1:
+        rows[-1]["Capstone"] = 1
+    return rows
+
+
+def generate_catalog(
+        n_courses: int = 50,
+        depth: int = 4,
+        fan_out: int = 2,
+        or_density: float = 0.2,
+        completed_frac: float = 0.2,
+        in_progress_frac: float = 0.05,
+        inperson_frac: float = 0.0,
+        intent_frac: float = 0.05,
+        grad_frac: float = 0.0,
+        ses_max_class: int = 4,
+        seed: int = 0,
+        as_of: Optional[dt.date] = None,
+        ) -> SyntheticCatalog:
+    """
+    Generate a schedulable synthetic catalog.
+
+    Args:
+        n_courses (int): Total courses (50 -> 50k).
+        depth (int): Prereq DAG depth (layers - 1) per level.
+        fan_out (int): Max prereq requirements per course.
+        or_density (float): Probability a requirement is an OR group.
+        completed_frac (float): Fraction of undergrad courses already completed.
+        in_progress_frac (float): Fraction of undergrad courses in progress this session.
+        inperson_frac (float): Fraction of free first-layer courses offered in-person.
+        intent_frac (float): Fraction of free courses with transfer/challenge intent.
+        grad_frac (float): Fraction of courses at graduate level.
+        ses_max_class (int): Max courses per session, used to pack past sessions.
+        seed (int): RNG seed. Same inputs and seed give the same catalog.
+        as_of (dt.date, optional): "Today" for past/current sessions. Defaults to today.
+
+    Returns:
+        SyntheticCatalog: Rows and matching run inputs.
+    """
+    assert n_courses >= 2, f"n_courses too small: {n_courses}"
+    rng = random.Random(seed)
+    as_of = as_of or dt.date.today()
+
+    n_grad = int(n_courses * grad_frac)
+    n_under = n_courses - n_grad
+    under = _build_level(rng, LevelENUM.UNDERGRAD.value, n_under, depth, fan_out, or_density)
+    grad = _build_level(rng, LevelENUM.GRADUATE.value, n_grad, depth, fan_out, or_density) if n_grad else []
+
+    # Completed, then in-progress, from the lowest layers (rows are layer ordered)
+    n_done = int(n_under * completed_frac)
+    n_prog = int(n_under * in_progress_frac)
+    done_ses = (n_done + ses_max_class - 1) // ses_max_class
+    prog_ses = 1 if n_prog else 0
+    past = done_ses + prog_ses
+
+    for i, row in enumerate(under[:n_done]):
+        row["Status"] = StatusENUM.COMPLETED.value
+        row["Session"] = i // ses_max_class + 1
+    for row in under[n_done:n_done + n_prog][:ses_max_class]:
+        row["Status"] = StatusENUM.IN_PROGRESS.value
+        row["Session"] = past
+
+    free = [r for r in under + grad if r["Status"] == StatusENUM.NONE.value and not r["Capstone"]]
+
+    # In-person: free first-layer courses (no prereqs, always qualified)
+    first_layer = [r for r in free if r["_layer"] == 0]
+    n_inperson = min(int(len(free) * inperson_frac), len(first_layer))
+    inperson = [r["Course ID"] for r in first_layer[:n_inperson]]
+
+    # Intents: free courses that are not in-person
+    cands = [r for r in free if r["Course ID"] not in inperson]
+    for row in rng.sample(cands, int(len(free) * intent_frac)):
+        if rng.random() < 0.5:
+            row["Transfer Intent"] = 1
+        else:
+            row["Challenge Intent"] = 1
+
+    # Dates: past sessions end with the current (in-progress) one
+    if past:
+        first_ses_dt = _past_session_starts(as_of, past)[0]
+    else:
+        first_ses_dt = _past_session_starts(as_of, 1)[0]
+        first_ses_dt = session_month_starts(first_ses_dt, 2)[1]
+
+    # Slack: one spare session per 3 full ones for free courses, plus rounding
+    n_free = len(under) + len(grad) - n_done - min(n_prog, ses_max_class)
+    free_ses = (n_free + ses_max_class - 2) // max(ses_max_class - 1, 1)
+    spread_between = past + free_ses + 1
+
+    in_person_end_dt = None
+    if inperson:
+        starts = session_month_starts(first_ses_dt, past + len(inperson))
+        in_person_end_dt = starts[-1]
+
+    rows = [{k: v for k, v in r.items() if not k.startswith("_")} for r in under + grad]
+    return SyntheticCatalog(
+        rows=rows,
+        first_ses_dt=first_ses_dt,
+        spread_between=spread_between,
+        inperson_courses=inperson,
+        in_person_end_dt=in_person_end_dt,
+        ses_max_class=ses_max_class,
+    )
@@ -19,4 +19,6 @@ class SessErrENUM(IntEnum):
     NOT_INPERSON = 0
     OVER_MAX_COST = 1
     OUT_OF_BENEFITS = 3
-    PREREQ_NOT_MET = 4
\ No newline at end of file
+    PREREQ_NOT_MET = 4
+    TIMEOUT = 5
+    CANCELLED = 6
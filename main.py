@@ -1,4 +1,5 @@
 import src.services as ser
+from src.telemetry import RunProfile
 import datetime as dt
 """This program is setup with some provided constants to see operations.
 If modifying for DB usage, match naming conventions here.
@@ -51,7 +52,8 @@ ABSOLOUTE_PATH = False
 """-----------OUTPUT-----------"""
 # Output for schedule
 
-# Type of output **AT PRESENT ONLY CSV SUPPORTED** (str)
+# Type of output: "csv" (full schedule) or "delta" (only sessions changed since the last
+# delta export, with <path>.state.json and <path>.manifest.json) (str)
 OUTPUT_TYPE = "csv"
 
 # Path for output (str)
@@ -60,6 +62,10 @@ OUTPUT_PATH = "course_schedule.csv"
 # Realative or Absouloute Path for OUTPUT_PATH (bool)
 OUTPUT_ABS = False
 
+# Path for run timing profile, as JSON (str | None). Pass `None` to skip.
+# Use a path ending in `.trace.json` for Chrome trace format (chrome://tracing).
+PROFILE_PATH = None
+
 """------- SCHEDULING RESTRAINTS ------"""
 # Used to create a Restraints object for scheduling.
 
@@ -103,6 +109,9 @@ SPREAD_BETWEEN = 15
 """--------------------------------- END User Input -----------------------------------------"""
 
 
+# Time each stage of the run
+profile = RunProfile(USER_ID)
+
 # Create GIB
 if not YEARLY_GIB_AMOUNT:
     gib = None
@@ -118,8 +127,8 @@ else:
 courses = ser.get_courses_pipeline(
     course_path=INPUT_PATH,
     course_path_abs=ABSOLOUTE_PATH,
-    in_person= INPERSON_COURSES
-
+    in_person= INPERSON_COURSES,
+    profile=profile
 )
 
 # Create User
@@ -128,19 +137,20 @@ user = ser.create_new_user(
     user_id= USER_ID,
     courses=courses,
     grant_amnt_per_ses= TOTAL_GRANT_AMOUNT_PER_SESSION,
-    gib=gib
+    gib=gib,
+    profile=profile
 )
 
 # Create Restraints
 restraints = ser.generate_restraints(
     inperson_courses=INPERSON_COURSES,
     in_person_end_dt=INPERSON_END_DT,
-    min_inperson=1,
-    max_inperson=1,
-    ses_max_cost=0.0,
-    ses_min_class=2,
-    ses_max_class=4,
-    exceed_benefits=True
+    min_inperson=MIN_INPERSON,
+    max_inperson=MAX_INPERSON,
+    ses_max_cost=SES_MAX_COST,
+    ses_min_class=SES_MIN_COURSE,
+    ses_max_class=SES_MAX_COURSE,
+    exceed_benefits=EXCEED_BENEFITS
 )
 
 # Schedule User's Courses (Operates on User In-Place)
@@ -157,3 +167,10 @@ ser.export_schedule(
     path=OUTPUT_PATH,
     absoloute=OUTPUT_ABS
 )
+
+# Save run profile
+if PROFILE_PATH:
+    if PROFILE_PATH.endswith(".trace.json"):
+        profile.to_chrome_trace(PROFILE_PATH)
+    else:
+        profile.to_json(PROFILE_PATH)
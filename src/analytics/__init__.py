@@ -0,0 +1,2 @@
+from .demand import DemandMatrix
+from .validate import ScheduleValidator, ValidationReport
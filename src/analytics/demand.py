@@ -0,0 +1,211 @@
+"""Seat demand: enrolment counts per course, session start date, delivery and level,
+across every scheduled user.
+
+Each enrolment (a course in a scheduled session; intent courses are not seats) is
+packed into one int64 cell key:
+
+    ((course index * 2^21 + start ordinal) * 2 + in person) * 4 + (level + 1)
+
+and counted with one np.unique group-by. Per-user keys are kept so one user's plan
+can be replaced incrementally without a rebuild.
+"""
+from collections import Counter
+from typing import Any, Iterable, Optional
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+_START_BITS = 1 << 21     # date ordinals stay below 2^20 until year 2870
+
+
+def _pack(course: np.ndarray, start: np.ndarray, inperson: np.ndarray, level: np.ndarray) -> np.ndarray:
+    return ((course.astype(np.int64) * _START_BITS + start) * 2 + inperson) * 4 + (level.astype(np.int64) + 1)
+
+
+def _unpack(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    level = keys % 4 - 1
+    rest = keys // 4
+    inperson = rest % 2
+    rest //= 2
+    return rest // _START_BITS, rest % _START_BITS, inperson.astype(bool), level
+
+
+class DemandMatrix:
+    """
+    Sparse course x session-start enrolment counts, split by in-person vs online and
+    by level.
+
+    Build with DemandMatrix.from_users(users, restraints) or
+    DemandMatrix.from_store(columnar_store, restraints). A course counts as in person
+    if it is in `Restraints.inperson_courses`.
+
+        demand = DemandMatrix.from_users(users, restraints)
+        demand.to_frame()                   # long format, one row per non-zero cell
+        demand.pivot(inperson=True)         # course x start date table
+        demand.update_user(changed_user)    # incremental
+    """
+    def __init__(self, inperson_courses=None):
+        if hasattr(inperson_courses, "inperson_courses"):
+            inperson_courses = inperson_courses.inperson_courses
+        self.inperson = set(inperson_courses or [])
+        self.vocab: list[str] = []
+        self._vocab_index: dict[str, int] = {}
+        self.counts: Counter = Counter()
+        self._user_keys: dict[str, np.ndarray] = {}
+
+    def _course_idx(self, course_id: str) -> int:
+        i = self._vocab_index.get(course_id)
+        if i is None:
+            i = self._vocab_index[course_id] = len(self.vocab)
+            self.vocab.append(course_id)
+        return i
+
+    def _inperson_mask(self) -> np.ndarray:
+        return np.fromiter((c in self.inperson for c in self.vocab), dtype=bool, count=len(self.vocab))
+
+    def _add_keys(self, keys: np.ndarray, sign: int = 1) -> None:
+        cells, n = np.unique(keys, return_counts=True)
+        for k, c in zip(cells.tolist(), n.tolist()):
+            self.counts[k] += sign * c
+            if self.counts[k] == 0:
+                del self.counts[k]
+
+    def _user_arrays(self, user) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        course, start, level = [], [], []
+        for s in user.schedule:
+            st = s.start_date.toordinal()
+            lv = -1 if s.level is None else int(s.level)
+            for c in s.courses:
+                course.append(self._course_idx(c.course_id))
+                start.append(st)
+                level.append(lv)
+        return (np.asarray(course, dtype=np.int64), np.asarray(start, dtype=np.int64),
+                np.asarray(level, dtype=np.int64))
+
+    # region Build
+    @classmethod
+    def from_users(cls, users: Iterable, inperson_courses=None) -> "DemandMatrix":
+        """
+        Count demand across scheduled users.
+
+        Args:
+            users (Iterable[User]): Scheduled users. A repeated user id counts its last plan.
+            inperson_courses (list[str] | Restraints, optional): In-person course ids.
+        """
+        dm = cls(inperson_courses)
+        uids, course, start, level, lengths = [], [], [], [], []
+        for user in users:
+            c, s, l = dm._user_arrays(user)
+            uids.append(str(user.id_))
+            course.append(c)
+            start.append(s)
+            level.append(l)
+            lengths.append(len(c))
+
+        if uids:
+            course = np.concatenate(course)
+            keys = _pack(course, np.concatenate(start), dm._inperson_mask()[course], np.concatenate(level))
+            dm._set_user_keys(uids, keys, np.asarray(lengths))
+        return dm
+
+    @classmethod
+    def from_store(cls, store, inperson_courses=None) -> "DemandMatrix":
+        """
+        Count demand from a ColumnarScheduleStore without building Python objects.
+        Only each user id's latest plan is counted.
+        """
+        dm = cls(inperson_courses)
+        dm.vocab = list(store.vocab)
+        dm._vocab_index = {c: i for i, c in enumerate(dm.vocab)}
+        if not store.n_sessions:
+            return dm
+
+        latest = store.latest_mask()
+        if not latest.any():
+            return dm
+        n_courses = store.column("n_courses")[latest].astype(np.int64)
+        off = store.column("course_off")[latest]
+        # Expand session rows to enrolment rows: course_idx[off + 0 .. off + n - 1]
+        ses_of = np.repeat(np.arange(len(n_courses)), n_courses)
+        first = np.cumsum(n_courses) - n_courses
+        within = np.arange(len(ses_of)) - np.repeat(first, n_courses)
+        course = store.column("course_idx")[np.repeat(off, n_courses) + within].astype(np.int64)
+
+        keys = _pack(
+            course,
+            store.column("start_ord")[latest][ses_of],
+            dm._inperson_mask()[course],
+            store.column("level")[latest][ses_of],
+        )
+        # Rows are grouped by user index; per-user lengths for incremental updates
+        user_idx = store.column("user")[latest]
+        uniq, ses_counts = np.unique(user_idx, return_counts=True)
+        enrol = np.add.reduceat(n_courses, np.cumsum(ses_counts) - ses_counts)
+        dm._set_user_keys([store.user_ids[i] for i in uniq.tolist()], keys, enrol)
+        return dm
+
+    def _set_user_keys(self, uids: list[str], keys: np.ndarray, lengths: np.ndarray) -> None:
+        # A repeated id keeps its last plan
+        for uid, part in zip(uids, np.split(keys, np.cumsum(lengths)[:-1])):
+            self._user_keys[uid] = part
+        self.counts = Counter()
+        if self._user_keys:
+            self._add_keys(np.concatenate(list(self._user_keys.values())))
+    # endregion
+
+    # region Incremental
+    def update_user(self, user) -> None:
+        """Replace (or add) one user's contribution after their plan changed."""
+        uid = str(user.id_)
+        self.remove_user(uid)
+        course, start, level = self._user_arrays(user)
+        inperson = self._inperson_mask()[course] if len(course) else np.zeros(0, dtype=bool)
+        keys = _pack(course, start, inperson, level)
+        self._user_keys[uid] = keys
+        self._add_keys(keys)
+
+    def remove_user(self, user_id: Any) -> None:
+        keys = self._user_keys.pop(str(user_id), None)
+        if keys is not None and len(keys):
+            self._add_keys(keys, sign=-1)
+    # endregion
+
+    # region Output
+    def cells(self) -> dict[str, np.ndarray]:
+        """Non-zero cells as columns: course_idx, start_ord, inperson, level, count."""
+        keys = np.fromiter(self.counts.keys(), dtype=np.int64, count=len(self.counts))
+        vals = np.fromiter(self.counts.values(), dtype=np.int64, count=len(self.counts))
+        order = np.argsort(keys)
+        course, start, inperson, level = _unpack(keys[order])
+        return {"course_idx": course, "start_ord": start, "inperson": inperson,
+                "level": level, "count": vals[order]}
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long format: course_id, start_date, inperson, level, students."""
+        c = self.cells()
+        starts = {o: dt.date.fromordinal(o) for o in np.unique(c["start_ord"]).tolist()}
+        return pd.DataFrame({
+            "course_id": np.asarray(self.vocab, dtype=object)[c["course_idx"]] if len(c["count"]) else [],
+            "start_date": [starts[o] for o in c["start_ord"].tolist()],
+            "inperson": c["inperson"],
+            "level": c["level"],
+            "students": c["count"],
+        })
+
+    def pivot(self, inperson: Optional[bool] = None, level: Optional[int] = None) -> pd.DataFrame:
+        """
+        Course x session start date table of students, summed over any dimension not
+        filtered. Missing cells are 0.
+        """
+        df = self.to_frame()
+        if inperson is not None:
+            df = df[df["inperson"] == inperson]
+        if level is not None:
+            df = df[df["level"] == level]
+        return df.pivot_table(index="course_id", columns="start_date", values="students",
+                              aggfunc="sum", fill_value=0)
+
+    def total(self) -> int:
+        return sum(self.counts.values())
+    # endregion
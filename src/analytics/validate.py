@@ -0,0 +1,339 @@
+"""Bulk schedule validation with array operations.
+
+Every enrolment (course in a scheduled session; intent courses are not enrolments)
+of every user becomes one row, and each rule is a handful of numpy operations over all
+rows at once:
+
+    prereq        Each prereq group has an option taken in an earlier session, or one
+                  done outside the plan: for Users, completed, in progress or with a
+                  transfer/challenge intent in user.courses.
+    prereq_unverified
+                  Stored plans have no statuses: a group whose only unmet options were
+                  never scheduled for that user may have been done outside the plan.
+    class_count   ses_min_class <= courses <= ses_max_class.
+    inperson      min_inperson in-person courses in sessions up to in_person_end_dt.
+    capstone      Capstones are in the last session of their level.
+    duplicate     No course is scheduled twice for a user.
+    cost          total_cost = sum of course costs, user_cost = total - grants - GI Bill,
+                  user_cost >= -1, and GI Bill paid per benefit year <= the yearly amount.
+
+Only sessions starting on/after `as_of` are checked (all if None), so historical
+sessions built from intake data are not reported.
+"""
+from typing import Any, Iterable, Optional
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from config.course_enums import StatusENUM
+
+RULES = ("prereq", "prereq_unverified", "class_count", "inperson", "capstone", "duplicate", "cost")
+_EPOCH_ORD = dt.date(1970, 1, 1).toordinal()
+
+
+class ValidationReport:
+    """
+    Violations found by ScheduleValidator.
+
+    Attributes:
+        violations (pd.DataFrame): One row per violation: user_id, session, rule,
+            course_id ("" for session-level rules), detail.
+        n_users (int): Users checked.
+        n_sessions (int): Sessions checked.
+    """
+    def __init__(self, violations: pd.DataFrame, n_users: int, n_sessions: int):
+        self.violations = violations
+        self.n_users = n_users
+        self.n_sessions = n_sessions
+
+    @property
+    def ok(self) -> bool:
+        return self.violations.empty
+
+    def summary(self) -> pd.Series:
+        """Violations per rule (every rule listed)."""
+        return self.violations["rule"].value_counts().reindex(list(RULES), fill_value=0)
+
+    def by_user(self) -> pd.DataFrame:
+        """User x rule violation counts, users with any violation only."""
+        return pd.crosstab(self.violations["user_id"], self.violations["rule"])
+
+    def bad_users(self) -> list:
+        return list(dict.fromkeys(self.violations["user_id"]))
+
+
+class ScheduleValidator:
+    """
+    Checks many users' schedules against one program catalog and restraints.
+
+        validator = ScheduleValidator(courses, restraints, as_of=dt.date.today())
+        report = validator.validate_users(users)            # or validate_store(store)
+        report.summary()
+
+    Args:
+        catalog (Iterable[Course]): Program courses (prereqs, capstone, cost).
+        restraints (Restraints): Restraints the schedules were built with.
+        as_of (dt.date, optional): Only sessions starting on/after this are checked.
+        yearly_amount (float, optional): GI Bill yearly amount, for stored schedules
+            (validate_users reads each user's GI Bill).
+        benefit_start (tuple[int, int], optional): (month, day) benefit years start,
+            for stored schedules.
+    """
+    def __init__(
+        self,
+        catalog: Iterable,
+        restraints,
+        as_of: Optional[dt.date] = None,
+        yearly_amount: Optional[float] = None,
+        benefit_start: Optional[tuple[int, int]] = None,
+    ):
+        self.r = restraints
+        self.as_of = as_of
+        self.yearly_amount = yearly_amount
+        self.benefit_start = benefit_start
+
+        self.vocab: list[str] = []
+        self._index: dict[str, int] = {}
+        courses = {}
+        for c in catalog:
+            courses.setdefault(c.course_id, c)
+            self._idx(c.course_id)
+
+        # Prereq option table: option k belongs to group opt_group[k] of course opt_course[k]
+        opt_pre, opt_group, counts, groups = [], [], [], 0
+        for cid in list(self.vocab):
+            n = 0
+            for pre in courses[cid].pre_reqs:
+                for p in (pre if isinstance(pre, list) else [pre]):
+                    opt_pre.append(self._idx(p))
+                    opt_group.append(groups)
+                    n += 1
+                groups += 1
+            counts.append(n)
+        self._n_catalog = len(courses)
+        self._opt_pre = np.asarray(opt_pre, dtype=np.int64)
+        self._opt_group = np.asarray(opt_group, dtype=np.int64)
+        self._opt_count = np.asarray(counts, dtype=np.int64)
+        self._opt_start = np.cumsum(self._opt_count) - self._opt_count
+        self._capstone = np.asarray([bool(courses[c].capstone) for c in self.vocab[:self._n_catalog]])
+        self._cost = np.asarray([courses[c].cost for c in self.vocab[:self._n_catalog]], dtype=np.float64)
+        self._inperson_ids = set(restraints.inperson_courses or [])
+
+    def _idx(self, course_id: str) -> int:
+        i = self._index.get(course_id)
+        if i is None:
+            i = self._index[course_id] = len(self.vocab)
+            self.vocab.append(course_id)
+        return i
+
+    def _course_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Per vocab index: option count/start, capstone, cost, in person (non-catalog: none)."""
+        v, k = len(self.vocab), self._n_catalog
+        pad = v - k
+        count = np.concatenate([self._opt_count, np.zeros(pad, dtype=np.int64)])
+        start = np.concatenate([self._opt_start, np.zeros(pad, dtype=np.int64)])
+        cap = np.concatenate([self._capstone, np.zeros(pad, dtype=bool)])
+        cost = np.concatenate([self._cost, np.full(pad, np.nan)])
+        inp = np.fromiter((c in self._inperson_ids for c in self.vocab), dtype=bool, count=v)
+        return count, start, cap, cost, inp
+
+    # region Build
+    def validate_users(self, users: Iterable) -> ValidationReport:
+        """Validate scheduled User objects (User.schedule). Prereqs done outside the plan
+        are read from user.courses."""
+        uids, yearly, b_month, b_day = [], [], [], []
+        ses = {k: [] for k in ("user", "num", "start", "level", "n", "total", "user_cost", "grants", "gib")}
+        enr_ses, enr_course = [], []
+        done_user, done_course = [], []
+        for u_i, user in enumerate(users):
+            uids.append(user.id_)
+            for c in user.courses:
+                if c.status != StatusENUM.NONE or c.transfer_intent or c.challenge_intent:
+                    done_user.append(u_i)
+                    done_course.append(self._idx(c.course_id))
+            gib = getattr(user, "gib", None)
+            yearly.append(gib.yearly_amount if gib else np.nan)
+            b_month.append(gib.benefit_start.month if gib else 1)
+            b_day.append(gib.benefit_start.day if gib else 1)
+            for s in user.schedule:
+                row = len(ses["user"])
+                ses["user"].append(u_i)
+                ses["num"].append(s.num)
+                ses["start"].append(s.start_date.toordinal())
+                ses["level"].append(-1 if s.level is None else int(s.level))
+                ses["n"].append(len(s.courses))
+                ses["total"].append(s.tot_cost)
+                ses["user_cost"].append(s.adj_cost)
+                ses["grants"].append(s.grants_applied)
+                ses["gib"].append(s.gib_applied)
+                for c in s.courses:
+                    enr_ses.append(row)
+                    enr_course.append(self._idx(c.course_id))
+        ses = {k: np.asarray(v) for k, v in ses.items()}
+        done = (np.asarray(done_user, dtype=np.int64), np.asarray(done_course, dtype=np.int64))
+        return self._validate(uids, ses, np.asarray(enr_ses, dtype=np.int64),
+                              np.asarray(enr_course, dtype=np.int64),
+                              np.asarray(yearly, dtype=np.float64), np.asarray(b_month), np.asarray(b_day), done)
+
+    def validate_store(self, store) -> ValidationReport:
+        """Validate the latest plan of every user in a ColumnarScheduleStore. Course statuses
+        are not stored, so prereqs never scheduled are reported as prereq_unverified."""
+        latest = store.latest_mask()
+        rows = np.flatnonzero(latest)
+        col = {name: store.column(name)[rows] for name in
+               ("user", "num", "start_ord", "level", "n_courses", "total_cost", "user_cost",
+                "grants_applied", "gib_applied", "course_off")}
+        # Compact user indices to the users present
+        uniq, user = np.unique(col["user"], return_inverse=True)
+        uids = [store.user_ids[i] for i in uniq.tolist()]
+        ses = {
+            "user": user, "num": col["num"], "start": col["start_ord"].astype(np.int64),
+            "level": col["level"], "n": col["n_courses"].astype(np.int64), "total": col["total_cost"],
+            "user_cost": col["user_cost"], "grants": col["grants_applied"], "gib": col["gib_applied"],
+        }
+        n = ses["n"]
+        enr_ses = np.repeat(np.arange(len(n)), n)
+        first = np.cumsum(n) - n
+        within = np.arange(len(enr_ses)) - np.repeat(first, n)
+        store_idx = store.column("course_idx")[np.repeat(col["course_off"], n) + within].astype(np.int64)
+        remap = np.asarray([self._idx(c) for c in store.vocab], dtype=np.int64)
+        enr_course = remap[store_idx] if len(store_idx) else store_idx
+
+        yearly = self.yearly_amount if self.yearly_amount is not None else np.nan
+        m, d = self.benefit_start or (1, 1)
+        k = len(uids)
+        return self._validate(uids, ses, enr_ses, enr_course, np.full(k, yearly, dtype=np.float64),
+                              np.full(k, m), np.full(k, d))
+    # endregion
+
+    # region Rules
+    def _validate(self, uids, ses, enr_ses, enr_course, yearly, b_month, b_day, done=None) -> ValidationReport:
+        """`done` is (user, course index) arrays of courses done outside the plan, None if unknown."""
+        r = self.r
+        n_ses = len(ses["user"])
+        count, start_off, cap, cost, inp = self._course_arrays()
+        V = max(len(self.vocab), 1)
+        checked = np.ones(n_ses, dtype=bool) if self.as_of is None else ses["start"] >= self.as_of.toordinal()
+        e_user = ses["user"][enr_ses]
+        e_start = ses["start"][enr_ses]
+        e_checked = checked[enr_ses]
+        out = []
+
+        def add(rule: str, ses_rows: np.ndarray, courses: Optional[np.ndarray], detail):
+            if not len(ses_rows):
+                return
+            out.append(pd.DataFrame({
+                "user_id": np.asarray(uids, dtype=object)[ses["user"][ses_rows]],
+                "session": ses["num"][ses_rows],
+                "rule": rule,
+                "course_id": (np.asarray(self.vocab, dtype=object)[courses]
+                              if courses is not None else ""),
+                "detail": detail,
+            }))
+
+        # Enrolment keys, sorted, for lookups and duplicates
+        key = e_user * V + enr_course
+        order = np.lexsort((e_start, key))
+        skey, sstart = key[order], e_start[order]
+
+        # duplicate
+        dup = np.flatnonzero((skey[1:] == skey[:-1]))
+        dup = order[dup + 1]
+        dup = dup[e_checked[dup]]
+        add("duplicate", enr_ses[dup], enr_course[dup], "scheduled more than once")
+
+        # prereq: expand enrolments x prereq options
+        k = count[enr_course]
+        if k.sum():
+            e_of = np.repeat(np.arange(len(enr_course)), k)
+            first = np.cumsum(k) - k
+            opt = np.repeat(start_off[enr_course], k) + (np.arange(len(e_of)) - np.repeat(first, k))
+            pre_key = e_user[e_of] * V + self._opt_pre[opt]
+            pos = np.searchsorted(skey, pre_key)
+            pos_c = np.minimum(pos, len(skey) - 1)
+            found = skey[pos_c] == pre_key
+            # Earliest session the option was taken in (keys sorted by start within key)
+            ok = found & (sstart[pos_c] < e_start[e_of])
+            if done is None:
+                unknown = ~found
+            else:
+                ok |= np.isin(pre_key, done[0] * V + done[1])
+                unknown = np.zeros(len(ok), dtype=bool)
+            # A group is met if any of its options is; unverified if not, but one may be done
+            gkey = e_of * (int(self._opt_group.max()) + 1) + self._opt_group[opt]
+            g_uniq, g_inv = np.unique(gkey, return_inverse=True)
+            g_ok = np.zeros(len(g_uniq), dtype=bool)
+            np.logical_or.at(g_ok, g_inv, ok)
+            g_unk = np.zeros(len(g_uniq), dtype=bool)
+            np.logical_or.at(g_unk, g_inv, unknown)
+            g_e = np.zeros(len(g_uniq), dtype=np.int64)
+            g_e[g_inv] = e_of
+            for rule, mask, detail in (
+                    ("prereq", ~g_ok & ~g_unk, "prereq not taken in an earlier session or done"),
+                    ("prereq_unverified", ~g_ok & g_unk, "prereq not in the plan; status not stored")):
+                bad = g_e[mask]
+                bad = np.unique(bad[e_checked[bad]])
+                add(rule, enr_ses[bad], enr_course[bad], detail)
+
+        # class_count
+        n = ses["n"]
+        bad = np.flatnonzero(checked & ((n < r.ses_min_class) | (n > r.ses_max_class)))
+        add("class_count", bad, None, [f"{x} courses, allowed {r.ses_min_class}-{r.ses_max_class}"
+                                       for x in n[bad].tolist()])
+
+        # inperson
+        if r.inperson_courses and r.in_person_end_dt and r.min_inperson:
+            n_inp = np.bincount(enr_ses, weights=inp[enr_course], minlength=n_ses)
+            window = checked & (ses["start"] <= r.in_person_end_dt.toordinal()) & (n > 0)
+            bad = np.flatnonzero(window & (n_inp < r.min_inperson))
+            add("inperson", bad, None, [f"{int(x)} in person, need {r.min_inperson}" for x in n_inp[bad]])
+
+        # capstone: last non-empty session start per (user, level)
+        lvl_key = ses["user"].astype(np.int64) * 8 + (ses["level"].astype(np.int64) + 1)
+        last = np.full(int(lvl_key.max()) + 1 if n_ses else 0, -1, dtype=np.int64)
+        nonempty = n > 0
+        np.maximum.at(last, lvl_key[nonempty], ses["start"][nonempty])
+        e_cap = np.flatnonzero(cap[enr_course] & e_checked)
+        bad = e_cap[e_start[e_cap] != last[lvl_key[enr_ses[e_cap]]]]
+        add("capstone", enr_ses[bad], enr_course[bad], "not in the last session of its level")
+
+        # cost
+        c_sum = np.bincount(enr_ses, weights=np.nan_to_num(cost[enr_course]), minlength=n_ses)
+        known = ~np.isnan(np.bincount(enr_ses, weights=cost[enr_course], minlength=n_ses))
+        bad = np.flatnonzero(checked & known & (np.abs(c_sum - ses["total"]) > 0.01))
+        add("cost", bad, None, [f"total_cost {t} != course costs {c}" for t, c in zip(ses["total"][bad], c_sum[bad])])
+        expect = ses["total"] - ses["grants"] - ses["gib"]
+        bad = np.flatnonzero(checked & (np.abs(expect - ses["user_cost"]) > 0.01))
+        add("cost", bad, None, "user_cost != total - grants - GI Bill")
+        bad = np.flatnonzero(checked & (ses["user_cost"] < -1))
+        add("cost", bad, None, "user_cost below -1")
+        self._check_gib_years(ses, checked, yearly, b_month, b_day, add)
+
+        viol = (pd.concat(out, ignore_index=True) if out else
+                pd.DataFrame(columns=["user_id", "session", "rule", "course_id", "detail"]))
+        return ValidationReport(viol, len(uids), int(checked.sum()))
+
+    def _check_gib_years(self, ses, checked, yearly, b_month, b_day, add) -> None:
+        """GI Bill applied per (user, benefit year) must not exceed the yearly amount."""
+        u = ses["user"]
+        has = ~np.isnan(yearly[u]) & (ses["gib"] > 0)
+        if not has.any():
+            return
+        days = (ses["start"] - _EPOCH_ORD).astype("datetime64[D]")
+        year = days.astype("datetime64[Y]").astype(np.int64) + 1970
+        month = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+        day = (days - days.astype("datetime64[M]")).astype(np.int64) + 1
+        bm, bd = b_month[u], b_day[u]
+        by = year - ((month < bm) | ((month == bm) & (day < bd)))
+        key = u.astype(np.int64) * 10_000 + by
+        rows = np.flatnonzero(has)
+        _, first, k_inv = np.unique(key[rows], return_index=True, return_inverse=True)
+        paid = np.bincount(k_inv, weights=ses["gib"][rows])
+        over = paid > yearly[u[rows[first]]] + 0.01
+        if over.any():
+            # Report on the year's last checked session
+            bad = np.asarray([rows[k_inv == g][-1] for g in np.flatnonzero(over)])
+            bad = bad[checked[bad]]
+            add("cost", bad, None, "GI Bill paid in benefit year exceeds yearly amount")
+    # endregion
@@ -0,0 +1,5 @@
+from .shared_catalog import SharedCatalog, CatalogSpec, UserOverlay
+from .checkpoint import CheckpointJournal
+from .sharding import shard_of, parse_shard, merge_shards
+from .spill import SpillBuffer
+from .supervisor import SupervisedPool
@@ -0,0 +1,111 @@
+"""Append-only checkpoint journal for resumable batch runs.
+
+One JSON line per finished job: {"key": <job key>, **result}, where result is the
+batch result dict (user_id, status, sessions or error). Lines are flushed on every
+record and fsync'd every `sync_every` records or `sync_interval` seconds, whichever
+comes first, and on close. A crash loses at most the records since the last fsync;
+those jobs are simply run again.
+
+On open, the journal is read back and `done` holds every recorded key. A half-written
+last line (crash mid-write) is cut off.
+"""
+from pathlib import Path
+from typing import Any, Iterator
+import json
+import os
+import time
+
+
+class CheckpointJournal:
+    """
+    Completed-job journal.
+
+        with CheckpointJournal("run.journal") as journal:
+            for job in jobs:
+                if journal.is_done(job_key):
+                    continue
+                journal.record(job_key, run(job))
+
+    Args:
+        path (str): Journal file. Created if missing, appended to otherwise.
+        sync_every (int): Records between fsyncs.
+        sync_interval (float): Longest time in seconds between fsyncs while recording.
+    """
+    def __init__(self, path: str, sync_every: int = 256, sync_interval: float = 1.0):
+        self.path = Path(path)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.done: set[str] = set()
+        self.recovered = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        good = self._recover()
+        self._f = open(self.path, "ab")
+        if self._f.tell() != good:
+            self._f.truncate(good)
+            self._f.seek(good)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.done)
+
+    def _recover(self) -> int:
+        """Load recorded keys. Returns the byte length of the complete lines."""
+        if not self.path.exists():
+            return 0
+        good = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    key = json.loads(line)["key"]
+                except (ValueError, KeyError, TypeError):
+                    break
+                self.done.add(key)
+                good += len(line)
+        self.recovered = len(self.done)
+        return good
+
+    def is_done(self, key: Any) -> bool:
+        return str(key) in self.done
+
+    def record(self, key: Any, result: dict) -> None:
+        """Append one finished job. Keys are stored as strings."""
+        key = str(key)
+        self._f.write((json.dumps({"key": key, **result}, default=str) + "\n").encode())
+        self._f.flush()
+        self.done.add(key)
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """fsync recorded lines to disk."""
+        if self._unsynced:
+            os.fsync(self._f.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self.sync()
+            self._f.close()
+
+    @staticmethod
+    def read(path: str) -> Iterator[dict]:
+        """Recorded entries ({"key", **result}), complete lines only, in record order."""
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    return
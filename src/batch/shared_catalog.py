@@ -0,0 +1,237 @@
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Optional
+import datetime as dt
+import struct
+
+import numpy as np
+
+from src.scheduling.course import Course
+
+# Per-course overlay entry: catalog index, status, intent flags, session (-1 = None)
+OVERLAY_ENTRY = struct.Struct("<IBBh")
+TRANSFER_FLAG = 1
+CHALLENGE_FLAG = 2
+
+
+@dataclass(frozen=True)
+class CatalogSpec:
+    """Everything a worker needs to attach to a SharedCatalog. Small and picklable.
+
+    Attributes:
+        shm_name (str): Shared memory block name.
+        n_courses (int): Courses in the catalog (the ids table may hold more: external prereqs).
+        layout (tuple): (field, dtype str, shape, byte offset) per packed array.
+    """
+    shm_name: str
+    n_courses: int
+    layout: tuple
+
+
+@dataclass(frozen=True)
+class UserOverlay:
+    """
+    Compact per-user state sent to a worker instead of a full User.
+
+    Only courses that differ from a fresh catalog course (status, intent, set session)
+    are encoded, as OVERLAY_ENTRY records in `entries`. A new student with no history
+    pickles to a few dozen bytes.
+
+    Attributes:
+        user_id (Any): User id.
+        entries (bytes): Packed OVERLAY_ENTRY records.
+        first_ses_ord (int): first_ses_dt.toordinal(), 0 if None.
+        grants (float): Grant amount per session.
+        gib (tuple | None): (yearly_amount, start_dt, remaining_time, days_as_of ordinal).
+    """
+    user_id: Any
+    entries: bytes = b""
+    first_ses_ord: int = 0
+    grants: float = 0
+    gib: Optional[tuple] = None
+
+    def __reduce__(self):
+        # Positional tuple: no field names on the wire
+        return (UserOverlay, (self.user_id, self.entries, self.first_ses_ord, self.grants, self.gib))
+
+    @classmethod
+    def from_courses(
+        cls,
+        user_id: Any,
+        courses: list[Course],
+        catalog: "SharedCatalog",
+        first_ses_dt: Optional[dt.date] = None,
+        grants: float = 0,
+        gib: Optional[tuple] = None,
+    ) -> "UserOverlay":
+        """Build an overlay from a user's Course list (e.g. from get_courses_pipeline)."""
+        parts = []
+        for c in courses:
+            flags = (TRANSFER_FLAG if c.transfer_intent else 0) | (CHALLENGE_FLAG if c.challenge_intent else 0)
+            session = c.session if isinstance(c.session, int) else -1
+            if c.status or flags or session != -1:
+                parts.append(OVERLAY_ENTRY.pack(catalog.index_of(c.course_id), int(c.status), flags, session))
+        return cls(
+            user_id=user_id,
+            entries=b"".join(parts),
+            first_ses_ord=first_ses_dt.toordinal() if first_ses_dt else 0,
+            grants=grants,
+            gib=gib,
+        )
+
+    @property
+    def first_ses_dt(self) -> Optional[dt.date]:
+        return dt.date.fromordinal(self.first_ses_ord) if self.first_ses_ord else None
+
+
+class SharedCatalog:
+    """
+    A program catalog's static course data packed once into shared memory.
+
+    Packed arrays:
+        ids: Fixed-width utf-8 course ids. Catalog courses first, then any prereq ids
+            not in the catalog (e.g. alternates like 'CEIS101C').
+        credit_hours, level, capstone, priority: One entry per catalog course.
+        req_offsets: Per course, slice into req_groups (CSR).
+        req_groups: Per requirement, slice into req_items. A single-item group is an
+            AND prereq; more than one item is an OR group.
+        req_items: Indices into `ids`.
+
+    The owner creates it with SharedCatalog.create(courses) and must close() it (or use
+    it as a context manager); workers attach zero-copy with SharedCatalog.attach(spec).
+    Costs are not stored: Course.__post_init__ derives them from level and credit hours.
+    """
+    def __init__(self, spec: CatalogSpec, shm: shared_memory.SharedMemory, owner: bool):
+        self.spec = spec
+        self.n_courses = spec.n_courses
+        self._shm = shm
+        self._owner = owner
+        self._index: Optional[dict] = None
+        self._pre_reqs: Optional[list] = None
+
+        for name, dtype, shape, offset in spec.layout:
+            arr = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            arr.flags.writeable = owner
+            setattr(self, name, arr)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @classmethod
+    def create(cls, courses: list[Course]) -> "SharedCatalog":
+        """Pack prioritized catalog courses (order is kept) into a new shared block."""
+        ids = [c.course_id for c in courses]
+        index = {cid: i for i, cid in enumerate(ids)}
+
+        req_offsets, req_groups, req_items = [0], [0], []
+        for c in courses:
+            for pre in c.pre_reqs:
+                group = pre if isinstance(pre, list) else [pre]
+                for p in group:
+                    if p not in index:
+                        index[p] = len(ids)
+                        ids.append(p)
+                    req_items.append(index[p])
+                req_groups.append(len(req_items))
+            req_offsets.append(len(req_groups) - 1)
+
+        width = max((len(i.encode()) for i in ids), default=1)
+        arrays = {
+            "ids": np.array([i.encode() for i in ids], dtype=f"S{width}"),
+            "credit_hours": np.array([c.credit_hours for c in courses], dtype=np.int16),
+            "level": np.array([c.level for c in courses], dtype=np.int8),
+            "capstone": np.array([bool(c.capstone) for c in courses], dtype=np.bool_),
+            "priority": np.array([c.priority for c in courses], dtype=np.int32),
+            "req_offsets": np.array(req_offsets, dtype=np.int32),
+            "req_groups": np.array(req_groups, dtype=np.int32),
+            "req_items": np.array(req_items, dtype=np.int32),
+        }
+
+        layout, offset = [], 0
+        for name, arr in arrays.items():
+            offset = (offset + 7) // 8 * 8   # 8-byte align each array
+            layout.append((name, arr.dtype.str, arr.shape, offset))
+            offset += arr.nbytes
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (name, _, _, off), arr in zip(layout, arrays.values()):
+            shm.buf[off:off + arr.nbytes] = arr.tobytes()
+
+        spec = CatalogSpec(shm.name, len(courses), tuple(layout))
+        cat = cls(spec, shm, owner=True)
+        cat._index = index
+        return cat
+
+    @classmethod
+    def attach(cls, spec: CatalogSpec) -> "SharedCatalog":
+        """Attach to an existing block read-only. No catalog data is copied."""
+        try:
+            shm = shared_memory.SharedMemory(name=spec.shm_name, track=False)
+        except TypeError:
+            # Python < 3.13 has no `track`: skip resource tracker registration so a
+            # worker exiting never unlinks (or double-unregisters) the owner's block
+            from multiprocessing import resource_tracker
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args, **kwargs: None
+            try:
+                shm = shared_memory.SharedMemory(name=spec.shm_name)
+            finally:
+                resource_tracker.register = register
+        return cls(spec, shm, owner=False)
+
+    def close(self) -> None:
+        """Release this process's mapping; the owner also unlinks the block."""
+        for name, *_ in self.spec.layout:
+            setattr(self, name, None)
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def course_id(self, i: int) -> str:
+        return self.ids[i].decode()
+
+    def index_of(self, course_id: str) -> int:
+        if self._index is None:
+            self._index = {self.course_id(i): i for i in range(len(self.ids))}
+        return self._index[course_id]
+
+    def pre_reqs(self, i: int) -> list:
+        """Decoded prereq structure of catalog course i, e.g. ['A', ['B', 'C']]."""
+        if self._pre_reqs is None:
+            # Decoded once per process; Course objects share these (read-only) lists
+            out = []
+            for c in range(self.n_courses):
+                reqs = []
+                for g in range(self.req_offsets[c], self.req_offsets[c + 1]):
+                    items = [self.course_id(j) for j in self.req_items[self.req_groups[g]:self.req_groups[g + 1]]]
+                    reqs.append(items[0] if len(items) == 1 else items)
+                out.append(reqs)
+            self._pre_reqs = out
+        return self._pre_reqs[i]
+
+    def build_courses(self, overlay: Optional[UserOverlay] = None) -> list[Course]:
+        """Fresh Course objects for one user, in catalog (priority) order."""
+        state = {}
+        if overlay is not None:
+            for idx, status, flags, session in OVERLAY_ENTRY.iter_unpack(overlay.entries):
+                state[idx] = (status, flags, session)
+
+        courses = []
+        for i in range(self.n_courses):
+            status, flags, session = state.get(i, (0, 0, -1))
+            courses.append(Course(
+                course_id=self.course_id(i),
+                credit_hours=int(self.credit_hours[i]),
+                status=status,
+                level=int(self.level[i]),
+                pre_reqs=self.pre_reqs(i),
+                capstone=bool(self.capstone[i]),
+                session=None if session == -1 else session,
+                transfer_intent=bool(flags & TRANSFER_FLAG),
+                challenge_intent=bool(flags & CHALLENGE_FLAG),
+                priority=int(self.priority[i]),
+            ))
+        return courses
@@ -0,0 +1,142 @@
+"""Memory-bounded holding area for scheduled users.
+
+Scheduled Users (with their Sessions, Courses and GI Bill ledgers) are held in memory
+until the process RSS (or held-user count) crosses a budget, then encoded with the
+storage codec, appended to a spill file and released. Iterating yields every user,
+spilled ones decoded back, so a whole cohort can go to export_batch without all of it
+being alive at once.
+
+Spill file: one record per user, a little-endian uint32 length then encode_user bytes.
+"""
+from pathlib import Path
+from typing import Iterator, Optional
+import struct
+import tempfile
+
+from src.storage.codec import Catalog, decode_user, encode_user
+from src.telemetry.memory import rss_bytes
+
+_LEN = struct.Struct("<I")
+
+
+class SpillBuffer:
+    """
+    Scheduled users, spilled to disk when memory runs over budget.
+
+        with SpillBuffer(courses, budget_mb=512) as buf:
+            for user in scheduled_users:
+                buf.add(user)
+            ser.export_batch(buf, "csv", "cohort.csv")
+
+    Args:
+        catalog (Catalog | Sequence[Course]): Every course the users may hold (one
+            program catalog), for the codec.
+        budget_mb (float, optional): Spill when process RSS exceeds this many MiB.
+        max_held (int, optional): Spill when this many users are held, whatever the
+            RSS. At least one of budget_mb and max_held should be set.
+        path (str, optional): Spill file. A temporary file (removed on close) if None.
+        check_every (int): Users added between RSS reads.
+
+    Attributes:
+        failed (dict[str, str]): User ID -> "<Type>: <message>" for users that could
+            not be scheduled (filled by schedule_bounded). They are not in the buffer.
+    """
+    def __init__(
+        self,
+        catalog,
+        budget_mb: Optional[float] = None,
+        max_held: Optional[int] = None,
+        path: Optional[str] = None,
+        check_every: int = 16,
+    ):
+        self.catalog = catalog if isinstance(catalog, Catalog) else Catalog(catalog)
+        self.budget_bytes = int(budget_mb * (1 << 20)) if budget_mb is not None else None
+        self.max_held = max_held
+        self.check_every = check_every
+        self.held: list = []
+        self.failed: dict[str, str] = {}
+        self.spilled = 0
+        self.spills = 0
+        self.spilled_bytes = 0
+        self.peak_rss = rss_bytes()
+        self._added = 0
+        self._tmp = path is None
+        if self._tmp:
+            fd, path = tempfile.mkstemp(prefix="spill-", suffix=".bin")
+            self._file = open(fd, "w+b")
+        else:
+            self._file = open(path, "w+b")
+        self.path = Path(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.spilled + len(self.held)
+
+    def add(self, user) -> None:
+        """Hold a scheduled user; spill everything held if over budget."""
+        self.hold(user)
+        if self.spill_due():
+            self.spill()
+
+    def hold(self, user) -> None:
+        """Hold a scheduled user without checking the budget."""
+        self.held.append(user)
+        self._added += 1
+
+    def spill_due(self) -> bool:
+        """True if the held users should be spilled now (RSS is read every `check_every` adds)."""
+        if self.max_held is not None and len(self.held) >= self.max_held:
+            return True
+        if self.budget_bytes is None or self._added % self.check_every:
+            return False
+        rss = rss_bytes()
+        if rss is None:
+            return False
+        self.peak_rss = max(self.peak_rss or 0, rss)
+        return rss > self.budget_bytes and bool(self.held)
+
+    def spill(self) -> int:
+        """Encode and write every held user, then release them. Returns users written."""
+        if not self.held:
+            return 0
+        self._file.seek(0, 2)
+        chunks = []
+        for user in self.held:
+            data = encode_user(user, self.catalog)
+            chunks.append(_LEN.pack(len(data)))
+            chunks.append(data)
+        out = b"".join(chunks)
+        self._file.write(out)
+        self._file.flush()
+        n = len(self.held)
+        self.held.clear()
+        self.spilled += n
+        self.spills += 1
+        self.spilled_bytes += len(out)
+        return n
+
+    def __iter__(self) -> Iterator:
+        """Every user added: spilled ones (decoded, in add order), then those held."""
+        self._file.flush()
+        with open(self.path, "rb") as f:
+            for _ in range(self.spilled):
+                (n,) = _LEN.unpack(f.read(_LEN.size))
+                yield decode_user(f.read(n), self.catalog)
+        yield from list(self.held)
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self), "failed": len(self.failed), "spilled": self.spilled, "spills": self.spills,
+            "spilled_bytes": self.spilled_bytes, "held": len(self.held), "peak_rss_bytes": self.peak_rss,
+        }
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+            if self._tmp:
+                self.path.unlink(missing_ok=True)
@@ -0,0 +1,182 @@
+"""Process pool with a hard per-task time limit.
+
+multiprocessing.Pool cannot stop a task that never returns, so one stuck job holds its
+worker for the rest of the batch. SupervisedPool gives each worker one task at a time
+over its own pipe and times it; a worker past `hard_timeout` (or one that dies) is
+killed and replaced, and its task gets a result from `on_lost` instead. The rest of the
+batch keeps running on the other workers.
+
+Cooperative deadlines (src.scheduling.deadline) should stop most long jobs first; the
+hard limit is the backstop for code that never reaches a checkpoint.
+"""
+from multiprocessing.connection import wait
+from typing import Any, Callable, Iterable, Iterator, Optional
+import multiprocessing as mp
+import os
+import sys
+import time
+
+
+def _worker(conn, initializer, initargs) -> None:
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            return
+        if msg is None:
+            return
+        fn, task = msg
+        try:
+            conn.send((True, fn(task)))
+        except Exception as e:
+            conn.send((False, e))
+
+
+class _Slot:
+    """One worker process, its pipe and the task it is running."""
+    def __init__(self, ctx, initializer, initargs):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker, args=(child, initializer, initargs), daemon=True)
+        self.proc.start()
+        child.close()
+        self.task: Any = None
+        self.busy = False
+        self.started = 0.0
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.proc.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.proc.join(timeout=None if kill else 5)
+        if self.proc.is_alive():
+            self.proc.kill()
+            self.proc.join()
+        self.conn.close()
+
+
+class SupervisedPool:
+    """
+    Worker processes that are killed and replaced when a task overruns.
+
+        with SupervisedPool(4, hard_timeout=30) as pool:
+            for result in pool.imap_unordered(process_line, tasks, on_lost):
+                ...
+
+    Args:
+        processes (int, optional): Worker count. Defaults to os.cpu_count().
+        hard_timeout (float, optional): Seconds a task may run before its worker is
+            killed. None for no limit (workers are still replaced if they die).
+        initializer (Callable, optional): Run once in every worker, replacements included.
+        initargs (tuple): Arguments for initializer.
+    """
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        hard_timeout: Optional[float] = None,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = (),
+    ):
+        assert hard_timeout is None or hard_timeout > 0, f"hard_timeout must be positive||{hard_timeout=}"
+        self.processes = processes or os.cpu_count() or 1
+        self.hard_timeout = hard_timeout
+        self.initializer = initializer
+        self.initargs = initargs
+        self.replaced = 0
+        self._ctx = mp.get_context()
+        self._slots = [self._spawn() for _ in range(self.processes)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _spawn(self) -> _Slot:
+        return _Slot(self._ctx, self.initializer, self.initargs)
+
+    def imap_unordered(
+        self,
+        fn: Callable[[Any], Any],
+        tasks: Iterable,
+        on_lost: Callable[[Any, str], Any],
+    ) -> Iterator:
+        """
+        Run fn(task) for every task (consumed lazily), yielding results as they finish.
+
+        Args:
+            fn (Callable): Picklable (module-level) function of one task.
+            tasks (Iterable): Task arguments.
+            on_lost (Callable[[task, reason], result]): Builds the result of a task whose
+                worker was killed for overrunning ("timeout") or died ("exited").
+
+        Raises:
+            Exception: Whatever fn raised in a worker, re-raised here.
+        """
+        tasks = iter(tasks)
+        exhausted = False
+
+        def dispatch(slot: _Slot) -> None:
+            nonlocal exhausted
+            if exhausted:
+                return
+            try:
+                task = next(tasks)
+            except StopIteration:
+                exhausted = True
+                return
+            slot.conn.send((fn, task))
+            slot.task, slot.busy, slot.started = task, True, time.monotonic()
+
+        for slot in self._slots:
+            dispatch(slot)
+
+        while True:
+            busy = [s for s in self._slots if s.busy]
+            if not busy:
+                return
+            timeout = None
+            if self.hard_timeout is not None:
+                timeout = max(0.0, min(s.started for s in busy) + self.hard_timeout - time.monotonic())
+            ready = set(wait([s.conn for s in busy] + [s.proc.sentinel for s in busy], timeout))
+
+            for i, slot in enumerate(self._slots):
+                if not slot.busy:
+                    continue
+                if slot.conn in ready:
+                    try:
+                        ok, value = slot.conn.recv()
+                    except (EOFError, OSError):
+                        yield self._replace(i, on_lost, "exited", dispatch)
+                        continue
+                    slot.task, slot.busy = None, False
+                    dispatch(slot)
+                    if not ok:
+                        raise value
+                    yield value
+                elif slot.proc.sentinel in ready:
+                    yield self._replace(i, on_lost, "exited", dispatch)
+                elif self.hard_timeout is not None and time.monotonic() - slot.started >= self.hard_timeout:
+                    yield self._replace(i, on_lost, "timeout", dispatch)
+
+    def _replace(self, i: int, on_lost, reason: str, dispatch) -> Any:
+        """Kill slot i, start a new worker in its place and give it the next task."""
+        slot = self._slots[i]
+        print(f"SupervisedPool||Worker {slot.proc.pid} {reason}; replacing", file=sys.stderr, flush=True)
+        slot.stop(kill=True)
+        self._slots[i] = self._spawn()
+        self.replaced += 1
+        result = on_lost(slot.task, reason)
+        dispatch(self._slots[i])
+        return result
+
+    def close(self) -> None:
+        """Stop every worker (idle workers exit cleanly, busy ones are killed)."""
+        for slot in self._slots:
+            slot.stop(kill=slot.busy)
+        self._slots = []
@@ -0,0 +1,67 @@
+"""Process-pool worker side of batch scheduling. Workers are initialized once with the
+shared catalog and restraints, then receive only UserOverlay tasks.
+"""
+from typing import Optional
+import contextlib
+import datetime as dt
+import os
+
+from src.batch.shared_catalog import CatalogSpec, SharedCatalog, UserOverlay
+from src.export import session_record
+
+# Per-process state, set by init_shared_worker
+_CATALOG: Optional[SharedCatalog] = None
+_RESTRAINTS = None
+_SPREAD_BETWEEN: Optional[int] = None
+_TIMEOUT: Optional[float] = None
+_AS_OF: Optional[dt.date] = None
+
+
+def init_shared_worker(spec: CatalogSpec, restraints, spread_between: Optional[int] = None,
+                       timeout: Optional[float] = None, as_of: Optional[dt.date] = None) -> None:
+    """Pool initializer: attach to the shared catalog once per worker process."""
+    global _CATALOG, _RESTRAINTS, _SPREAD_BETWEEN, _TIMEOUT, _AS_OF
+    _CATALOG = SharedCatalog.attach(spec)
+    _RESTRAINTS = restraints
+    _SPREAD_BETWEEN = spread_between
+    _TIMEOUT = timeout
+    _AS_OF = as_of
+
+
+def schedule_overlay(overlay: UserOverlay) -> dict:
+    """
+    Schedule one user from its overlay against the attached catalog.
+
+    Returns:
+        dict: {"user_id", "status": "ok", "sessions": [session records]} or
+            {"user_id", "status": "error", "category", "error": "<Type>: <message>"},
+            where category is the SessErrENUM name or exception type.
+    """
+    import src.services as ser
+    from src.scheduling import Deadline, error_category
+
+    deadline = Deadline(_TIMEOUT) if _TIMEOUT is not None else None
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            gib = None
+            if overlay.gib:
+                yearly, start_dt, remaining, asof_ord = overlay.gib
+                gib = ser.create_gib(yearly, tuple(start_dt), tuple(remaining), dt.date.fromordinal(asof_ord))
+            user = ser.create_new_user(
+                first_ses_dt=overlay.first_ses_dt,
+                user_id=overlay.user_id,
+                courses=_CATALOG.build_courses(overlay),
+                grant_amnt_per_ses=overlay.grants,
+                gib=gib,
+            )
+            ser.generate_schedule(user, _RESTRAINTS, _SPREAD_BETWEEN, as_of=_AS_OF, deadline=deadline)
+    except Exception as e:
+        return {"user_id": overlay.user_id, "status": "error", "category": error_category(e),
+                "error": f"{type(e).__name__}: {e}"}
+
+    return {
+        "user_id": overlay.user_id,
+        "status": "ok",
+        "sessions": [session_record(s) for s in sorted(user.schedule)],
+    }
+
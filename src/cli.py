@@ -0,0 +1,344 @@
+"""Batch command line: schedule a cohort from NDJSON job records in one process launch.
+
+Each input line is one user's job, with the fields of main.py's constants in lower case
+(see JOB_DEFAULTS). Missing fields take the defaults, which are not main.py's example
+values: restraints default as Restraints does (2 to 4 courses, benefits not exceeded, no
+in-person minimum or cost cap), with no spread, grants or GI Bill. Dates are ISO strings
+and (month, day) pairs are 2-item lists:
+
+    {"user_id": "User1", "first_session_date": "2025-05-01", "input_path": "course_input.csv",
+     "yearly_gib_amount": 27120.0, "benefit_year_start": [8, 1], "benefits_remaining": [23, 10],
+     "benefits_asof": "2025-08-27", "ses_min_course": 2, "spread_between": 15}
+
+With "catalog_path", input_path is the student's overlay CSV (src.intake.catalog) and
+the program catalog is parsed once per process.
+
+One result line is written per job as it finishes (completion order with --jobs > 1):
+
+    {"line": 1, "user_id": "User1", "status": "ok", "sessions": [<session records>]}
+    {"line": 2, "user_id": "User2", "status": "error", "error": "SchedulingError: ..."}
+
+    python -m src.cli jobs.ndjson --jobs 4 > plans.ndjson
+    cat jobs.ndjson | python -m src.cli - --as-of 2026-01-01
+
+Exit status is 1 if any job failed.
+
+With --checkpoint, every result is also appended to a journal (src.batch.checkpoint).
+Rerunning the same command after a crash skips the jobs in the journal (by user_id,
+or line number for jobs without one) and only writes results for the rest; the journal
+holds the results of the whole run.
+
+With --shard i/K, only the jobs whose user_id hashes to shard i are run, so K processes
+or hosts can split one input without coordinating; --merge combines their outputs:
+
+    for i in 0 1 2; do python -m src.cli jobs.ndjson --shard $i/3 > out.$i.ndjson & done; wait
+    python -m src.cli --merge out.*.ndjson --export schedules.csv --summary summary.json
+
+--timeout gives each job a time limit that the scheduler checks between steps (a job's
+"timeout" field overrides it). --hard-timeout is the backstop: jobs run in a
+SupervisedPool, and a worker still busy with one job after that many seconds is killed
+and replaced. Either way the job gets an error result with category TIMEOUT.
+"""
+from typing import Any, Iterable, Iterator, Optional, TextIO
+import argparse
+import contextlib
+import datetime as dt
+import json
+import multiprocessing as mp
+import os
+import sys
+
+from src.batch import CheckpointJournal, SupervisedPool, merge_shards, parse_shard, shard_of
+from src.scheduling import Deadline, error_category
+from src.telemetry.metrics import REGISTRY, MetricsRegistry
+
+# Job field (main.py's constant, lower case) -> default. Restraint defaults are Restraints';
+# a job without grant or GI Bill fields has neither
+JOB_DEFAULTS: dict[str, Any] = {
+    "user_id": None,
+    "grant_amount_per_session": 0.0,
+    "first_session_date": None,
+    "yearly_gib_amount": None,
+    "benefit_year_start": None,
+    "benefits_remaining": None,
+    "benefits_asof": None,
+    "input_path": "course_input.csv",
+    "catalog_path": None,
+    "absolute_path": False,
+    "inperson_courses": [],
+    "inperson_end_dt": None,
+    "min_inperson": None,
+    "max_inperson": None,
+    "ses_max_cost": None,
+    "ses_min_course": 2,
+    "ses_max_course": 4,
+    "exceed_benefits": False,
+    "spread_between": None,
+    "as_of": None,
+    "timeout": None,
+}
+_DATE_FIELDS = ("first_session_date", "benefits_asof", "inperson_end_dt", "as_of")
+_PAIR_FIELDS = ("benefit_year_start", "benefits_remaining")
+
+# Per-process course pipeline results, by (path, absolute, in-person courses)
+_COURSES: dict[tuple, list] = {}
+# Per-process program catalogs, by (catalog path, absolute, in-person courses)
+_CATALOGS: dict[tuple, Any] = {}
+
+
+def parse_job(record: dict, as_of: Optional[dt.date] = None) -> dict:
+    """
+    Fill defaults and convert JSON values. `as_of` is used if the record has none.
+
+    Raises:
+        ValueError: Unknown field or bad date.
+    """
+    unknown = set(record) - set(JOB_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown job field(s): {sorted(unknown)}")
+    job = {**JOB_DEFAULTS, **record}
+    for key in _DATE_FIELDS:
+        if isinstance(job[key], str):
+            job[key] = dt.date.fromisoformat(job[key])
+    for key in _PAIR_FIELDS:
+        if job[key] is not None:
+            job[key] = tuple(job[key])
+    if job["as_of"] is None:
+        job["as_of"] = as_of
+    return job
+
+
+def _courses(job: dict) -> list:
+    import src.services as ser
+
+    if job["catalog_path"]:
+        # input_path is the student's overlay; the catalog is parsed once per process
+        key = (job["catalog_path"], job["absolute_path"], tuple(job["inperson_courses"]))
+        catalog = _CATALOGS.get(key)
+        if catalog is None:
+            catalog = _CATALOGS[key] = ser.get_program_catalog(
+                catalog_path=job["catalog_path"],
+                catalog_path_abs=job["absolute_path"],
+                in_person=list(job["inperson_courses"]),
+            )
+        return ser.get_courses_pipeline(job["input_path"], job["absolute_path"], catalog=catalog)
+
+    key = (job["input_path"], job["absolute_path"], tuple(job["inperson_courses"]))
+    courses = _COURSES.get(key)
+    if courses is None:
+        courses = _COURSES[key] = ser.get_courses_pipeline(
+            course_path=job["input_path"],
+            course_path_abs=job["absolute_path"],
+            in_person=list(job["inperson_courses"]),
+        )
+    # Scheduling only reads courses (as with catalog.join): users share the Course objects
+    return list(courses)
+
+
+def run_job(job: dict, metrics=None, deadline: Optional[Deadline] = None):
+    """Schedule one parsed job with the service pipeline. Returns the scheduled User."""
+    import src.services as ser
+
+    gib = None
+    if job["yearly_gib_amount"]:
+        gib = ser.create_gib(
+            yearly_amount=job["yearly_gib_amount"],
+            start_dt=job["benefit_year_start"],
+            remaining_time=job["benefits_remaining"],
+            days_as_of=job["benefits_asof"],
+        )
+    user = ser.create_new_user(
+        first_ses_dt=job["first_session_date"],
+        user_id=job["user_id"],
+        courses=_courses(job),
+        grant_amnt_per_ses=job["grant_amount_per_session"],
+        gib=gib,
+    )
+    restraints = ser.generate_restraints(
+        inperson_courses=job["inperson_courses"],
+        in_person_end_dt=job["inperson_end_dt"],
+        min_inperson=job["min_inperson"],
+        max_inperson=job["max_inperson"],
+        ses_max_cost=job["ses_max_cost"],
+        ses_min_class=job["ses_min_course"],
+        ses_max_class=job["ses_max_course"],
+        exceed_benefits=job["exceed_benefits"],
+    )
+    ser.generate_schedule(user, restraints, job["spread_between"], as_of=job["as_of"], metrics=metrics,
+                          deadline=deadline)
+    return user
+
+
+def process_line(task: tuple[int, str, Optional[dt.date], Optional[float]]) -> dict:
+    """
+    Parse and schedule one input line. Never raises: failures become error results.
+    The job's "timeout" field (or the task's default) is its cooperative time limit in
+    seconds; overrunning gives an error result with category TIMEOUT.
+
+    Returns:
+        dict: {"line", "user_id", "status": "ok", "sessions"} or
+            {"line", "user_id", "status": "error", "category", "error": "<Type>: <message>"},
+            where category is the SessErrENUM name or exception type. The job's metrics
+            snapshot is under "_metrics" (removed by run_batch).
+    """
+    from src.export import session_record
+
+    line_no, line, as_of, timeout = task
+    user_id = None
+    metrics = MetricsRegistry()
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError("Job record must be a JSON object")
+        user_id = record.get("user_id")
+        job = parse_job(record, as_of)
+        seconds = job["timeout"] if job["timeout"] is not None else timeout
+        deadline = Deadline(seconds) if seconds is not None else None
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            user = run_job(job, metrics, deadline)
+    except Exception as e:
+        return {"line": line_no, "user_id": user_id, "status": "error", "category": error_category(e),
+                "error": f"{type(e).__name__}: {e}", "_metrics": metrics.snapshot()}
+    return {
+        "line": line_no,
+        "user_id": user.id_,
+        "status": "ok",
+        "sessions": [session_record(s) for s in sorted(user.schedule)],
+        "_metrics": metrics.snapshot(),
+    }
+
+
+def _lost_result(task: tuple, reason: str) -> dict:
+    """Result of a job whose worker SupervisedPool killed (hard timeout) or lost."""
+    from src.services import lost_result
+
+    line_no, line = task[:2]
+    try:
+        user_id = json.loads(line).get("user_id")
+    except (ValueError, AttributeError):
+        user_id = None
+    metrics = MetricsRegistry()
+    return {"line": line_no, **lost_result(user_id, reason, metrics), "_metrics": metrics.snapshot()}
+
+
+def job_key(line_no: int, line: str) -> str:
+    """Checkpoint key of a job line: its user_id, or "line:<n>" if it has none (or is not valid JSON)."""
+    try:
+        user_id = json.loads(line).get("user_id")
+    except (ValueError, AttributeError):
+        user_id = None
+    return f"line:{line_no}" if user_id is None else str(user_id)
+
+
+def _tasks(lines: Iterable[str], as_of: Optional[dt.date], journal=None, keys=None,
+           shard: Optional[tuple[int, int]] = None, timeout: Optional[float] = None) -> Iterator[tuple]:
+    for i, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        if journal is not None or shard is not None:
+            key = job_key(i, line)
+            if shard is not None and shard_of(key, shard[1]) != shard[0]:
+                continue
+            if journal is not None:
+                if journal.is_done(key):
+                    continue
+                keys[i] = key
+        yield i, line, as_of, timeout
+
+
+def run_batch(lines: Iterable[str], jobs: int = 1, as_of: Optional[dt.date] = None,
+              chunksize: int = 1, journal=None, shard: Optional[tuple[int, int]] = None,
+              metrics: Optional[MetricsRegistry] = None, timeout: Optional[float] = None,
+              hard_timeout: Optional[float] = None) -> Iterator[dict]:
+    """
+    Schedule every job line. Results are yielded as each finishes: in input order with
+    jobs=1, completion order otherwise. Lines are read lazily.
+
+    With a CheckpointJournal, jobs already in it are skipped and each result is
+    recorded before it is yielded. With shard=(i, K), only jobs whose key hashes to
+    shard i of K are run (src.batch.sharding). Each job's metrics, from whichever
+    process ran it, are merged into `metrics` (default the process-wide REGISTRY).
+
+    `timeout` is the cooperative time limit (seconds) of jobs without a "timeout"
+    field. With `hard_timeout`, jobs run in a SupervisedPool (even with jobs=1) and a
+    job still running after that many seconds has its worker killed and replaced; it
+    gets a TIMEOUT error result.
+    """
+    metrics = metrics or REGISTRY
+    keys: dict[int, str] = {}          # line -> checkpoint key, for dispatched jobs
+    tasks = _tasks(lines, as_of, journal, keys, shard, timeout)
+    if hard_timeout is not None:
+        pool = SupervisedPool(max(jobs, 1), hard_timeout)
+        results = pool.imap_unordered(process_line, tasks, _lost_result)
+    elif jobs <= 1:
+        results = map(process_line, tasks)
+        pool = contextlib.nullcontext()
+    else:
+        pool = mp.Pool(jobs)
+        results = pool.imap_unordered(process_line, tasks, chunksize)
+    with pool:
+        for result in results:
+            metrics.merge(result.pop("_metrics"))
+            if journal is not None:
+                journal.record(keys.pop(result["line"]), result)
+            yield result
+
+
+def main(argv: Optional[list[str]] = None, stdout: TextIO = sys.stdout) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m src.cli", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    ap.add_argument("input", nargs="*", default=["-"],
+                    help="NDJSON job file, or - for stdin (default). With --merge: shard result files")
+    ap.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes (default 1)")
+    ap.add_argument("--as-of", type=dt.date.fromisoformat, default=None,
+                    help="Date sessions are past/future from, for jobs without as_of (default today)")
+    ap.add_argument("--chunksize", type=int, default=1, help="Jobs per worker task message")
+    ap.add_argument("--checkpoint", default=None,
+                    help="Journal file: record finished jobs, and skip those already in it")
+    ap.add_argument("--shard", type=parse_shard, default=None, metavar="i/K",
+                    help="Run only shard i of K (0-based), by hash of user_id")
+    ap.add_argument("--timeout", type=float, default=None,
+                    help="Seconds per job, checked between scheduling steps (job field \"timeout\" overrides)")
+    ap.add_argument("--hard-timeout", type=float, default=None,
+                    help="Kill and replace a worker whose job runs this many seconds")
+    ap.add_argument("--metrics", default=None, help="Write OpenMetrics text here when the run ends")
+    ap.add_argument("--metrics-port", type=int, default=None,
+                    help="Serve OpenMetrics at http://127.0.0.1:PORT/metrics during the run")
+    ap.add_argument("--merge", action="store_true",
+                    help="Merge shard result files into one export and summary instead of scheduling")
+    ap.add_argument("--export", default=None, help="With --merge: combined export path")
+    ap.add_argument("--format", default="csv", help="With --merge: export format (default csv)")
+    ap.add_argument("--summary", default=None, help="With --merge: summary JSON path")
+    args = ap.parse_args(argv)
+
+    if args.merge:
+        summary = merge_shards(args.input, args.export, args.format, args.summary)
+        stdout.write(json.dumps(summary) + "\n")
+        return 1 if summary["errors"] else 0
+    if len(args.input) != 1:
+        ap.error("one job input expected (several only with --merge)")
+
+    failed = 0
+    with contextlib.ExitStack() as stack:
+        if args.metrics_port is not None:
+            stack.callback(REGISTRY.serve(args.metrics_port).shutdown)
+        if args.metrics:
+            stack.callback(REGISTRY.write, args.metrics)
+        path = args.input[0]
+        f = stack.enter_context(open(path, encoding="utf-8")) if path != "-" else sys.stdin
+        journal = None
+        if args.checkpoint:
+            journal = stack.enter_context(CheckpointJournal(args.checkpoint))
+            if journal.recovered:
+                print(f"Checkpoint||Skipping {journal.recovered} finished jobs", file=sys.stderr)
+        for result in run_batch(f, args.jobs, args.as_of, args.chunksize, journal, args.shard,
+                                timeout=args.timeout, hard_timeout=args.hard_timeout):
+            failed += result["status"] != "ok"
+            stdout.write(json.dumps(result, default=str) + "\n")
+            stdout.flush()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
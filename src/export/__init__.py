@@ -0,0 +1,10 @@
+from .rows import (
+    EXPORT_COLUMNS,
+    EXPORT_FIELDS,
+    EXPORT_KEYS,
+    session_record,
+    session_row,
+    user_records,
+)
+from .stream import BatchExporter, export_users, BATCH_FORMATS
+from .delta import DeltaExporter, export_delta, session_hash, state_from_csv, DELTA_FORMATS
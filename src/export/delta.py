@@ -0,0 +1,231 @@
+"""Delta export: only the session rows that changed since the previous export.
+
+Each exported session row is identified by (user_id, session number) and fingerprinted
+by a content hash over every export column (session, start date, courses, intents,
+credit hours and the cost columns). The hashes of the previous run are kept in a small
+state file. A run compares against it and writes three kinds of rows:
+
+    insert  a session not in the previous export
+    update  a session whose hash changed
+    delete  a session in the previous export but not in this one
+
+Unchanged sessions are not written. The state file is replaced only after the delta
+is complete. The manifest, with per-operation counts, is written last, so it marks a
+finished delta.
+
+A first run with no state exports every session as an insert. To start from an
+existing full CSV from export_schedule, build the state with state_from_csv.
+"""
+from typing import Iterable, Optional
+import csv
+import datetime as dt
+import hashlib
+import json
+import os
+
+from .rows import EXPORT_COLUMNS, EXPORT_KEYS, user_records
+
+DELTA_FORMATS = ("ndjson", "csv")
+DELTA_OPS = ("insert", "update", "delete")
+STATE_VERSION = 1
+
+_LIST_KEYS = ("courses", "intent_courses")
+
+
+def session_hash(rec: dict) -> str:
+    """
+    Content hash of one session record (session_record keys; extra keys ignored).
+    Values are hashed as their CSV text, so a record read back from an export_schedule
+    CSV hashes the same as the session it was written from.
+    """
+    parts = []
+    for k in EXPORT_KEYS:
+        v = rec[k]
+        parts.append(", ".join(v) if k in _LIST_KEYS else str(v))
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def load_state(path: str) -> dict[str, dict[str, str]]:
+    """{user_id: {session number (str): hash}} from a state file, or {} if there is none."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    assert data.get("version") == STATE_VERSION, f"Unsupported delta state version||{data.get('version')}"
+    return data["users"]
+
+
+def save_state(path: str, users: dict[str, dict[str, str]]) -> None:
+    """Write a state file atomically (temp file, then rename)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, mode="w", encoding="utf-8") as f:
+        json.dump({"version": STATE_VERSION, "users": users}, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def state_from_csv(csv_path: str, user_id) -> dict[str, dict[str, str]]:
+    """Delta state for one user from a full export_schedule CSV (the previous output)."""
+    sessions = {}
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        assert header == EXPORT_COLUMNS, f"Not an export_schedule CSV||{csv_path}"
+        for row in reader:
+            rec = dict(zip(EXPORT_KEYS, row))
+            for k in _LIST_KEYS:
+                rec[k] = rec[k].split(", ") if rec[k] else []
+            sessions[str(rec["session"])] = session_hash(rec)
+    return {str(user_id): sessions}
+
+
+class DeltaExporter:
+    """
+    Writes the session rows that differ from the previous export.
+
+        with DeltaExporter("delta.ndjson", "schedules.state.json", "delta.manifest.json") as ex:
+            for user in users:
+                ex.write_user(user)
+        ex.manifest["counts"]        # {"insert": .., "update": .., "delete": .., "unchanged": ..}
+
+    Rows carry "op" plus the key and the new hash. Inserts and updates also carry the
+    session record. Deletes carry the key and the old hash only.
+
+    Args:
+        path (str): Delta output path.
+        state_path (str): Previous run's hashes; replaced with this run's on close.
+        manifest_path (str, optional): Manifest JSON path. Not written if None.
+        format (str): "ndjson" or "csv" (Op, User ID, Hash, then the export columns).
+        complete (bool): The run covers the whole cohort, so users in the state but not
+            written are deleted. Otherwise they are kept as they were.
+    """
+    def __init__(
+        self,
+        path: str,
+        state_path: str,
+        manifest_path: Optional[str] = None,
+        format: str = "ndjson",
+        complete: bool = False,
+    ):
+        if format not in DELTA_FORMATS:
+            raise ValueError(f"Unsupported delta format: {format}")
+        self.path = path
+        self.state_path = state_path
+        self.manifest_path = manifest_path
+        self.format = format
+        self.complete = complete
+        self.previous = load_state(state_path)
+        self.current: dict[str, dict[str, str]] = {}
+        self.counts = {op: 0 for op in DELTA_OPS}
+        self.counts["unchanged"] = 0
+        self.users_changed = 0
+        self.manifest: Optional[dict] = None
+        self._file = open(path, mode="w", newline="", encoding="utf-8")
+        self._writer = None
+        if format == "csv":
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["Op", "User ID", "Hash"] + EXPORT_COLUMNS)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            # Leave the state (and manifest) as they were; the next run redoes this one
+            self._file.close()
+
+    def write_user(self, user) -> None:
+        """Compare one scheduled user's sessions with the previous export."""
+        self.write_records(user.id_, user_records(user))
+
+    def write_records(self, user_id, sessions: Iterable[dict]) -> None:
+        """As write_user, from session_record dicts (e.g. a batch result's "sessions")."""
+        uid = str(user_id)
+        old = self.previous.get(uid, {})
+        new = {}
+        changed = False
+        for rec in sessions:
+            key = str(rec["session"])
+            h = session_hash(rec)
+            new[key] = h
+            prev = old.get(key)
+            if prev == h:
+                self.counts["unchanged"] += 1
+                continue
+            self._row("insert" if prev is None else "update", uid, h, rec)
+            changed = True
+        for key, h in old.items():
+            if key not in new:
+                self._row("delete", uid, h, {"session": int(key)})
+                changed = True
+        self.current[uid] = new
+        self.users_changed += changed
+
+    def _row(self, op: str, uid: str, h: str, rec: dict) -> None:
+        self.counts[op] += 1
+        if self.format == "ndjson":
+            out = {"op": op, "user_id": uid, "hash": h}
+            out.update((k, rec[k]) for k in EXPORT_KEYS if k in rec)
+            self._file.write(json.dumps(out) + "\n")
+            return
+        values = [(", ".join(rec[k]) if k in _LIST_KEYS else rec[k]) if k in rec else "" for k in EXPORT_KEYS]
+        self._writer.writerow([op, uid, h] + values)
+
+    def close(self) -> dict:
+        """Finish the delta: deletes for missing users (if complete), state, manifest."""
+        if self.manifest is not None:
+            return self.manifest
+        state = dict(self.previous)
+        state.update(self.current)
+        users_deleted = 0
+        if self.complete:
+            for uid in [u for u in self.previous if u not in self.current]:
+                for key, h in self.previous[uid].items():
+                    self._row("delete", uid, h, {"session": int(key)})
+                del state[uid]
+                users_deleted += 1
+        self._file.close()
+        save_state(self.state_path, state)
+
+        self.manifest = {
+            "created_at": dt.datetime.now().isoformat(timespec="seconds"),
+            "format": self.format,
+            "delta_path": self.path,
+            "state_path": self.state_path,
+            "complete": self.complete,
+            "counts": dict(self.counts),
+            "rows_written": sum(self.counts[op] for op in DELTA_OPS),
+            "users": len(self.current),
+            "users_changed": self.users_changed + users_deleted,
+            "users_deleted": users_deleted,
+            "previous_users": len(self.previous),
+        }
+        if self.manifest_path:
+            with open(self.manifest_path, mode="w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, indent=2)
+        return self.manifest
+
+
+def export_delta(
+    users: Iterable,
+    path: str,
+    state_path: str,
+    manifest_path: Optional[str] = None,
+    format: str = "ndjson",
+    complete: bool = False,
+) -> dict:
+    """
+    Write the session rows of `users` that changed since the last delta export.
+    See DeltaExporter for the arguments.
+
+    Returns:
+        dict: The manifest.
+    """
+    with DeltaExporter(path, state_path, manifest_path, format, complete) as ex:
+        for user in users:
+            ex.write_user(user)
+    return ex.manifest
@@ -0,0 +1,51 @@
+from typing import Iterator
+
+# (CSV header, field key) for every exported session column, in output order.
+# Keys are used by NDJSON and Arrow/Parquet output.
+EXPORT_FIELDS = [
+    ("Session", "session"),
+    ("Start Date", "start_date"),
+    ("Courses", "courses"),
+    ("Intent Courses", "intent_courses"),
+    ("Total CH", "total_ch"),
+    ("Total Cost", "total_cost"),
+    ("User Cost", "user_cost"),
+    ("Grants Applied", "grants_applied"),
+    ("GIB Benefits Applied", "gib_applied"),
+    ("GI Bill Benefits Remaining", "gib_remaining"),
+]
+
+EXPORT_COLUMNS = [h for h, _ in EXPORT_FIELDS]
+EXPORT_KEYS = [k for _, k in EXPORT_FIELDS]
+
+
+def session_record(session) -> dict:
+    """One exported session as {field key: value}. Course columns are lists of course IDs."""
+    start_date = session.start_date
+    return {
+        "session": session.num,
+        "start_date": start_date.isoformat() if hasattr(start_date, 'isoformat') else start_date,
+        "courses": [course.course_id for course in session.courses],
+        "intent_courses": [course.course_id for course in session.intent],
+        "total_ch": session.tot_ch,
+        "total_cost": round(session.tot_cost),
+        "user_cost": round(session.adj_cost),
+        "grants_applied": round(session.grants_applied),
+        "gib_applied": round(session.gib_applied),
+        "gib_remaining": round(session.gib_remaining),
+    }
+
+
+def session_row(session) -> list:
+    """One exported session as a CSV row, in EXPORT_COLUMNS order."""
+    rec = session_record(session)
+    rec["courses"] = ', '.join(rec["courses"])
+    rec["intent_courses"] = ', '.join(rec["intent_courses"])
+    return [rec[k] for k in EXPORT_KEYS]
+
+
+def user_records(user) -> Iterator[dict]:
+    """Session records for a user's schedule in session order, tagged with `user_id`."""
+    uid = str(user.id_)
+    for session in sorted(user.schedule):
+        yield {"user_id": uid, **session_record(session)}
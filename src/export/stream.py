@@ -0,0 +1,166 @@
+from typing import Iterable, Optional
+import csv
+import json
+import os
+
+from .rows import EXPORT_COLUMNS, EXPORT_KEYS, user_records
+
+BATCH_FORMATS = ("ndjson", "csv", "parquet", "arrow")
+
+# Rows held in memory before a write. Bounds memory regardless of cohort size.
+DEFAULT_BATCH_ROWS = 10_000
+WRITE_BUFFER_BYTES = 1 << 20
+
+
+class BatchExporter:
+    """
+    Streams scheduled users into one output file, batch_rows session rows at a time.
+
+    Formats:
+        ndjson: One JSON object per session row, with `user_id`.
+        csv: One combined CSV, `User ID` column first, then the export_schedule columns.
+        parquet / arrow: Columnar output, requires pyarrow. Written one record batch
+            (row group) per flush.
+
+    Use as a context manager, or call close() when done:
+
+        with BatchExporter("out.ndjson", "ndjson") as ex:
+            for user in users:
+                ex.write_user(user)
+    """
+    def __init__(
+        self,
+        path: str,
+        format: str = "ndjson",
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        absoloute: bool = False,
+    ):
+        if format not in BATCH_FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+        assert batch_rows > 0, f"batch_rows must be positive: {batch_rows}"
+
+        self.format = format
+        self.path = os.path.abspath(path) if absoloute else path
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        self.users_written = 0
+        self._batch: list[dict] = []
+        self._file = None
+        self._writer = None
+
+        if format in ("parquet", "arrow"):
+            self._open_arrow()
+        else:
+            self._file = open(self.path, mode="w", newline="", encoding="utf-8",
+                              buffering=WRITE_BUFFER_BYTES)
+            if format == "csv":
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(["User ID"] + EXPORT_COLUMNS)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open_arrow(self):
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError(f"pyarrow is required for '{self.format}' export") from e
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ("user_id", pa.string()),
+            ("session", pa.int32()),
+            ("start_date", pa.string()),
+            ("courses", pa.list_(pa.string())),
+            ("intent_courses", pa.list_(pa.string())),
+            ("total_ch", pa.int32()),
+            ("total_cost", pa.int64()),
+            ("user_cost", pa.int64()),
+            ("grants_applied", pa.int64()),
+            ("gib_applied", pa.int64()),
+            ("gib_remaining", pa.int64()),
+        ])
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        else:
+            self._file = pa.OSFile(self.path, "wb")
+            self._writer = pa.ipc.new_file(self._file, self._schema)
+
+    def write_user(self, user) -> None:
+        """Queue all sessions of one scheduled user, flushing whenever a batch fills."""
+        self._write(user_records(user))
+
+    def write_records(self, user_id, sessions: Iterable[dict]) -> None:
+        """Queue one user's session records (session_record dicts), e.g. from a batch result."""
+        uid = str(user_id)
+        self._write({"user_id": uid, **rec} for rec in sessions)
+
+    def _write(self, records: Iterable[dict]) -> None:
+        for rec in records:
+            self._batch.append(rec)
+            if len(self._batch) >= self.batch_rows:
+                self.flush()
+        self.users_written += 1
+
+    def write_users(self, users: Iterable) -> int:
+        """Consume an iterator of scheduled users. Returns total rows written so far."""
+        for user in users:
+            self.write_user(user)
+        self.flush()
+        return self.rows_written
+
+    def flush(self) -> None:
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+
+        if self.format == "ndjson":
+            self._file.write("".join(json.dumps(rec) + "\n" for rec in batch))
+        elif self.format == "csv":
+            self._writer.writerows(
+                [rec["user_id"]]
+                + [', '.join(rec[k]) if k in ("courses", "intent_courses") else rec[k] for k in EXPORT_KEYS]
+                for rec in batch
+            )
+        else:
+            cols = {name: [rec[name] for rec in batch] for name in self._schema.names}
+            self._writer.write_batch(self._pa.record_batch(cols, schema=self._schema))
+
+        self.rows_written += len(batch)
+
+    def close(self) -> None:
+        self.flush()
+        if self.format in ("parquet", "arrow"):
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def export_users(
+    users: Iterable,
+    path: str,
+    format: str = "ndjson",
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    absoloute: bool = False,
+) -> int:
+    """
+    Stream scheduled users into one file. `users` may be any iterator (e.g. a generator
+    that schedules lazily); only `batch_rows` rows are held in memory at once.
+
+    Args:
+        users (Iterable[User]): Scheduled users.
+        path (str): Output path.
+        format (str): One of BATCH_FORMATS. Defaults to "ndjson".
+        batch_rows (int): Rows per buffered write.
+        absoloute (bool): Convert `path` to an absolute path.
+
+    Returns:
+        int: Session rows written.
+    """
+    with BatchExporter(path, format, batch_rows, absoloute) as ex:
+        return ex.write_users(users)
@@ -2,6 +2,15 @@ from src.intake.org import (
     create_courses,
     organize_courses,
     prioritize_courses,
+    parse_prereqs,
+    format_prereqs,
+)
+from src.intake.intake import fetch_data, fetch_bulk_data, fetch_dir_data
+from src.intake.catalog import (
+    ProgramCatalog,
+    OverlayRow,
+    fetch_catalog_data,
+    read_overlay,
+    read_bulk_overlays,
+    parse_overlay,
 )
-from src.intake.intake import fetch_data
-
@@ -0,0 +1,264 @@
+"""Program catalog plus per-student overlay intake.
+
+A course_input.csv repeats the whole program (credit hours, level, prereqs, capstone)
+for every student. Here the program is read once into a ProgramCatalog: validated,
+turned into Course objects and topo-prioritized. Each student then only supplies an
+overlay of the courses where they differ from "not started":
+
+    Course ID,Status,Session,Transfer Intent,Challenge Intent
+    BIAM110,1,5,,
+    CEIS101,2,2,,
+    SPCH275,0,,1,
+
+join() builds the student's course list from the catalog in catalog (priority) order.
+Overlay courses are new Course objects (dataclasses.replace of the catalog course).
+Every other course is the catalog's own object, shared between students. Scheduling
+only reads courses, so nothing is copied per student except the overlay rows. Callers
+that change courses in place should pass copy=True.
+
+Column names accept the same variants as the full format (intake.COLUMN_MAP).
+"""
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+import csv
+import math
+
+import pandas as pd
+
+from config.course_enums import StatusENUM
+from src.scheduling.course import Course
+from .intake import COLUMN_MAP, normalize_columns, normalize_prereqs, replace_bool, validate_df
+
+# region Columns
+
+CATALOG_COLUMNS = ["course id", "credit hours", "level", "prereqs", "capstone"]
+OVERLAY_COLUMNS = ["course id", "status", "session", "transfer intent", "challenge intent"]
+
+# Variant (lowercase) -> standard column name
+_STD_NAMES = {v: std for std, variants in COLUMN_MAP.items() for v in variants}
+
+
+def _std_header(header: Iterable[str]) -> list[str]:
+    return [_STD_NAMES.get(h.lower().strip(), h.lower().strip()) for h in header]
+
+# endregion
+
+
+# region Catalog
+
+def fetch_catalog_data(file_path: str, is_absolute: bool = True) -> pd.DataFrame:
+    """
+    Load and validate a program catalog file (CSV or Excel), as fetch_data does for a
+    full course file. Only CATALOG_COLUMNS are required. Per-student columns, if
+    present (e.g. a course_input.csv reused as the catalog), are ignored.
+
+    Raises:
+        ValueError: Unsupported extension, missing columns, duplicate course ids, or
+            failed validation.
+    """
+    print("Fetching program catalog")
+    path = Path(file_path)
+    if not is_absolute:
+        path = Path.cwd() / path
+
+    ext = path.suffix.lower()
+    if ext in [".xlsx", ".xls"]:
+        df = pd.read_excel(path)
+    elif ext == ".csv":
+        df = pd.read_csv(path)
+    else:
+        raise ValueError(f"Unsupported file extension: {ext}")
+
+    df = normalize_columns(df)
+    missing = [c for c in CATALOG_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Catalog missing required columns: {missing}")
+    df = df[CATALOG_COLUMNS].copy()
+    dupes = df.loc[df["course id"].duplicated(), "course id"]
+    if not dupes.empty:
+        raise ValueError(f"Duplicate catalog course ids: {dupes.tolist()}")
+
+    # Every course "not started"; students' standing comes from their overlays
+    df["status"] = StatusENUM.NONE.value
+    df["session"] = math.nan
+    df["transfer intent"] = 0
+    df["challenge intent"] = 0
+
+    validate_df(df)
+    df = normalize_prereqs(df)
+    df = replace_bool(df)
+    print("Catalog Fetch/Validation Complete")
+    return df
+
+
+class OverlayRow(NamedTuple):
+    """One student's standing in one course."""
+    status: int = StatusENUM.NONE.value
+    session: Optional[int] = None
+    transfer_intent: bool = False
+    challenge_intent: bool = False
+
+
+class ProgramCatalog:
+    """
+    One program's prioritized courses, joined with per-student overlays.
+
+        catalog = ser.get_program_catalog("program.csv", False)
+        courses = catalog.join(read_overlay("students/User1.csv", False))
+
+    Args:
+        courses (list[Course]): Prioritized catalog courses, all "not started" (as
+            built by get_program_catalog). Order is kept.
+    """
+    def __init__(self, courses: list[Course]):
+        self.courses = list(courses)
+        self.index = {c.course_id: i for i, c in enumerate(self.courses)}
+        assert len(self.index) == len(self.courses), "Catalog course ids must be unique"
+
+    def __len__(self):
+        return len(self.courses)
+
+    def __contains__(self, course_id) -> bool:
+        return course_id in self.index
+
+    def join(self, overlay: dict[str, OverlayRow], copy: bool = False) -> list[Course]:
+        """
+        A student's course list: the catalog with their overlay applied.
+
+        Args:
+            overlay (dict[str, OverlayRow]): Course id -> standing (read_overlay).
+            copy (bool): Give every course its own object, not only overlay courses.
+
+        Returns:
+            list[Course]: In catalog order, as get_courses_pipeline returns them.
+
+        Raises:
+            ValueError: If the overlay names a course not in the catalog.
+        """
+        unknown = [cid for cid in overlay if cid not in self.index]
+        if unknown:
+            raise ValueError(f"Overlay courses not in catalog: {unknown}")
+
+        courses = [replace(c) for c in self.courses] if copy else list(self.courses)
+        for cid, row in overlay.items():
+            i = self.index[cid]
+            courses[i] = replace(
+                self.courses[i],
+                status=row.status,
+                session=row.session,
+                transfer_intent=row.transfer_intent,
+                challenge_intent=row.challenge_intent,
+            )
+        return courses
+
+# endregion
+
+
+# region Overlay
+
+def _parse_row(rec: dict, where: str) -> tuple[str, OverlayRow]:
+    """Validate one overlay row with the rules of validate_df."""
+    cid = (rec.get("course id") or "").strip()
+    if not cid:
+        raise ValueError(f"{where}: missing course id")
+
+    status = rec.get("status", "").strip()
+    status = int(float(status)) if status else StatusENUM.NONE.value
+    if status not in [e.value for e in StatusENUM]:
+        raise ValueError(f"{where}: invalid status value: {status}")
+
+    session = rec.get("session", "").strip()
+    if session:
+        try:
+            session = float(session)
+        except ValueError:
+            raise TypeError(f"{where}: 'session' must be None or a number") from None
+        session = int(session) if session.is_integer() else None
+    else:
+        session = None
+
+    flags = []
+    for col in ("transfer intent", "challenge intent"):
+        v = rec.get(col, "").strip()
+        if v not in ("", "0", "1", "0.0", "1.0"):
+            raise ValueError(f"{where}: '{col}' must only contain 0 or 1")
+        flags.append(v in ("1", "1.0"))
+
+    return cid, OverlayRow(status, session, *flags)
+
+
+def parse_overlay(records: Iterable[dict], where: str = "overlay") -> dict[str, OverlayRow]:
+    """
+    Overlay from row dicts keyed by standard column names (values as CSV text).
+
+    Raises:
+        ValueError: Bad value or a course listed twice.
+        TypeError: Non-numeric session.
+    """
+    overlay = {}
+    for n, rec in enumerate(records, 1):
+        cid, row = _parse_row(rec, f"{where} row {n}")
+        if cid in overlay:
+            raise ValueError(f"{where}: course {cid} listed twice")
+        overlay[cid] = row
+    return overlay
+
+
+def _open_overlay(file_path: str, is_absolute: bool):
+    path = Path(file_path)
+    if not is_absolute:
+        path = Path.cwd() / path
+    if path.suffix.lower() != ".csv":
+        raise ValueError(f"Unsupported overlay extension: {path.suffix.lower()} (CSV only)")
+    return open(path, newline="", encoding="utf-8")
+
+
+def read_overlay(file_path: str, is_absolute: bool = True) -> dict[str, OverlayRow]:
+    """
+    Read one student's overlay CSV. Read with the csv module, not pandas, so the cost
+    follows the row count.
+
+    Returns:
+        dict[str, OverlayRow]: Course id -> standing.
+    """
+    with _open_overlay(file_path, is_absolute) as f:
+        reader = csv.reader(f)
+        header = _std_header(next(reader, []))
+        if "course id" not in header:
+            raise ValueError(f"Overlay requires a 'course id' column: {file_path}")
+        return parse_overlay((dict(zip(header, row)) for row in reader if any(row)), str(file_path))
+
+
+def read_bulk_overlays(file_path: str, is_absolute: bool = True) -> Iterator[tuple[Any, dict[str, OverlayRow]]]:
+    """
+    Lazily read a long-format overlay file with a `user id` column, rows for one
+    student contiguous, yielding (user id, overlay) per student.
+
+    Raises:
+        ValueError: Missing columns, or a student's rows are not contiguous.
+    """
+    seen = set()
+    with _open_overlay(file_path, is_absolute) as f:
+        reader = csv.reader(f)
+        header = _std_header(next(reader, []))
+        if "user id" not in header or "course id" not in header:
+            raise ValueError("Bulk overlay file requires 'user id' and 'course id' columns")
+        uid_col = header.index("user id")
+
+        user_id, rows = None, []
+        for row in reader:
+            if not any(row):
+                continue
+            if row[uid_col] != user_id:
+                if rows:
+                    yield user_id, parse_overlay(rows, f"User {user_id}")
+                if row[uid_col] in seen:
+                    raise ValueError(f"Rows for user {row[uid_col]} are not contiguous")
+                user_id, rows = row[uid_col], []
+                seen.add(user_id)
+            rows.append(dict(zip(header, row)))
+        if rows:
+            yield user_id, parse_overlay(rows, f"User {user_id}")
+
+# endregion
@@ -4,6 +4,7 @@ from config.settings import (
     IN_PERSON_PRIORITY,
 )
 from pathlib import Path
+from typing import Any, Iterator
 
 
 
@@ -20,8 +21,12 @@ COLUMN_MAP = {
     "session": ["session"],
     "transfer intent": ["transfer intent", "transferintent", "transfer-intent", "transfer_intent"],
     "challenge intent": ["challenge intent", "challengeintent", "challenge-intent", "challenge_intent"],
+    "user id": ["user id", "userid", "user-id", "user_id", "student id", "student_id"],
 }
 
+# Columns only used by bulk (multi-user) files
+OPTIONAL_COLUMNS = ["user id"]
+
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Map any variant column names to standard lowercase names."""
     col_map = {}
@@ -75,7 +80,7 @@ def validate_df(df: pd.DataFrame) -> bool:
     print("Validating DataFrame")
     df = normalize_columns(df)
 
-    required_columns = list(COLUMN_MAP.keys())
+    required_columns = [col for col in COLUMN_MAP if col not in OPTIONAL_COLUMNS]
 
     # Check columns
     missing_cols = [col for col in required_columns if col not in df.columns]
@@ -191,3 +196,158 @@ def fetch_data(file_path: str, is_absolute: bool = True) -> pd.DataFrame:
 # endregion
 
 
+# region Bulk Intake
+
+BULK_CHUNK_ROWS = 50_000
+SUPPORTED_EXTENSIONS = [".csv", ".xlsx", ".xls"]
+NUMERIC_COLUMNS = ["credit hours", "status", "level", "capstone", "session",
+                   "transfer intent", "challenge intent"]
+
+def _resolve(file_path: str, is_absolute: bool) -> Path:
+    path = Path(file_path)
+    if not is_absolute:
+        path = Path.cwd() / path  # Treat as relative to current working dir
+    return path
+
+def _read_excel_chunks(path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Stream an .xlsx sheet in chunks through openpyxl's read-only mode."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunksize:
+                yield _excel_frame(batch, header)
+                batch = []
+        if batch:
+            yield _excel_frame(batch, header)
+    finally:
+        wb.close()
+
+def _excel_frame(rows: list, header: tuple) -> pd.DataFrame:
+    """Match read_csv typing: blanks to NaN, numeric columns numeric."""
+    df = normalize_columns(pd.DataFrame(rows, columns=header))
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col])
+    return df
+
+def read_chunks(file_path: str, is_absolute: bool = True, chunksize: int = BULK_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Excel file as DataFrames of at most `chunksize` rows, with 
+    normalized column names.
+
+    Raises:
+        ValueError: If the file extension is not supported.
+    """
+    path = _resolve(file_path, is_absolute)
+    ext = path.suffix.lower()
+
+    if ext == ".csv":
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            yield normalize_columns(chunk)
+    elif ext == ".xlsx":
+        yield from _read_excel_chunks(path, chunksize)
+    elif ext == ".xls":
+        # No streaming reader for legacy .xls; read once and slice
+        df = normalize_columns(pd.read_excel(path))
+        for i in range(0, len(df), chunksize):
+            yield df.iloc[i:i + chunksize]
+    else:
+        raise ValueError(f"Unsupported file extension: {ext}")
+
+def _user_id(df: pd.DataFrame) -> Any:
+    """User id of a single-user group, as a plain Python value."""
+    val = df["user id"].iat[0]
+    return val.item() if hasattr(val, "item") else val
+
+def _prepare_user_df(user_id: Any, df: pd.DataFrame) -> pd.DataFrame:
+    """Validate and transform one user's rows, as fetch_data does for a single file."""
+    df = df.drop(columns=OPTIONAL_COLUMNS, errors="ignore").reset_index(drop=True)
+    try:
+        validate_df(df)
+    except (ValueError, TypeError) as e:
+        raise type(e)(f"User {user_id}: {e}") from e
+    df = normalize_prereqs(df)
+    return replace_bool(df)
+
+def fetch_bulk_data(
+        file_path: str,
+        is_absolute: bool = True,
+        chunksize: int = BULK_CHUNK_ROWS,
+        ) -> Iterator[tuple[Any, pd.DataFrame]]:
+    """
+    Lazily read a long-format file holding many users' courses, one row per 
+    (user, course), and yield each user's validated DataFrame.
+
+    Rows for one user must be contiguous. The file is read `chunksize` rows at a
+    time; a user spanning two chunks is carried into the next, so memory depends on
+    chunk size, not cohort size (only user ids are retained, to catch split users).
+
+    Args:
+        file_path (str): Path to the Excel (.xlsx/.xls) or CSV (.csv) file.
+        is_absolute (bool, optional): Whether `file_path` is absolute. Defaults to True.
+        chunksize (int, optional): Rows read per chunk.
+
+    Yields:
+        tuple: (user id, DataFrame as returned by fetch_data)
+
+    Raises:
+        ValueError: If the `user id` column is missing, a user's rows are not 
+            contiguous, or a user fails validation.
+    """
+    print("Fetching bulk Excel or CSV")
+    seen = set()
+    carry = None
+
+    for chunk in read_chunks(file_path, is_absolute, chunksize):
+        if "user id" not in chunk.columns:
+            raise ValueError("Bulk file requires a 'user id' column")
+        if chunk.empty:
+            continue
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+
+        uid = chunk["user id"]
+        group_num = uid.ne(uid.shift()).cumsum()
+        groups = list(chunk.groupby(group_num, sort=False))
+
+        # Last user may continue in the next chunk
+        *done, (_, carry) = groups
+        for _, df in done:
+            user_id = _user_id(df)
+            if user_id in seen:
+                raise ValueError(f"Rows for user {user_id} are not contiguous")
+            seen.add(user_id)
+            yield user_id, _prepare_user_df(user_id, df)
+
+    if carry is not None:
+        user_id = _user_id(carry)
+        if user_id in seen:
+            raise ValueError(f"Rows for user {user_id} are not contiguous")
+        yield user_id, _prepare_user_df(user_id, carry)
+
+def fetch_dir_data(dir_path: str, is_absolute: bool = True) -> Iterator[tuple[str, pd.DataFrame]]:
+    """
+    Lazily fetch every per-user course file in a directory (one user per file, 
+    same format as fetch_data). The user id is the file name without extension.
+
+    Yields:
+        tuple: (user id, DataFrame as returned by fetch_data)
+    """
+    path = _resolve(dir_path, is_absolute)
+    if not path.is_dir():
+        raise ValueError(f"Not a directory: {path}")
+
+    for f in sorted(path.iterdir()):
+        if f.suffix.lower() not in SUPPORTED_EXTENSIONS:
+            continue
+        yield f.stem, fetch_data(str(f), is_absolute=True)
+
+# endregion
+
+
@@ -33,6 +33,17 @@ def parse_prereqs(prereq_str: str) -> list:
             structured.append(token)
     return structured
 
+def format_prereqs(pre_reqs: list) -> str:
+    """
+    Inverse of parse_prereqs:
+    ['AND1', ['OR1','OR2'], 'AND3'] -> 'AND1|[OR1|OR2]|AND3'
+    An empty list gives an empty string.
+    """
+    return "|".join(
+        f"[{'|'.join(p)}]" if isinstance(p, list) else p
+        for p in pre_reqs
+    )
+
 def create_courses(df: pd.DataFrame) -> list:
     print("Creating Courses")
     courses = []
@@ -1,4 +1,9 @@
 from .course import Course
 from .sessions import Session
 from .restraints import Restraints
-from .scheduler import Scheduler
\ No newline at end of file
+from .scheduler import Scheduler, SchedulingError, error_category
+from .seats import SeatLedger
+from .deadline import Deadline, DeadlineExceeded
+from .optimizer import OptimizeConfig, OptimizeResult
+from .plan import Plan, UserState, CourseState, SessionRecord, GIBLedger
+from .estimate import Estimate, estimate
@@ -60,6 +60,30 @@ class Course:
                     f"session={self.session}, priority={self.priority}, cost={self.cost})")        
 
 
+    # region Pickle
+    # Positional state; `cost` is derived and recomputed on load.
+    def __getstate__(self):
+        return (
+            self.course_id,
+            int(self.credit_hours),
+            int(self.status),
+            int(self.level),
+            self.pre_reqs,
+            int(self.dependent_count),
+            bool(self.capstone),
+            self.session,
+            bool(self.transfer_intent),
+            bool(self.challenge_intent),
+            int(self.priority),
+        )
+
+    def __setstate__(self, state):
+        (self.course_id, self.credit_hours, self.status, self.level, self.pre_reqs,
+         self.dependent_count, self.capstone, self.session, self.transfer_intent,
+         self.challenge_intent, self.priority) = state
+        self.__post_init__()
+    # endregion
+
     def __eq__(self, other):
         if isinstance(other, Course):
             return self.course_id == other.course_id
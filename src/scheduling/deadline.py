@@ -0,0 +1,82 @@
+"""Per-job time limits and cooperative cancellation for scheduling.
+
+A Deadline is passed down the scheduler and checked at loop boundaries (each session of
+_schedule_level, each pass of the intent loop, between generate_schedule stages), so a
+job stops between steps rather than being interrupted mid-update. A process that never
+reaches a check is the batch supervisor's job (src/batch/supervisor.py).
+"""
+from typing import Callable, Optional
+import threading
+import time
+
+from config.course_enums import SessErrENUM
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised at a checkpoint once a job's deadline has passed or it was cancelled.
+
+    Attributes:
+        code (SessErrENUM): TIMEOUT or CANCELLED.
+    """
+    def __init__(self, message: str = "", code: SessErrENUM = SessErrENUM.TIMEOUT):
+        super().__init__(message)
+        self.code = code
+
+    def __reduce__(self):
+        return (type(self), (str(self), self.code))
+
+
+class Deadline:
+    """
+    Time limit and cancel flag for one scheduling job.
+
+        deadline = Deadline(2.0)
+        ser.generate_schedule(user, restraints, 15, deadline=deadline)
+
+    cancel() may be called from any thread; the job raises at its next checkpoint.
+
+    Args:
+        seconds (float, optional): Time allowed from now. None for no limit (cancel only).
+        clock (Callable[[], float]): Monotonic clock, in seconds.
+    """
+    def __init__(self, seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.seconds = seconds
+        self.clock = clock
+        self.expires_at = clock() + seconds if seconds is not None else None
+        self._cancelled = threading.Event()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (0 once passed), or None with no limit."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and self.clock() >= self.expires_at
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def check(self, where: str = "") -> None:
+        """
+        Raise DeadlineExceeded if cancelled or past the limit.
+
+        Args:
+            where (str): Checkpoint name, for the error message.
+        """
+        if self._cancelled.is_set():
+            raise DeadlineExceeded(f"Cancelled||{where}", SessErrENUM.CANCELLED)
+        if self.expires_at is not None and self.clock() >= self.expires_at:
+            raise DeadlineExceeded(f"Time limit exceeded||{self.seconds}s||{where}", SessErrENUM.TIMEOUT)
+
+
+def check(deadline: Optional[Deadline], where: str = "") -> None:
+    """deadline.check(where), or nothing if no deadline is attached."""
+    if deadline is not None:
+        deadline.check(where)
@@ -0,0 +1,227 @@
+"""Closed-form time-to-degree estimate: session count, graduation date and out-of-pocket
+cost bounds from course counts, the prereq critical path and GI Bill totals, without
+creating sessions or running the scheduler.
+
+Session bounds, per level, for n remaining courses taken N per session with a longest
+prereq chain of L sessions:
+
+    lower = max(ceil(n / N), L_min)
+    upper = L_max + ceil((n - L_max) / N)
+
+L_min takes the shortest option of every OR group, L_max the longest. The upper bound
+is the list-scheduling bound: a session that is not full took every qualified
+course, so it advanced the critical path. Levels are taken in order (undergrad first).
+
+Dates step through SESSION_MONTHS from the first of the month (of as_of, or of the
+user's first session if later), widened by a week each way for the scheduler's weekday rounding. Cost is tuition - grants - GI Bill. GI Bill covers the
+first ceil(remaining days / session days) sessions, up to each benefit year's amount.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable, Optional
+import datetime as dt
+import math
+
+from config.course_enums import LevelENUM, StatusENUM
+from config.settings import SESSION_MONTHS, SESSION_WEEKS
+from .course import Course
+from .restraints import Restraints
+
+
+@dataclass(frozen=True, slots=True)
+class LevelEstimate:
+    level: int
+    courses: int
+    critical_path: tuple[int, int]      # (shortest, longest) prereq chain in sessions
+    sessions: tuple[int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class Estimate:
+    """
+    Bounds as (low, high) pairs.
+
+    Attributes:
+        per_session (tuple[int, int]): Courses per session the bounds assume.
+        levels (tuple[LevelEstimate, ...]): Per-level counts and session bounds.
+        sessions (tuple[int, int]): Remaining sessions.
+        first_start (dt.date): First session target date.
+        graduation (tuple[dt.date, dt.date]): End of the last session (+-1 week rounding).
+        cost (tuple[float, float]): Out-of-pocket cost after grants and GI Bill.
+    """
+    per_session: tuple[int, int]
+    levels: tuple[LevelEstimate, ...]
+    sessions: tuple[int, int]
+    first_start: dt.date
+    graduation: tuple[dt.date, dt.date]
+    cost: tuple[float, float]
+
+
+def session_starts(first: dt.date, count: int) -> list[dt.date]:
+    """First-of-month targets of the `count` sessions starting on or after `first`."""
+    months = sorted(SESSION_MONTHS)
+    yr, mo = first.year, first.month
+    later = [m for m in months if (m > mo) or (m == mo and first.day == 1)]
+    if later:
+        i = months.index(later[0])
+    else:
+        i, yr = 0, yr + 1
+    out = []
+    for _ in range(count):
+        out.append(dt.date(yr, months[i], 1))
+        i += 1
+        if i == len(months):
+            i, yr = 0, yr + 1
+    return out
+
+
+def _remaining(courses: Iterable[Course]) -> list[Course]:
+    """Courses that still need a session: not completed/in progress, no transfer/challenge intent."""
+    return [c for c in courses if c.status == StatusENUM.NONE
+            and not (c.transfer_intent or c.challenge_intent)]
+
+
+def critical_path(courses: list[Course]) -> tuple[int, int]:
+    """
+    Longest prereq chain among `courses`, in sessions (1 = no prereqs left).
+    Prereqs outside `courses` count as done.
+
+    Returns:
+        (shortest-option chain, longest-option chain)
+    """
+    ids = {c.course_id: c for c in courses}
+    memo: dict[str, tuple[int, int]] = {}
+    visiting: set[str] = set()
+
+    def depth(cid: str) -> tuple[int, int]:
+        d = memo.get(cid)
+        if d is not None:
+            return d
+        visiting.add(cid)
+        lo = hi = 0
+        for pre in ids[cid].pre_reqs:
+            group = pre if isinstance(pre, list) else [pre]
+            opts = [p for p in group if p in ids and p not in visiting]
+            if not opts:
+                continue
+            ds = [depth(p) for p in opts]
+            # An option outside this set is done: the group can be met immediately
+            lo = max(lo, 0 if len(opts) < len(group) else min(d[0] for d in ds))
+            hi = max(hi, max(d[1] for d in ds))
+        visiting.discard(cid)
+        memo[cid] = d = (lo + 1, hi + 1)
+        return d
+
+    lo = hi = 0
+    for cid in ids:
+        d = depth(cid)
+        lo, hi = max(lo, d[0]), max(hi, d[1])
+    return lo, hi
+
+
+def _level_sessions(n: int, path: tuple[int, int], n_lo: int, n_hi: int) -> tuple[int, int]:
+    if n == 0:
+        return 0, 0
+    lower = max(math.ceil(n / n_hi), path[0])
+    upper = path[1] + math.ceil(max(0, n - path[1]) / n_lo)
+    return lower, max(lower, upper)
+
+
+def estimate(
+    courses: Iterable[Course],
+    restraints: Restraints,
+    per_session: Optional[int] = None,
+    grants: float = 0,
+    gib=None,
+    as_of: Optional[dt.date] = None,
+    first_ses_dt: Optional[dt.date] = None,
+) -> Estimate:
+    """
+    Bound sessions, graduation date and cost without scheduling.
+
+    Args:
+        courses (Iterable[Course]): The user's courses (any status; only remaining ones count).
+        restraints (Restraints): ses_min_class/ses_max_class, exceed_benefits.
+        per_session (int, optional): Courses per session. Default: anywhere from
+            ses_min_class to ses_max_class.
+        grants (float): Grant amount per session.
+        gib (GIB, optional): GI Bill with historical sessions already charged.
+        as_of (dt.date, optional): Sessions start on/after this date. Default today.
+        first_ses_dt (dt.date, optional): The user's first session. If after as_of,
+            sessions start from its month instead, as the scheduler's do.
+
+    Returns:
+        Estimate: (low, high) bounds.
+    """
+    r = restraints
+    as_of = as_of or dt.date.today()
+    # The scheduler's sessions run from the first of first_ses_dt's month
+    start = as_of if first_ses_dt is None else max(as_of, first_ses_dt.replace(day=1))
+    if per_session is None:
+        n_lo, n_hi = r.ses_min_class, r.ses_max_class
+    else:
+        assert r.ses_min_class <= per_session <= r.ses_max_class, f"per_session outside restraints: {per_session}"
+        n_lo = n_hi = per_session
+
+    remaining = _remaining(courses)
+    levels = []
+    for level in (LevelENUM.UNDERGRAD, LevelENUM.GRADUATE):
+        cs = [c for c in remaining if c.level == level]
+        if not cs:
+            continue
+        path = critical_path(cs)
+        levels.append(LevelEstimate(int(level), len(cs), path, _level_sessions(len(cs), path, n_lo, n_hi)))
+
+    s_lo = sum(l.sessions[0] for l in levels)
+    s_hi = sum(l.sessions[1] for l in levels)
+    starts = session_starts(start, max(s_hi, 1))
+    # Widened by the scheduler's +-1 week start rounding
+    weeks = dt.timedelta(weeks=SESSION_WEEKS)
+    week = dt.timedelta(weeks=1)
+    first = starts[0]
+    graduation = (starts[s_lo - 1] + weeks - week if s_lo else start,
+                  starts[s_hi - 1] + weeks + week if s_hi else start)
+
+    # Cost
+    costs = sorted(c.cost for c in remaining)
+    tuition = sum(costs)
+    n = len(costs)
+
+    def covered(sessions: int) -> int:
+        if not gib or gib.remaining_days <= 0:
+            return 0
+        return min(sessions, math.ceil(gib.remaining_days / (SESSION_WEEKS * 7)))
+
+    def year_amounts(sessions: int) -> list[float]:
+        years = {gib.year_start_for(st) for st in starts[:covered(sessions)]}
+        return [gib.benefit_years[y].amount if y in gib.benefit_years else gib.yearly_amount for y in years]
+
+    # Most: the most expensive courses the covered sessions can hold, up to every
+    # covered year's amount. Least: the cheapest courses at ses_min_class, up to the
+    # smallest year amount (each year pays min(its covered cost, its amount)).
+    gib_hi = gib_lo = 0.0
+    k_hi, k_lo = covered(s_hi), covered(s_lo)
+    if k_hi:
+        m = min(n, k_hi * n_hi)
+        gib_hi = max(0.0, min(sum(costs[n - m:]) - grants * k_hi, sum(year_amounts(s_hi))))
+    if k_lo:
+        m = min(n, k_lo * r.ses_min_class)
+        gib_lo = max(0.0, min(sum(costs[:m]) - grants * k_lo, min(year_amounts(s_hi))))
+
+    cost_hi = max(0.0, tuition - grants * s_lo - gib_lo)
+    cost_lo = max(0.0, tuition - grants * s_hi - gib_hi)
+
+    return Estimate(
+        per_session=(n_lo, n_hi),
+        levels=tuple(levels),
+        sessions=(s_lo, s_hi),
+        first_start=first,
+        graduation=graduation,
+        cost=(round(cost_lo, 2), round(cost_hi, 2)),
+    )
+
+
+def estimate_user(user, restraints: Restraints, per_session: Optional[int] = None,
+                  as_of: Optional[dt.date] = None) -> Estimate:
+    """estimate() for a User (courses, grants, GI Bill, first session). Charge historical sessions first."""
+    return estimate(user.courses, restraints, per_session, user.grants or 0, user.gib, as_of, user.first_ses_dt)
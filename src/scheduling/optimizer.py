@@ -0,0 +1,589 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional
+import copy
+import math
+import random
+import time
+
+from .sessions import Session
+from .restraints import Restraints
+from .seats import SeatLedger
+from .propagation import propagate
+from .deadline import Deadline
+
+
+@dataclass
+class OptimizeConfig:
+    """
+    Settings for the local-search improvement phase run after the greedy scheduler.
+
+    Attributes:
+        time_budget (float): Seconds to search. The best schedule found is kept.
+        max_iters (int, optional): Stop after this many proposed moves (repeatable runs).
+        seed (int, optional): Random seed.
+        session_weight (float): Objective cost, in dollars, of each session used.
+            Trades user cost against time-to-degree.
+        finish_weight (float): Objective cost per session slot the last used session
+            sits after the first candidate (earlier graduation, fewer gaps).
+        max_cost_weight (float): Penalty per dollar a session is over ses_max_cost.
+        swap_prob (float): Share of proposals that swap two courses instead of moving one.
+    """
+    time_budget: float = 0.5
+    max_iters: Optional[int] = None
+    seed: Optional[int] = None
+    session_weight: float = 1000.0
+    finish_weight: float = 100.0
+    max_cost_weight: float = 10.0
+    swap_prob: float = 0.5
+
+
+@dataclass
+class OptimizeResult:
+    """Objective values are user cost + session and finish weights + max-cost penalty."""
+    initial: float
+    best: float
+    iterations: int
+    accepted: int
+
+    @property
+    def improved(self) -> bool:
+        return self.best < self.initial
+
+
+class ScheduleOptimizer:
+    """
+    Simulated-annealing local search over an already valid (greedy) schedule.
+
+    Neighbourhoods: move one course to another session of its level, or swap two
+    courses between sessions. Every accepted state keeps prereq order (with the same
+    "assigned before" rule as the greedy scheduler), ses_min_class/ses_max_class,
+    min_inperson in the in-person window, set (fixed) sessions and capstone-last
+    (capstones the greedy plan put in their level's last session stay there).
+    Sessions may be emptied (fewer sessions) or unused ones filled.
+
+    Cost is evaluated incrementally. Within a benefit year the GI Bill pays
+    covered sessions first come first served, so the user owes
+    max(0, S_y - P_y) for the year (S_y: covered session costs, P_y: benefit
+    left). A move changes at most two sessions, so the delta touches at most two
+    year terms. Day coverage only changes when a session is emptied or filled.
+    Covered sessions are always a prefix of the used ones, so only the coverage
+    frontier moves. Sessions used, the last session used and used-but-uncovered
+    sessions are counts kept with each move. A rejected move is undone from a log
+    of the values it changed.
+    """
+    def __init__(
+        self,
+        user,
+        restraints: Restraints,
+        sessions: list[Session],
+        base_gib=None,
+        seats: Optional[SeatLedger] = None,
+        config: Optional[OptimizeConfig] = None,
+        deadline: Optional[Deadline] = None,
+    ):
+        self.user = user
+        self.deadline = deadline
+        self.r = restraints
+        self.cfg = config or OptimizeConfig()
+        self.base_gib = base_gib
+        self.sessions = sorted(sessions, key=lambda s: (s.start_date, s.num))
+        self.grants = user.grants or 0
+        self.rng = random.Random(self.cfg.seed)
+        r = restraints
+        S = len(self.sessions)
+
+        window = bool(r.inperson_courses and r.in_person_end_dt)
+        self.lv = [s.level for s in self.sessions]
+        self.in_window = [window and s.start_date <= r.in_person_end_dt for s in self.sessions]
+
+        # Courses: fixed (set session, or booked seat) ones are modelled but never moved
+        self.courses, self.pos, self.movable = [], [], []
+        for i, s in enumerate(self.sessions):
+            for c in s.courses:
+                inp = bool(r.inperson_courses) and c in r.inperson_courses
+                fixed = isinstance(c.session, int) or (seats is not None and inp and self.in_window[i])
+                self.courses.append(c)
+                self.pos.append(i)
+                self.movable.append(not fixed)
+        n = len(self.courses)
+        self.cost = [c.cost for c in self.courses]
+        self.inp = [bool(r.inperson_courses) and c in r.inperson_courses for c in self.courses]
+        self.capstone = [bool(c.capstone) for c in self.courses]
+        self.seats = seats
+        self.id_to_j = {c.course_id: j for j, c in enumerate(self.courses)}
+
+        # Prereqs: satisfied by anything assigned outside the moved set, or by a
+        # model course in an earlier session
+        moving = {self.courses[j].course_id for j in range(n) if self.movable[j]}
+        self.base = {c.course_id for c in user.assigned_courses} - moving
+        self.deps = [[] for _ in range(n)]
+        for j, c in enumerate(self.courses):
+            for pre in c.pre_reqs:
+                for p in (pre if isinstance(pre, list) else [pre]):
+                    k = self.id_to_j.get(p)
+                    if k is not None and self.movable[k] and j not in self.deps[k]:
+                        self.deps[k].append(j)
+
+        # Session aggregates
+        self.n = [0] * S
+        self.C = [0.0] * S
+        self.n_inp = [0] * S
+        self.n_fixed = [0] * S
+        for j in range(n):
+            i = self.pos[j]
+            self.n[i] += 1
+            self.C[i] += self.cost[j]
+            self.n_inp[i] += self.inp[j]
+            self.n_fixed[i] += not self.movable[j]
+
+        # In-person requirement; never stricter than what the start state already meets
+        # (capacity shortfalls from cohort scheduling)
+        need = r.min_inperson or 0
+        self.inp_req = [
+            (min(need, self.n_inp[i]) if self.n[i] else need) if self.in_window[i] else 0
+            for i in range(S)
+        ]
+
+        self.level_sessions: dict = {}
+        for i, l in enumerate(self.lv):
+            self.level_sessions.setdefault(l, []).append(i)
+        self.level_courses: dict = {}
+        for j in range(n):
+            if self.movable[j]:
+                self.level_courses.setdefault(self.lv[self.pos[j]], []).append(j)
+        # Session ranges from propagation (prereq depth/height, set sessions) prune proposals
+        self.dom_lo = [0] * n
+        self.dom_hi = [S - 1] * n
+        for l, idx in self.level_sessions.items():
+            js = [j for j in range(n) if self.movable[j] and self.lv[self.pos[j]] == l]
+            dom = propagate(
+                [self.courses[j] for j in js], [self.sessions[i] for i in idx], r, self.base,
+                capacity=[r.ses_max_class - self.n_fixed[i] for i in idx], minimum=[0] * len(idx),
+                capstone_last=False, inperson=False,
+            )
+            if dom.feasible:
+                for j in js:
+                    lo, hi = dom.bounds[self.courses[j].course_id]
+                    self.dom_lo[j], self.dom_hi[j] = idx[lo], idx[hi]
+
+        # Capstone-last: capstones the greedy plan put in their level's last session stay last
+        self.cap_last: dict = {}
+        for l in self.level_sessions:
+            last = self._last_used(l)
+            keep = [j for j in range(n) if self.capstone[j] and self.pos[j] == last]
+            if keep:
+                self.cap_last[l] = keep
+
+        # GI Bill model
+        g = base_gib
+        if g:
+            self.dur = [(s.end_date - s.start_date).days for s in self.sessions]
+            self.year = [g.year_start_for(s.start_date) for s in self.sessions]
+            self.P = {y: (g.benefit_years[y].amount if y in g.benefit_years else g.yearly_amount)
+                      for y in set(self.year)}
+            self.year_sessions = {y: [i for i in range(S) if self.year[i] == y] for y in self.P}
+            self.elig = [s.start_date >= g.asof for s in self.sessions]
+        self._log: Optional[list] = None
+        self._full_recompute()
+
+    # region Model
+    def _A(self, i: int) -> float:
+        return self.C[i] - self.grants if self.n[i] else 0.0
+
+    def _simulate_days(self) -> None:
+        """GI Bill day coverage from scratch. `front` is the last covered session and
+        `days_left` the days remaining after it."""
+        S = len(self.sessions)
+        self.covered = [False] * S
+        self.front, self.days_left = -1, 0
+        if not self.base_gib:
+            return
+        days = self.base_gib.remaining_days
+        for i in range(S):
+            if self.n[i] and days > 0 and self.elig[i]:
+                self.covered[i] = True
+                days -= self.dur[i]
+                self.front = i
+        self.days_left = days
+
+    def _year_term(self, y) -> float:
+        """User cost + penalty for one benefit year's covered sessions."""
+        over = self.Sy[y] - self.P[y]
+        term = over if over > 0 else 0.0
+        if self.r.ses_max_cost:
+            left = self.P[y]
+            for i in self.year_sessions[y]:
+                if self.covered[i]:
+                    a = self._A(i)
+                    cover = min(a, left)
+                    left -= cover
+                    excess = a - cover - self.r.ses_max_cost
+                    if excess > 0:
+                        term += self.cfg.max_cost_weight * excess
+        return term
+
+    def _unc_term(self, i: int) -> float:
+        if not self.n[i] or self.covered[i]:
+            return 0.0
+        a = self._A(i)
+        term = a
+        if self.r.ses_max_cost and a > self.r.ses_max_cost:
+            term += self.cfg.max_cost_weight * (a - self.r.ses_max_cost)
+        return term
+
+    def _full_recompute(self) -> None:
+        self._simulate_days()
+        S = len(self.sessions)
+        self.Sy = {}
+        if self.base_gib:
+            self.Sy = {y: 0.0 for y in self.P}
+            for i in range(S):
+                if self.covered[i]:
+                    self.Sy[self.year[i]] += self._A(i)
+        self.yterm = {y: self._year_term(y) for y in self.Sy}
+        self.uterm = [self._unc_term(i) for i in range(S)]
+        self.used = sum(1 for x in self.n if x)
+        self.last = max((i for i in range(S) if self.n[i]), default=0)
+        self.unc_used = sum(1 for i in range(S) if self.n[i] and not self.covered[i])
+        self.obj = (sum(self.yterm.values()) + sum(self.uterm)
+                    + self.cfg.session_weight * self.used + self.cfg.finish_weight * self.last)
+
+    def _set(self, store, key, value) -> None:
+        """store[key] = value, logged so a rejected move can be undone."""
+        if self._log is not None:
+            self._log.append((store, key, store[key]))
+        store[key] = value
+
+    def _undo(self) -> None:
+        for store, key, old in reversed(self._log):
+            store[key] = old
+        self._log.clear()
+
+    def _cover(self, i: int, flag: bool, changed: dict) -> None:
+        """Set session i's GI Bill coverage, moving its cost into or out of S_y."""
+        changed.setdefault(i, (bool(self.n[i]), self.covered[i]))
+        self._set(self.covered, i, flag)
+        self.days_left += -self.dur[i] if flag else self.dur[i]
+        y = self.year[i]
+        self._set(self.Sy, y, self.Sy[y] + (self._A(i) if flag else -self._A(i)))
+
+    def _prev_covered(self, i: int) -> int:
+        i -= 1
+        while i >= 0 and not self.covered[i]:
+            i -= 1
+        return i
+
+    def _next_uncovered(self, i: int) -> Optional[int]:
+        """First used, coverable session after i."""
+        for k in range(i + 1, len(self.sessions)):
+            if self.n[k] and self.elig[k] and not self.covered[k]:
+                return k
+        return None
+
+    def _fill_coverage(self, i: int, changed: dict) -> None:
+        """Session i was filled: cover it if it has days left, then uncover sessions at
+        the frontier that no longer do."""
+        if self.covered[i] or not self.elig[i]:
+            return
+        if i > self.front:
+            if self.days_left > 0:
+                self._cover(i, True, changed)
+                self.front = i
+            return
+        self._cover(i, True, changed)
+        while self.front > i and self.days_left + self.dur[self.front] <= 0:
+            self._cover(self.front, False, changed)
+            self.front = self._prev_covered(self.front)
+
+    def _empty_coverage(self, i: int, changed: dict) -> None:
+        """Session i was emptied: release its days and extend coverage past the frontier."""
+        if not self.covered[i]:
+            return
+        self._cover(i, False, changed)
+        if i == self.front:
+            self.front = self._prev_covered(i)
+        while self.days_left > 0:
+            k = self._next_uncovered(self.front)
+            if k is None:
+                break
+            self._cover(k, True, changed)
+            self.front = k
+
+    def _update(self, touched: list[int], old_A: dict) -> None:
+        """
+        Incremental objective update after C/n of `touched` sessions changed. The
+        caller saves obj, used, last, unc_used, front and days_left; changes to S_y,
+        year terms, uncovered terms and coverage go to the undo log.
+        """
+        cfg = self.cfg
+        # {session: (used, covered) before the move} for every session that changed
+        changed = {i: (old_A[i] is not None, self.covered[i]) for i in touched}
+        years = set()
+        if self.base_gib:
+            # New session costs at the old coverage
+            for i in touched:
+                if self.covered[i]:
+                    y = self.year[i]
+                    self._set(self.Sy, y, self.Sy[y] + (self._A(i) if self.n[i] else 0.0) - (old_A[i] or 0.0))
+            # Then coverage. Empty first; a session this move filled may be covered by it
+            for i in touched:
+                if old_A[i] is not None and not self.n[i]:
+                    self._empty_coverage(i, changed)
+            for i in touched:
+                if old_A[i] is None and self.n[i]:
+                    self._fill_coverage(i, changed)
+            years = {self.year[i] for i in changed}
+
+        for i in touched:
+            if old_A[i] is None and self.n[i]:
+                self.used += 1
+                self.obj += cfg.session_weight
+                if i > self.last:
+                    self.obj += cfg.finish_weight * (i - self.last)
+                    self.last = i
+            elif old_A[i] is not None and not self.n[i]:
+                self.used -= 1
+                self.obj -= cfg.session_weight
+                if i == self.last:
+                    last = i
+                    while last > 0 and not self.n[last]:
+                        last -= 1
+                    self.obj += cfg.finish_weight * (last - self.last)
+                    self.last = last
+
+        for y in years:
+            new = self._year_term(y)
+            self.obj += new - self.yterm[y]
+            self._set(self.yterm, y, new)
+        for i, (was_used, was_covered) in changed.items():
+            new = self._unc_term(i)
+            self.obj += new - self.uterm[i]
+            self._set(self.uterm, i, new)
+            self.unc_used += (bool(self.n[i]) and not self.covered[i]) - (was_used and not was_covered)
+    # endregion
+
+    # region Constraints
+    def _avail(self, course_id: str, i: int) -> bool:
+        if course_id in self.base:
+            return True
+        k = self.id_to_j.get(course_id)
+        return k is not None and self.pos[k] < i
+
+    def _prereqs_ok(self, j: int) -> bool:
+        i = self.pos[j]
+        for pre in self.courses[j].pre_reqs:
+            if isinstance(pre, list):
+                if not any(self._avail(p, i) for p in pre):
+                    return False
+            elif not self._avail(pre, i):
+                return False
+        return True
+
+    def _session_ok(self, i: int) -> bool:
+        n = self.n[i]
+        if n == 0:
+            return self.n_fixed[i] == 0
+        r = self.r
+        return (r.ses_min_class <= n <= r.ses_max_class
+                and self.C[i] - self.grants >= -1
+                and self.n_inp[i] >= self.inp_req[i])
+
+    def _last_used(self, level) -> Optional[int]:
+        return max((i for i in self.level_sessions[level] if self.n[i]), default=None)
+
+    def _capstone_ok(self, level) -> bool:
+        last = self._last_used(level)
+        return all(self.pos[j] == last for j in self.cap_last.get(level, ()))
+
+    def _benefits_ok(self) -> bool:
+        """exceed_benefits=False: every used session stays GI Bill covered."""
+        if self.r.exceed_benefits is not False or not self.base_gib:
+            return True
+        return self.unc_used == 0
+
+    def _feasible(self, moved: list[int], touched: list[int]) -> bool:
+        if not all(self._session_ok(i) for i in touched):
+            return False
+        for j in moved:
+            if not self._prereqs_ok(j):
+                return False
+            if any(not self._prereqs_ok(d) for d in self.deps[j]):
+                return False
+            if self.seats is not None and self.inp[j] and self.in_window[self.pos[j]]:
+                return False
+        level = self.lv[touched[0]]
+        return level not in self.cap_last or self._capstone_ok(level)
+    # endregion
+
+    # region Search
+    def _relocate(self, j: int, b: int) -> None:
+        a = self.pos[j]
+        self.pos[j] = b
+        for i, sign in ((a, -1), (b, 1)):
+            self.n[i] += sign
+            self.C[i] += sign * self.cost[j]
+            self.n_inp[i] += sign * self.inp[j]
+
+    def _in_domain(self, j: int, i: int) -> bool:
+        return self.dom_lo[j] <= i <= self.dom_hi[j]
+
+    def _propose(self) -> Optional[tuple[list[int], list[tuple[int, int]]]]:
+        """Random neighbour as (moved courses, [(course, from session)]) or None."""
+        level = self.rng.choice(list(self.level_courses))
+        pool = self.level_courses[level]
+        sess = self.level_sessions[level]
+        j = self.rng.choice(pool)
+        a = self.pos[j]
+        if self.rng.random() < self.cfg.swap_prob and len(pool) > 1:
+            k = self.rng.choice(pool)
+            b = self.pos[k]
+            if b == a or not (self._in_domain(j, b) and self._in_domain(k, a)):
+                return None
+            self._relocate(j, b)
+            self._relocate(k, a)
+            return [j, k], [(j, a), (k, b)]
+        if len(sess) < 2:
+            return None
+        b = self.rng.choice(sess)
+        if b == a or not self._in_domain(j, b):
+            return None
+        self._relocate(j, b)
+        return [j], [(j, a)]
+
+    def run(self) -> OptimizeResult:
+        """Search within the time/iteration budget. Leaves the model at the best state.
+
+        The deadline, if any, is checked with the clock (every 128 proposals) and ends
+        the search like time_budget does, even under max_iters.
+        """
+        if not self.level_courses:
+            return OptimizeResult(self.obj, self.obj, 0, 0)
+        cfg = self.cfg
+        initial = self.obj
+        best, best_pos = self.obj, list(self.pos)
+
+        movable_costs = [self.cost[j] for j in range(len(self.courses)) if self.movable[j]]
+        t0 = max(sum(movable_costs) / len(movable_costs), 1.0)
+        t_end = 1.0
+        start = time.perf_counter()
+        it = accepted = 0
+        progress = 0.0
+        temp = t0
+        self._log = []
+
+        while True:
+            if cfg.max_iters is not None:
+                if it >= cfg.max_iters:
+                    break
+                progress = it / cfg.max_iters
+            if it % 128 == 0:
+                if self.deadline is not None and (self.deadline.expired or self.deadline.cancelled):
+                    break
+                elapsed = time.perf_counter() - start
+                if elapsed >= cfg.time_budget and cfg.max_iters is None:
+                    break
+                if cfg.max_iters is None:
+                    progress = elapsed / cfg.time_budget
+                temp = t0 * (t_end / t0) ** progress
+            it += 1
+
+            prop = self._propose()
+            if prop is None:
+                continue
+            moved, undo = prop
+            touched = sorted({a for _, a in undo} | {self.pos[j] for j in moved})
+
+            if not self._feasible(moved, touched):
+                for j, a in reversed(undo):
+                    self._relocate(j, a)
+                continue
+
+            saved = (self.obj, self.used, self.last, self.unc_used, self.front, self.days_left)
+            # A before the move, None if the session was empty
+            old_A = {}
+            for i in touched:
+                c_before = self.C[i] - sum(self.cost[j] if self.pos[j] == i else 0 for j in moved) \
+                    + sum(self.cost[j] for j, a in undo if a == i)
+                n_before = self.n[i] - sum(1 for j in moved if self.pos[j] == i) \
+                    + sum(1 for _, a in undo if a == i)
+                old_A[i] = (c_before - self.grants) if n_before else None
+            self._update(touched, old_A)
+
+            delta = self.obj - saved[0]
+            if self._benefits_ok() and (delta <= 0 or self.rng.random() < math.exp(-delta / temp)):
+                accepted += 1
+                self._log.clear()
+                if self.obj < best - 1e-9:
+                    best, best_pos = self.obj, list(self.pos)
+            else:
+                for j, a in reversed(undo):
+                    self._relocate(j, a)
+                self._undo()
+                self.obj, self.used, self.last, self.unc_used, self.front, self.days_left = saved
+
+        # Restore best
+        self._log = None
+        for j, i in enumerate(best_pos):
+            if self.pos[j] != i:
+                self._relocate(j, i)
+        self._full_recompute()
+        return OptimizeResult(initial, self.obj, it, accepted)
+
+    def apply(self) -> None:
+        """Write the model state back to the user's sessions, schedule and GI Bill."""
+        user = self.user
+        by_session = [[] for _ in self.sessions]
+        for j, i in enumerate(self.pos):
+            by_session[i].append(self.courses[j])
+
+        for s, crs in zip(self.sessions, by_session):
+            s.clear_courses()
+            for c in crs:
+                s.add_course(c)
+            if crs:
+                s.add_grants(self.grants)
+
+        if self.base_gib:
+            user.gib = copy.deepcopy(self.base_gib)
+            for s, crs in zip(self.sessions, by_session):
+                if crs:
+                    user.gib.charge_session(s, final=True)
+
+        ids = {id(s) for s in self.sessions}
+        kept = [s for s in user.schedule if id(s) not in ids]
+        user.schedule = sorted(kept + [s for s, crs in zip(self.sessions, by_session) if crs])
+    # endregion
+
+
+def optimize_schedule(
+    user,
+    restraints: Restraints,
+    sessions: list[Session],
+    base_gib=None,
+    seats: Optional[SeatLedger] = None,
+    config: Optional[OptimizeConfig] = None,
+    deadline: Optional[Deadline] = None,
+) -> OptimizeResult:
+    """
+    Improve a greedy schedule in place. Must be called from Scheduler.schedule_free,
+    after all levels are scheduled and before intents are placed.
+
+    Args:
+        user (User): Scheduled user.
+        restraints (Restraints): Restraints the schedule was built with.
+        sessions (list[Session]): Sessions the search may use (scheduled future
+            sessions plus unused empty ones).
+        base_gib (GIB, optional): GI Bill state before free sessions were charged.
+        seats (SeatLedger, optional): Cohort seats; in-person placements are kept.
+        config (OptimizeConfig, optional): Search settings.
+        deadline (Deadline, optional): Ends the search early, keeping the best found.
+
+    Returns:
+        OptimizeResult: Objective before and after. The user is only changed if improved.
+    """
+    opt = ScheduleOptimizer(user, restraints, sessions, base_gib, seats, config, deadline)
+    result = opt.run()
+    if result.improved:
+        opt.apply()
+    return result
@@ -0,0 +1,145 @@
+"""Immutable scheduling inputs and results, for the pure `plan()` entry point
+(src.services.planning_services).
+
+Every field is a scalar, date or tuple, so instances are hashable and safe to share
+between threads. Courses are referenced by course_id.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Optional
+import datetime as dt
+
+from .sessions import Session
+
+
+@dataclass(frozen=True, slots=True)
+class CourseState:
+    """One user's standing in one catalog course."""
+    course_id: str
+    status: int
+    session: Optional[int] = None
+    transfer_intent: bool = False
+    challenge_intent: bool = False
+
+    @classmethod
+    def from_course(cls, course) -> "CourseState":
+        return cls(course.course_id, course.status, course.session,
+                   course.transfer_intent, course.challenge_intent)
+
+
+@dataclass(frozen=True, slots=True)
+class GIBLedger:
+    """
+    GI Bill state snapshot.
+
+    Attributes:
+        benefit_years (tuple): (start, end, amount left) per benefit year, by start.
+        active_year (dt.date): Start of the year GIB.active_benefit_year refers to.
+    """
+    yearly_amount: float
+    benefit_start: dt.date
+    asof: dt.date
+    remaining_days: int
+    benefit_years: tuple[tuple[dt.date, dt.date, float], ...]
+    active_year: dt.date
+    charged_sessions: tuple[int, ...] = ()
+
+    @classmethod
+    def from_gib(cls, gib) -> "GIBLedger":
+        return cls(
+            gib.yearly_amount, gib.benefit_start, gib.asof, gib.remaining_days,
+            tuple(sorted((by.st, by.end, by.amount) for by in gib.benefit_years.values())),
+            gib.active_benefit_year.st, tuple(gib.charged_sessions),
+        )
+
+    def to_gib(self):
+        """A new, independent GIB in this state."""
+        from src.user.gib import GIB
+        gib = GIB.__new__(GIB)
+        gib.__setstate__((
+            self.yearly_amount, self.benefit_start.toordinal(), self.active_year.toordinal(),
+            tuple((st.toordinal(), end.toordinal(), amount) for st, end, amount in self.benefit_years),
+            self.remaining_days, self.asof.toordinal(), list(self.charged_sessions),
+        ))
+        return gib
+
+
+@dataclass(frozen=True, slots=True)
+class UserState:
+    """
+    Everything about a user that scheduling reads, apart from the catalog.
+
+    Build one from an existing User with UserState.from_user(user).
+    """
+    user_id: Any
+    first_ses_dt: dt.date
+    courses: tuple[CourseState, ...]
+    grants: float = 0
+    gib: Optional[GIBLedger] = None
+
+    @classmethod
+    def from_user(cls, user) -> "UserState":
+        return cls(
+            user.id_, user.first_ses_dt,
+            tuple(CourseState.from_course(c) for c in user.courses),
+            user.grants, GIBLedger.from_gib(user.gib) if user.gib else None,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SessionRecord:
+    """One scheduled session. Costs are as on Session (user_cost = adj_cost)."""
+    num: int
+    level: Optional[int]
+    start_date: dt.date
+    end_date: dt.date
+    courses: tuple[str, ...]
+    intent: tuple[str, ...]
+    total_ch: int
+    total_cost: float
+    grants_applied: float
+    gib_applied: float
+    user_cost: float
+    gib_remaining: float
+
+    @classmethod
+    def from_session(cls, s: Session) -> "SessionRecord":
+        return cls(
+            s.num, s.level, s.start_date, s.end_date,
+            tuple(c.course_id for c in s.courses), tuple(c.course_id for c in s.intent),
+            s.tot_ch, s.tot_cost, s.grants_applied, s.gib_applied, s.adj_cost, s.gib_remaining,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Plan:
+    """
+    A user's schedule as of a date.
+
+    Attributes:
+        sessions (tuple[SessionRecord, ...]): User.schedule, sorted by session number.
+        assigned (tuple[str, ...]): Course ids assigned (completed, set or scheduled).
+        gib (GIBLedger, optional): GI Bill state after every session is charged.
+    """
+    user_id: Any
+    as_of: dt.date
+    sessions: tuple[SessionRecord, ...]
+    assigned: tuple[str, ...]
+    gib: Optional[GIBLedger] = None
+
+    @classmethod
+    def from_user(cls, user, as_of: dt.date) -> "Plan":
+        return cls(
+            user.id_, as_of,
+            tuple(SessionRecord.from_session(s) for s in sorted(user.schedule)),
+            tuple(c.course_id for c in user.assigned_courses),
+            GIBLedger.from_gib(user.gib) if user.gib else None,
+        )
+
+    @property
+    def total_user_cost(self) -> float:
+        return sum(s.user_cost for s in self.sessions)
+
+    @property
+    def last_session(self) -> Optional[SessionRecord]:
+        return self.sessions[-1] if self.sessions else None
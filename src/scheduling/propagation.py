@@ -0,0 +1,255 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from config.course_enums import SessErrENUM
+from .course import Course
+from .sessions import Session
+from .restraints import Restraints
+
+
+@dataclass
+class Domains:
+    """
+    Feasible session index range [lo, hi] of each course, over one level's sessions
+    (sorted, index 0 = first session).
+
+    Attributes:
+        sessions (list[Session]): Sessions the indices refer to.
+        bounds (dict): {course_id: (lo, hi)}
+        fixed (dict): {course_id: index} of courses already set in these sessions.
+        conflicts (list[str]): Reasons the level cannot be scheduled. Empty if none found.
+        codes (list[SessErrENUM | None]): Category of each conflict.
+    """
+    sessions: list[Session]
+    bounds: dict[str, tuple[int, int]] = field(default_factory=dict)
+    fixed: dict[str, int] = field(default_factory=dict)
+    conflicts: list[str] = field(default_factory=list)
+    codes: list[Optional[SessErrENUM]] = field(default_factory=list)
+
+    @property
+    def feasible(self) -> bool:
+        return not self.conflicts
+
+    @property
+    def code(self) -> Optional[SessErrENUM]:
+        """Category of the first categorized conflict, None if none is."""
+        return next((c for c in self.codes if c is not None), None)
+
+    def conflict(self, reason: str, code: Optional[SessErrENUM] = None) -> None:
+        self.conflicts.append(reason)
+        self.codes.append(code)
+
+    def lo(self, course: Course | str) -> int:
+        return self.bounds[_cid(course)][0]
+
+    def hi(self, course: Course | str) -> int:
+        return self.bounds[_cid(course)][1]
+
+    def allows(self, course: Course | str, i: int) -> bool:
+        lo, hi = self.bounds[_cid(course)]
+        return lo <= i <= hi
+
+    def due(self, i: int) -> list[str]:
+        """Courses whose last feasible session is `i`: the greedy must place them there."""
+        return [c for c, (lo, hi) in self.bounds.items() if hi == i]
+
+
+def _cid(course: Course | str) -> str:
+    return course if isinstance(course, str) else course.course_id
+
+
+def propagate(
+    courses: list[Course],
+    sessions: list[Session],
+    restraints: Restraints,
+    done: Iterable,
+    capacity: list[int],
+    minimum: Optional[list[int]] = None,
+    gib=None,
+    capstone_last: bool = True,
+    inperson: bool = True,
+) -> Domains:
+    """
+    Bounds propagation over one level, run to a fixpoint before scheduling.
+
+    Domains start as every session and are narrowed by:
+        - Prereqs: a course starts after the earliest session any option of each prereq
+          group can be done. A prereq with one possible option ends before its dependent
+          (so depth sets lo and height sets hi).
+        - Set sessions: courses already in a session are fixed there; their dependents
+          come later.
+        - Capstone-last: capstones go in the last session, or the trailing sessions
+          with room for all of them.
+        - GI Bill exhaustion (exceed_benefits=False): nothing after the last session
+          remaining days can cover.
+        - In-person window: if exactly enough in-person courses remain for min_inperson,
+          they must all be placed inside the window.
+
+    Counting (Hall) checks then compare each prefix and suffix of sessions against
+    the courses whose domains force them there.
+
+    Args:
+        courses (list[Course]): Courses to place.
+        sessions (list[Session]): The level's sessions, sorted.
+        restraints (Restraints): Scheduling constraints.
+        done (Iterable): Course ids (or Courses) satisfied before the first session.
+        capacity (list[int]): Free slots per session for `courses`.
+        minimum (list[int], optional): Slots per session that must be filled.
+            Defaults to `capacity` (the greedy fills every target exactly).
+        gib (GIB, optional): GI Bill state before these sessions are charged.
+        capstone_last (bool): Apply the capstone-last rule.
+        inperson (bool): Apply the in-person window rule (off under seat capacities,
+            where a full section lowers the requirement).
+
+    Returns:
+        Domains: Bounds per course, plus any conflicts found.
+    """
+    r = restraints
+    S = len(sessions)
+    n = len(courses)
+    minimum = capacity if minimum is None else minimum
+    assert len(capacity) == S and len(minimum) == S, "One capacity per session"
+
+    ids = [c.course_id for c in courses]
+    index = {cid: j for j, cid in enumerate(ids)}
+    fixed = {c.course_id: i for i, s in enumerate(sessions) for c in s.courses if c.course_id not in index}
+    done = {_cid(c) for c in done} - set(fixed)
+    dom = Domains(sessions, fixed=fixed)
+    if not n:
+        return dom
+    if not S:
+        dom.conflict(f"{n} courses but no sessions")
+        return dom
+    lo = [0] * n
+    hi = [S - 1] * n
+    # Rule that set each upper bound (GI Bill, in-person window); None for the last session
+    hi_code: list[Optional[SessErrENUM]] = [None] * n
+
+    # Prereq groups as lists of options: ("done",), ("fixed", i), ("course", j)
+    groups: list[list[list[tuple]]] = []
+    for j, c in enumerate(courses):
+        gs = []
+        for pre in c.pre_reqs:
+            opts = []
+            for p in (pre if isinstance(pre, list) else [pre]):
+                if p in done:
+                    opts.append(("done",))
+                elif p in fixed:
+                    opts.append(("fixed", fixed[p]))
+                elif p in index and index[p] != j:
+                    opts.append(("course", index[p]))
+            if any(o[0] == "done" for o in opts):
+                continue
+            if not opts:
+                dom.conflict(f"{c.course_id}: prereq {pre} is not done or planned", SessErrENUM.PREREQ_NOT_MET)
+                continue
+            gs.append(opts)
+        groups.append(gs)
+    # Mandatory prereq edges (p before j) for backward propagation
+    mandatory = [(g[0][1], j) for j, gs in enumerate(groups) for g in gs
+                 if len(g) == 1 and g[0][0] == "course"]
+
+    # Capstone-last
+    if capstone_last:
+        caps = [j for j, c in enumerate(courses) if c.capstone]
+        if caps:
+            room, start = 0, S
+            while start > 0 and room < len(caps):
+                start -= 1
+                room += capacity[start]
+            for j in caps:
+                lo[j] = max(lo[j], start)
+
+    # GI Bill exhaustion
+    if gib is not None and r.exceed_benefits is False:
+        days, last = gib.remaining_days, -1
+        for i, s in enumerate(sessions):
+            if days > 0 and s.start_date >= gib.asof:
+                last = i
+                days -= (s.end_date - s.start_date).days
+            else:
+                break
+        if last < S - 1:
+            if any(minimum[last + 1:]):
+                dom.conflict(f"GI Bill runs out before session {sessions[last + 1].num}",
+                             SessErrENUM.OUT_OF_BENEFITS)
+            for j in range(n):
+                if last < hi[j]:
+                    hi[j], hi_code[j] = last, SessErrENUM.OUT_OF_BENEFITS
+
+    # In-person window
+    if inperson and r.inperson_courses and r.in_person_end_dt and r.min_inperson:
+        window = [i for i, s in enumerate(sessions) if s.start_date <= r.in_person_end_dt]
+        inp = [j for j, c in enumerate(courses) if c in r.inperson_courses]
+        need = [max(0, r.min_inperson - sum(1 for c in sessions[i].courses
+                                            if c.course_id in fixed and c in r.inperson_courses))
+                for i in window]
+        if window and sum(need) and len(inp) == sum(need):
+            for j in inp:
+                if window[-1] < hi[j]:
+                    hi[j], hi_code[j] = window[-1], SessErrENUM.NOT_INPERSON
+    else:
+        window, need, inp = [], [], []
+
+    # Fixpoint: forward (lo from prereqs) and backward (hi from mandatory dependents)
+    changed = True
+    rounds = 0
+    while changed and rounds <= n + 1:
+        changed = False
+        rounds += 1
+        for j, gs in enumerate(groups):
+            for g in gs:
+                earliest = min(o[1] + 1 if o[0] == "fixed" else lo[o[1]] + 1 for o in g)
+                if earliest > lo[j]:
+                    lo[j] = earliest
+                    changed = True
+        for p, j in mandatory:
+            if hi[j] - 1 < hi[p]:
+                hi[p], hi_code[p] = hi[j] - 1, hi_code[j]
+                changed = True
+        if any(lo[j] > hi[j] for j in range(n)):
+            break
+
+    # In-person requirement per window session, now that lo is known
+    total = 0
+    for i, k in zip(window, need):
+        total += k
+        ready = sum(1 for j in inp if lo[j] <= i)
+        if ready < total:
+            dom.conflict(f"Not enough in-person courses by session {sessions[i].num}: {ready} < {total}",
+                         SessErrENUM.NOT_INPERSON)
+            break
+
+    # Infeasible bounds: blame the rule that capped the course, else its prereq chain
+    for j in range(n):
+        if lo[j] > hi[j]:
+            dom.conflict(f"{ids[j]}: no feasible session (after {lo[j]}, before {hi[j]})",
+                         SessErrENUM.PREREQ_NOT_MET if hi_code[j] is None else hi_code[j])
+
+    # Counting checks
+    if not dom.conflicts:
+        cap_pre = min_pre = 0
+        for i in range(S):
+            cap_pre += capacity[i]
+            min_pre += minimum[i]
+            due = sum(1 for h in hi if h <= i)
+            if due > cap_pre:
+                dom.conflict(f"{due} courses due by session {sessions[i].num}, {cap_pre} slots")
+                break
+            ready = sum(1 for l in lo if l <= i)
+            if ready < min_pre:
+                dom.conflict(f"{ready} courses can be taken by session {sessions[i].num}, {min_pre} needed",
+                             SessErrENUM.PREREQ_NOT_MET)
+                break
+        cap_suf = 0
+        for i in range(S - 1, -1, -1):
+            cap_suf += capacity[i]
+            late = sum(1 for l in lo if l >= i)
+            if late > cap_suf:
+                dom.conflict(f"{late} courses can't start before session {sessions[i].num}, "
+                             f"{cap_suf} slots from there")
+                break
+
+    dom.bounds = {cid: (lo[j], hi[j]) for j, cid in enumerate(ids)}
+    return dom
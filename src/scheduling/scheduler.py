@@ -2,14 +2,38 @@ from __future__ import annotations
 from .course import Course
 from .sessions import Session
 from .restraints import Restraints
-from config.course_enums import LevelENUM, StatusENUM
+from .seats import SeatLedger
+from .optimizer import OptimizeConfig, optimize_schedule
+from .propagation import propagate
+from .deadline import Deadline, check
+from config.course_enums import LevelENUM, SessErrENUM, StatusENUM
 from config.settings import SESSION_MONTHS, SESSION_WEEKS
+from src.telemetry import trace_span
+import copy
+import dataclasses
 import datetime as dt
-from typing import Optional
+from typing import Iterator, Optional
 
 class SchedulingError(Exception):
-    """Raised when a valid schedule cannot be created given the restraints."""
-    pass
+    """
+    Raised when a valid schedule cannot be created given the restraints.
+
+    Attributes:
+        code (SessErrENUM | None): Failure category. None if it fits none of them.
+    """
+    def __init__(self, message: str = "", code: Optional[SessErrENUM] = None):
+        super().__init__(message)
+        self.code = code
+
+    def __reduce__(self):
+        return (type(self), (str(self), self.code))
+
+
+def error_category(e: BaseException) -> str:
+    """Metrics/reporting category of a scheduling failure: the SessErrENUM name, or the
+    exception type name for uncategorized errors."""
+    code = getattr(e, "code", None)
+    return code.name if isinstance(code, SessErrENUM) else type(e).__name__
 
 
 class Scheduler:
@@ -72,7 +96,8 @@ class Scheduler:
             if total_ses > max_sessions_possible:
                 if r.exceed_benefits is False:
                     raise SchedulingError(f"Schedule will exceed benefits||"
-                                        f"{total_ses=}||{max_sessions_possible=}")
+                                        f"{total_ses=}||{max_sessions_possible=}",
+                                        SessErrENUM.OUT_OF_BENEFITS)
 
                 # Reduce proportionally per level
                 if total_ses > 0:
@@ -130,7 +155,7 @@ class Scheduler:
         print("Sessions creation complete.")
 
     @classmethod
-    def schedule_set(cls, user: User) -> None:
+    def schedule_set(cls, user: User, as_of: Optional[dt.date] = None) -> None:
         """Schedules all Courses with 'set' session number and "completes" all
         courses with status "StatusENUM.COMPLETE". This includes 
         statuses: 'complete' and 'inprocess', assuming proper intake format. 
@@ -139,7 +164,9 @@ class Scheduler:
         Args:
             user (User): User instance with all potential Course objects in 
                 attr 'user.courses'.
+            as_of (dt.date, optional): Date sessions are past/future from. Default today.
         """
+        as_of = as_of or dt.date.today()
         from src.user import User
         print(f"Scheduling set courses for {user.id_}...")
 
@@ -165,7 +192,7 @@ class Scheduler:
 
             # Add course to session, session to schedule, course to 'assigned'
             ses.add_course(c)
-            if ses.start_date < dt.date.today():
+            if ses.start_date < as_of:
                 user.schedule.append(ses)
             else:
                 user.free_sessions.append(ses)
@@ -183,6 +210,10 @@ class Scheduler:
         cls, 
         user: User, 
         restraints: Restraints, 
+        seats: Optional[SeatLedger] = None,
+        optimize: Optional[OptimizeConfig] = None,
+        as_of: Optional[dt.date] = None,
+        deadline: Optional[Deadline] = None,
         ) -> None:
         """
         Schedules all unassigned courses according to provided restraints. Assumes pre-assigned
@@ -191,10 +222,74 @@ class Scheduler:
         Args:
             user (User): User instance with courses.
             restraints (Restraints): All applicable scheduling constraints.
+            seats (SeatLedger, optional): Shared in-person capacities (cohort scheduling).
+                Seats are booked as sessions are scheduled and released if this raises.
+            optimize (OptimizeConfig, optional): Improve the greedy schedule with a
+                time-boxed local search (optimizer.py) before intents are placed.
+            as_of (dt.date, optional): Only sessions starting on/after this date are
+                scheduled. Default today.
+            deadline (Deadline, optional): Checked per session and per intent pass. The
+                optimizer's time_budget is cut to the time remaining, and its search
+                stops at the deadline even under max_iters.
 
         Raises:
             SchedulingError: If scheduling cannot satisfy all constraints.
+            DeadlineExceeded: If the deadline passes or is cancelled.
+        """
+        try:
+            for _ in cls._iter_schedule_free(user, restraints, seats, optimize, as_of, deadline):
+                pass
+        except Exception:
+            if seats is not None:
+                seats.release_user(user.id_)
+            raise
+
+    @classmethod
+    def iter_schedule_free(
+        cls,
+        user: User,
+        restraints: Restraints,
+        as_of: Optional[dt.date] = None,
+        deadline: Optional[Deadline] = None,
+        ) -> Iterator[Session]:
+        """
+        Generator form of schedule_free: yields each free session as soon as it is
+        committed, with its courses placed and grants and GI Bill charged. Sessions come
+        in schedule order, undergrad level first.
+
+        Stopping early leaves the user with only the sessions yielded so far, and none
+        of the later work is done. Once exhausted, the user is in the same state as
+        after schedule_free. Intent courses are attached to the yielded sessions after
+        the last one; they carry no cost.
+
+        Args:
+            user (User): User instance with courses. Same preconditions as schedule_free.
+            restraints (Restraints): All applicable scheduling constraints.
+            as_of (dt.date, optional): As schedule_free. Default today.
+            deadline (Deadline, optional): As schedule_free.
+
+        Yields:
+            Session: Each committed session.
+
+        Raises:
+            SchedulingError, DeadlineExceeded: As schedule_free, when the failing session
+                is reached.
         """
+        yield from cls._iter_schedule_free(user, restraints, None, None, as_of, deadline)
+
+    @classmethod
+    def _iter_schedule_free(
+        cls,
+        user: User,
+        restraints: Restraints,
+        seats: Optional[SeatLedger],
+        optimize: Optional[OptimizeConfig] = None,
+        as_of: Optional[dt.date] = None,
+        deadline: Optional[Deadline] = None,
+        ) -> Iterator[Session]:
+        """Body of schedule_free. Yields sessions as _iter_schedule_level commits them
+        (before optimization, if `optimize` is set)."""
+        as_of = as_of or dt.date.today()
         # Clean up and copy for scheduling use
         r = restraints
         under_courses = [c for c in user.courses if (
@@ -205,7 +300,7 @@ class Scheduler:
         grad_courses = [c for c in user.courses if (
                 c not in user.assigned_courses and c.level == LevelENUM.GRADUATE)]
         
-        user.free_sessions = [s for s in user.free_sessions if s.start_date >= dt.date.today()]
+        user.free_sessions = [s for s in user.free_sessions if s.start_date >= as_of]
 
         under_ses = [s for s in user.free_sessions if s.level == LevelENUM.UNDERGRAD]
         grad_ses = [s for s in user.free_sessions if s.level == LevelENUM.GRADUATE]
@@ -214,24 +309,79 @@ class Scheduler:
         for s in user.free_sessions:
             print(f"\n{s.num}: {s.level}") # ----------------------------------- All levels at 0 here
 
+        prof = user.profile
+        # GI Bill before free sessions are charged; the optimizer re-charges from here
+        base_gib = copy.deepcopy(user.gib) if optimize is not None and user.gib else None
+        defer = optimize is not None
+
         # Schedule undergrad first if avail:
         if under_courses or under_ses:
             if not (under_ses and under_courses):
                 raise SchedulingError("Undergrad courses vs session discrepancy.")
-            cls._schedule_level(user, under_courses, under_ses, restraints)
+            with trace_span(prof, "schedule_free.undergrad", courses=len(under_courses)):
+                yield from cls._iter_schedule_level(user, under_courses, under_ses, restraints, seats,
+                                                    defer, deadline)
 
         # Schedule graduate if available
         if grad_courses or grad_ses:
             if not (grad_courses and grad_ses):
                 print(f"Grad Courses: {grad_courses}\n Grad Ses: {grad_ses}")
                 raise SchedulingError("Graduate courses vs session discrepancy.")
-            cls._schedule_level(user, grad_courses, grad_ses, restraints)
+            with trace_span(prof, "schedule_free.graduate", courses=len(grad_courses)):
+                yield from cls._iter_schedule_level(user, grad_courses, grad_ses, restraints, seats,
+                                                    defer, deadline)
+
+        if optimize is not None:
+            remaining = deadline.remaining() if deadline is not None else None
+            if remaining is not None and remaining < optimize.time_budget:
+                optimize = dataclasses.replace(optimize, time_budget=remaining)
+            with trace_span(prof, "optimize"):
+                cls._optimize(user, restraints, base_gib, seats, optimize, as_of, deadline)
+
+        with trace_span(prof, "place_intents"):
+            cls._place_intents(user, as_of, deadline)
 
+    @classmethod
+    def _optimize(
+        cls,
+        user: User,
+        r: Restraints,
+        base_gib,
+        seats: Optional[SeatLedger],
+        config: OptimizeConfig,
+        as_of: dt.date,
+        deadline: Optional[Deadline] = None,
+        ) -> None:
+        """Runs the local search over future sessions. Must be called from schedule_free,
+        after all levels are scheduled. Enforces the ses_max_cost deferred by _schedule_level.
+        """
+        scheduled = {id(s) for s in user.schedule}
+        sessions = [s for s in user.schedule if s.start_date >= as_of and s.level is not None]
+        # Unused sessions can be filled too (only empty ones; set sessions stay put)
+        sessions += [s for s in user.free_sessions
+                     if id(s) not in scheduled and s.level is not None and not s.courses]
+
+        result = optimize_schedule(user, r, sessions, base_gib, seats, config, deadline)
+        print(f"Optimized: {result.initial:.0f} -> {result.best:.0f} "
+              f"({result.iterations} iters, {result.accepted} accepted)")
+
+        if r.ses_max_cost:
+            for s in user.schedule:
+                if s.start_date >= as_of and s.adj_cost > r.ses_max_cost:
+                    raise SchedulingError(f"Session outside cost restraint: {s=}", SessErrENUM.OVER_MAX_COST)
+
+    @classmethod
+    def _place_intents(cls, user: User, as_of: Optional[dt.date] = None,
+                       deadline: Optional[Deadline] = None) -> None:
+        """Places intent (transfer/challenge) courses into scheduled sessions. Must be 
+        called from schedule_free, after all levels are scheduled.
+        """
         # --- Put Intent in correct Session ---
         # Get intent courses, map
         intent_courses = [c for c in user.courses if c.challenge_intent or c.transfer_intent]
         intent_map = {c.course_id: c for c in intent_courses}
         
+        as_of = as_of or dt.date.today()
         # Ensure sessions in order
         user.schedule.sort()
 
@@ -257,11 +407,12 @@ class Scheduler:
         i = 0
 
         while pending_ids and i < 100:
+            check(deadline, "place_intents")
             for course_id in pending_ids[:]:  # iterate over a copy
                 course = intent_map[course_id]
                 for session in user.schedule:
                     # Skip sessions that are already underway
-                    if session.start_date <= dt.date.today():
+                    if session.start_date <= as_of:
                         continue
                     # Spread course into this session if under current level
                     if len(session.intent) <= level:
@@ -281,9 +432,37 @@ class Scheduler:
         courses: list[Course], 
         sessions: list[Session],
         r: Restraints,
+        seats: Optional[SeatLedger] = None,
+        defer_max_cost: bool = False,
+        deadline: Optional[Deadline] = None,
         ) -> None:
+        """Schedules one level to completion. See _iter_schedule_level."""
+        for _ in cls._iter_schedule_level(user, courses, sessions, r, seats, defer_max_cost, deadline):
+            pass
+
+    @classmethod
+    def _iter_schedule_level(
+        cls,
+        user: User,
+        courses: list[Course], 
+        sessions: list[Session],
+        r: Restraints,
+        seats: Optional[SeatLedger] = None,
+        defer_max_cost: bool = False,
+        deadline: Optional[Deadline] = None,
+        ) -> Iterator[Session]:
         """Internal method to handle individual scheduling. Must be called from schedule_free.
-        Niave, assumes all validation has been passed.
+        Niave, assumes all validation has been passed. Course placements are limited to the
+        session ranges from propagation.propagate.
+
+        With `defer_max_cost`, ses_max_cost is left to the optimizer (checked after it runs).
+
+        With `seats`, in-person courses only count toward min_inperson while their section
+        has a free seat. If capacity (not prereqs) leaves a session short, the shortfall is
+        recorded on the ledger and the session is filled online. An in-person course the
+        fill picks for a full section is taken online and recorded in `seats.online`.
+
+        Yields each session once it is committed (charged, appended to user.schedule).
         """
         # Assume all challenges are taken
         i = 0
@@ -315,9 +494,20 @@ class Scheduler:
 
         print(f"--------SESSIONS-------{sessions}")
 
+        # Feasible session range per course; fail before placing anything if none
+        domains = propagate(
+            courses, sessions, r, user.assigned_courses,
+            capacity=[max(0, tgt - len(s.courses)) for tgt, s in zip(tgt_list, sessions)],
+            gib=user.gib if gib else None,
+            inperson=seats is None,
+        )
+        if domains.conflicts:
+            raise SchedulingError(f"Infeasible level||{'; '.join(domains.conflicts)}", domains.code)
+
                 
         # Schedule
         for i, s in enumerate(sessions):
+            check(deadline, "schedule_level")
             # Ensure inside min, max
             course_tgt = tgt_list[i]
             assert r.ses_min_class <= course_tgt <= r.ses_max_class, (
@@ -327,6 +517,9 @@ class Scheduler:
             # Get pre-req qualified courses
             qual = cls._get_satisfied_prereqs(courses,user.assigned_courses)
             qual.sort(reverse=True)
+            # Only placements left by propagation; courses with no later option go first
+            qual = [c for c in qual if domains.allows(c, i)]
+            qual.sort(key=lambda c: domains.hi(c) > i)
 
             # Ensure inperson met
             if r.inperson_courses:
@@ -339,11 +532,18 @@ class Scheduler:
                         if c in r.inperson_courses:
                             inperson.append(c)
                     if r.min_inperson:
-                        if len(inperson) < r.min_inperson:
-                            raise SchedulingError("Not enough inperson courses")
+                        need = r.min_inperson
+                        if len(inperson) < need:
+                            raise SchedulingError("Not enough inperson courses", SessErrENUM.NOT_INPERSON)
                         if r.min_inperson > r.ses_max_class:
                             raise SchedulingError("Restraints: Min inperson > Max class")
-                        for _ in range(r.min_inperson):
+                        if seats is not None:
+                            # Only sections with a free seat count; fall back to online
+                            inperson = [c for c in inperson if seats.available(c.course_id, s.start_date) > 0]
+                            if len(inperson) < need:
+                                seats.record_shortfall(user.id_, s.num, need - len(inperson))
+                                need = len(inperson)
+                        for _ in range(need):
                             c = inperson.pop(0)
                             if c not in s.courses:
                                 s.add_course(c)
@@ -354,25 +554,32 @@ class Scheduler:
                 print(f"Qualified for {s}: {[c.course_id for c in qual]}")
                 if len(qual) < 1:
                     print(s.courses, qual, course_tgt)
-                    raise SchedulingError(f"Out of pre-req qualified courses||{s}")
+                    raise SchedulingError(f"Out of pre-req qualified courses||{s}", SessErrENUM.PREREQ_NOT_MET)
                 c = qual.pop(0)
                 if c not in s.courses:
                     s.add_course(c)
 
             # Last Verify
             assert len(s.courses) == course_tgt
+
+            # Book in-person seats; a course whose section is full is taken online
+            if seats is not None and r.inperson_courses and s.start_date <= r.in_person_end_dt:
+                for c in s.courses:
+                    if c in r.inperson_courses and not seats.reserve(user.id_, c.course_id, s.start_date, s.num):
+                        seats.record_online(user.id_, c.course_id, s.start_date, s.num)
                 
             # Apply benefits
             s.add_grants(user.grants)
+            cost = s.adj_cost
             if gib:
                 covered, cost = user.gib.charge_session(s, final=True)
                 # Ensure inside benefits
                 if r.exceed_benefits is False and covered is False:
-                    raise SchedulingError(f"Session exceeds benefits: {s=}")
+                    raise SchedulingError(f"Session exceeds benefits: {s=}", SessErrENUM.OUT_OF_BENEFITS)
 
             # Ensure inside max cost
-            if r.ses_max_cost and cost > r.ses_max_cost:
-                raise SchedulingError(f"Session outside cost restraint: {s=}")
+            if r.ses_max_cost and cost > r.ses_max_cost and not defer_max_cost:
+                raise SchedulingError(f"Session outside cost restraint: {s=}", SessErrENUM.OVER_MAX_COST)
             
             # Assign scheduled session and courses to user
             user.schedule.append(s)
@@ -384,6 +591,8 @@ class Scheduler:
                 if c in courses:
                     courses.remove(c)
 
+            yield s
+
     @classmethod
     def _get_satisfied_prereqs(
         cls, 
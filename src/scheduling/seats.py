@@ -0,0 +1,112 @@
+from __future__ import annotations
+from typing import Any, Callable, Optional
+import datetime as dt
+import heapq
+import math
+
+from config.course_enums import StatusENUM
+
+
+class SeatLedger:
+    """
+    Shared in-person seat capacities for cohort scheduling.
+
+    Capacities are keyed by (course_id, session start date), or by course_id alone
+    for a capacity that applies to every session of that course. In-person courses
+    with no capacity entry fall back to `default_capacity` (None = unlimited).
+
+    Bookkeeping is incremental: reserving or releasing a seat is O(1), so one user
+    can be rescheduled (release_user, then schedule again with the same ledger)
+    without touching anyone else.
+
+    Attributes:
+        booked (dict): {(course_id, start_date): seats taken}
+        holds (dict): {user_id: [(course_id, start_date, session num), ...]}
+        shortfalls (dict): {user_id: [(session num, in-person courses missing), ...]}
+            Sessions where capacity, not prereqs, kept a user under min_inperson;
+            those courses were scheduled online instead.
+        online (dict): {user_id: [(course_id, start_date, session num), ...]}
+            In-person courses scheduled into a full section, taken online (no hold).
+    """
+    def __init__(self, capacities: Optional[dict] = None, default_capacity: Optional[int] = None):
+        self.capacities = dict(capacities or {})
+        self.default_capacity = default_capacity
+        self.booked: dict[tuple, int] = {}
+        self.holds: dict[Any, list] = {}
+        self.shortfalls: dict[Any, list] = {}
+        self.online: dict[Any, list] = {}
+
+    def capacity(self, course_id: str, start_date: dt.date) -> float:
+        cap = self.capacities.get((course_id, start_date))
+        if cap is None:
+            cap = self.capacities.get(course_id, self.default_capacity)
+        return math.inf if cap is None else cap
+
+    def available(self, course_id: str, start_date: dt.date) -> float:
+        return self.capacity(course_id, start_date) - self.booked.get((course_id, start_date), 0)
+
+    def reserve(self, user_id: Any, course_id: str, start_date: dt.date, session_num: int) -> bool:
+        """Take one seat. Returns False (and books nothing) if the section is full."""
+        if self.available(course_id, start_date) <= 0:
+            return False
+        key = (course_id, start_date)
+        self.booked[key] = self.booked.get(key, 0) + 1
+        self.holds.setdefault(user_id, []).append((course_id, start_date, session_num))
+        return True
+
+    def record_shortfall(self, user_id: Any, session_num: int, missing: int) -> None:
+        self.shortfalls.setdefault(user_id, []).append((session_num, missing))
+
+    def record_online(self, user_id: Any, course_id: str, start_date: dt.date, session_num: int) -> None:
+        self.online.setdefault(user_id, []).append((course_id, start_date, session_num))
+
+    def release_user(self, user_id: Any) -> int:
+        """Free every seat held by a user (e.g. before rescheduling). Returns seats freed."""
+        held = self.holds.pop(user_id, [])
+        for course_id, start_date, _ in held:
+            key = (course_id, start_date)
+            self.booked[key] -= 1
+            if not self.booked[key]:
+                del self.booked[key]
+        self.shortfalls.pop(user_id, None)
+        self.online.pop(user_id, None)
+        return len(held)
+
+    def inperson_courses(self, user_id: Any) -> list[tuple]:
+        """(course_id, start_date, session num) of each seat a user holds."""
+        return list(self.holds.get(user_id, []))
+
+
+# region Fair priority
+def graduation_priority(user) -> float:
+    """Fewest remaining courses first: the student closest to graduating."""
+    return sum(
+        1 for c in user.courses
+        if c.status == StatusENUM.NONE and not (c.transfer_intent or c.challenge_intent)
+    )
+
+
+def gib_days_priority(user) -> float:
+    """Least remaining GI Bill days first; users without GI Bill go last."""
+    if getattr(user, "gib", None):
+        return user.gib.remaining_days
+    return math.inf
+
+
+PRIORITIES: dict[str, Callable] = {
+    "graduation": graduation_priority,
+    "gib_days": gib_days_priority,
+}
+
+
+def priority_order(users: list, priority: str | Callable = "graduation"):
+    """
+    Yield users lowest priority key first (ties keep input order), via a heap so
+    the first users can start scheduling before the whole cohort is ordered.
+    """
+    key = PRIORITIES[priority] if isinstance(priority, str) else priority
+    heap = [(key(u), i, u) for i, u in enumerate(users)]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[2]
+# endregion
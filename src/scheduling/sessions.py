@@ -68,6 +68,30 @@ class Session:
         return self._num != self._get_comp_val(other)
     # endregion
 
+    # region Pickle
+    # Dates as ordinals; totals and pre_reqs are derived and recomputed on load.
+    def __getstate__(self):
+        return (
+            self._num,
+            self.level,
+            self._courses,
+            self._intent,
+            self._grants_applied,
+            self._gib_applied,
+            self.gib_remaining,
+            self._start_date.toordinal(),
+            self._end_date.toordinal(),
+            self._month,
+        )
+
+    def __setstate__(self, state):
+        (self._num, self.level, self._courses, self._intent, self._grants_applied,
+         self._gib_applied, self.gib_remaining, start_ord, end_ord, self._month) = state
+        self._start_date = dt.date.fromordinal(start_ord)
+        self._end_date = dt.date.fromordinal(end_ord)
+        self._calc_courses()
+    # endregion
+
     def add_grants(self, total_amount:float | int):
         """Add a grant amount to be subtracted from total value
         """
@@ -118,6 +142,14 @@ class Session:
             return
         self._calc_courses()
 
+    def clear_courses(self):
+        """Remove all courses and applied benefits, leaving an empty, uncharged session."""
+        self._courses = []
+        self._grants_applied = 0
+        self._gib_applied = 0
+        self.gib_remaining = 0
+        self._calc_courses()
+
     def add_intent(self, course: Course):
         self._intent.append(course)
 
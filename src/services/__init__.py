@@ -1,3 +1,5 @@
 from .user_services import create_gib, create_new_user, modify_user
-from .scheduling_services import generate_schedule, export_schedule, generate_restraints
-from .intake_services import get_courses_pipeline
\ No newline at end of file
+from .scheduling_services import generate_schedule, export_schedule, export_batch, export_delta, generate_restraints, schedule_cohort, estimate_schedule, record_failure, stream_schedule
+from .intake_services import get_courses_pipeline, get_courses_bulk, get_program_catalog
+from .batch_services import schedule_shared, schedule_bounded, lost_result
+from .planning_services import plan, plan_key, PlanCoalescer
\ No newline at end of file
@@ -0,0 +1,164 @@
+from config.course_enums import SessErrENUM
+from src.batch import CheckpointJournal, SharedCatalog, SpillBuffer, SupervisedPool, UserOverlay
+from src.scheduling import Restraints
+from src.telemetry import MemoryProfile, MetricsRegistry
+from .scheduling_services import generate_schedule, record_failure
+from contextlib import nullcontext
+from typing import Iterable, Iterator, Optional
+import datetime as dt
+import multiprocessing as mp
+
+
+def schedule_shared(
+    catalog: SharedCatalog,
+    overlays: Iterable[UserOverlay],
+    restraints: Restraints,
+    spread_between: Optional[int] = None,
+    processes: Optional[int] = None,
+    chunksize: int = 16,
+    journal: Optional[CheckpointJournal] = None,
+    timeout: Optional[float] = None,
+    hard_timeout: Optional[float] = None,
+    as_of: Optional[dt.date] = None,
+) -> Iterator[dict]:
+    """
+    Schedule a cohort on one program catalog with a process pool. Workers attach to
+    `catalog` zero-copy at startup; each task ships only a UserOverlay.
+
+        with SharedCatalog.create(courses) as cat:
+            overlays = (UserOverlay.from_courses(uid, cs, cat, first_dt) for uid, cs in users)
+            for result in schedule_shared(cat, overlays, restraints):
+                ...
+
+    Args:
+        catalog (SharedCatalog): Catalog created (owned) by this process.
+        overlays (Iterable[UserOverlay]): Per-user state. Consumed lazily.
+        restraints (Restraints): Restraints shared by the cohort.
+        spread_between (int, optional): Passed to generate_schedule for every user.
+        processes (int, optional): Worker count. Defaults to os.cpu_count().
+        chunksize (int): Overlays per task message.
+        journal (CheckpointJournal, optional): Users already in it are skipped, and each
+            result is recorded (by user_id) before it is yielded.
+        timeout (float, optional): Per-user time limit in seconds, checked between
+            scheduling steps (see src.scheduling.deadline).
+        hard_timeout (float, optional): Run in a SupervisedPool instead, killing and
+            replacing any worker still on one user after this many seconds. chunksize
+            is ignored (one user per task).
+        as_of (dt.date, optional): As generate_schedule, for every user.
+
+    Yields:
+        dict: One result per user, in completion order (see workers.schedule_overlay).
+    """
+    from src.batch.workers import init_shared_worker, schedule_overlay
+
+    initargs = (catalog.spec, restraints, spread_between, timeout, as_of)
+    if hard_timeout is not None:
+        pool = SupervisedPool(processes, hard_timeout, init_shared_worker, initargs)
+        on_lost = lambda overlay, reason: lost_result(overlay.user_id, reason)
+        imap = lambda tasks: pool.imap_unordered(schedule_overlay, tasks, on_lost)
+    else:
+        pool = mp.Pool(processes, initializer=init_shared_worker, initargs=initargs)
+        imap = lambda tasks: pool.imap_unordered(schedule_overlay, tasks, chunksize)
+    with pool:
+        if journal is None:
+            yield from imap(overlays)
+            return
+        overlays = (o for o in overlays if not journal.is_done(o.user_id))
+        for result in imap(overlays):
+            journal.record(result["user_id"], result)
+            yield result
+
+
+def lost_result(user_id, reason: str, metrics: Optional[MetricsRegistry] = None) -> dict:
+    """
+    SupervisedPool on_lost result for a user whose worker was killed (hard timeout) or
+    died, counted as a failure like any other.
+
+    Args:
+        user_id: The user's ID (None if unknown).
+        reason (str): SupervisedPool's reason: "timeout", or how the worker was lost.
+        metrics (MetricsRegistry, optional): Registry for the failure. Default REGISTRY.
+
+    Returns:
+        dict: {"user_id", "status": "error", "category", "error"}, with category
+            TIMEOUT for a timeout, else WorkerLost.
+    """
+    if reason == "timeout":
+        category, error = SessErrENUM.TIMEOUT.name, f"DeadlineExceeded: Worker killed||{reason}"
+    else:
+        category, error = "WorkerLost", f"WorkerLost: Worker {reason}"
+    record_failure(metrics, category)
+    return {"user_id": user_id, "status": "error", "category": category, "error": error}
+
+
+def schedule_bounded(
+    users: Iterable,
+    restraints: Restraints,
+    spread_between: Optional[int] = None,
+    catalog=None,
+    budget_mb: Optional[float] = None,
+    max_held: Optional[int] = None,
+    spill_path: Optional[str] = None,
+    memory: Optional[MemoryProfile] = None,
+    as_of: Optional[dt.date] = None,
+) -> SpillBuffer:
+    """
+    Schedule a cohort in this process with bounded memory: scheduled users are held
+    until RSS passes `budget_mb` (or `max_held` users), then encoded to a spill file
+    and released. Pass `users` as a generator so unscheduled users are not all built
+    up front either.
+
+        mem = MemoryProfile()
+        with ser.schedule_bounded(users, restraints, 15, budget_mb=512, memory=mem) as buf:
+            with mem.stage("export"):
+                ser.export_batch(buf, "csv", "cohort.csv")
+        mem.summary()       # per-stage peaks: "schedule", "spill", "export"
+        buf.stats()         # users, failed, spilled, spills, peak_rss_bytes
+        buf.failed          # {user id: error} of users that could not be scheduled
+
+    Args:
+        users (Iterable[User]): Unscheduled users. Consumed lazily.
+        restraints (Restraints): Restraints shared by the cohort.
+        spread_between (int, optional): As generate_schedule.
+        catalog (Catalog | Sequence[Course], optional): Every course the users hold.
+            Defaults to the first user's courses (one program).
+        budget_mb (float, optional): RSS budget in MiB.
+        max_held (int, optional): Most scheduled users held in memory.
+        spill_path (str, optional): Spill file; a temporary file if None.
+        memory (MemoryProfile, optional): Records per-stage peak memory.
+        as_of (dt.date, optional): As generate_schedule.
+
+    Returns:
+        SpillBuffer: Every scheduled user (iterate it; close it when done). Users that
+            fail to schedule are left out and recorded in its `failed` (and counted by
+            generate_schedule), so one bad user does not lose the run.
+
+    Raises:
+        OSError: If the spill file cannot be written. The buffer is closed, as on
+            KeyboardInterrupt.
+    """
+    def stage(name: str):
+        return memory.stage(name) if memory is not None else nullcontext()
+
+    buf = None
+    try:
+        for user in users:
+            if buf is None:
+                buf = SpillBuffer(catalog if catalog is not None else user.courses,
+                                  budget_mb, max_held, spill_path)
+            try:
+                with stage("schedule"):
+                    generate_schedule(user, restraints, spread_between, as_of=as_of)
+            except Exception as e:
+                buf.failed[user.id_] = f"{type(e).__name__}: {e}"
+                continue
+            buf.hold(user)
+            del user
+            if buf.spill_due():
+                with stage("spill"):
+                    buf.spill()
+    except BaseException:
+        if buf is not None:
+            buf.close()
+        raise
+    return buf if buf is not None else SpillBuffer(catalog or [], budget_mb, max_held, spill_path)
@@ -1,7 +1,57 @@
+from typing import Any, Iterator
+
+
+def _check_in_person(in_person: list|None|str, msg: str) -> list:
+    """Validate the in_person argument shared by the intake pipelines."""
+    if in_person == None:
+        in_person = []
+    elif isinstance(in_person, str):
+        raise NotImplementedError(f"{msg} STR path for in_person not supported yet")
+    elif isinstance(in_person, list):
+        assert (all(isinstance(x, str) for x in in_person) or in_person == []), f"{msg} in_person contents: {in_person}"
+    else:
+        raise TypeError(f"{msg} in_person: {type(in_person)}")
+    return in_person
+
+
+def _courses_from_df(raw_df, in_person: list, profile = None) -> list:
+    """Create, organize and prioritize Course objects from a fetched DataFrame."""
+    from src.intake import (
+        create_courses,
+        organize_courses,
+        prioritize_courses
+    )
+    from src.telemetry import trace_span
+
+    # Flattened list of Course objects
+    with trace_span(profile, "create_courses"):
+        all_classes_list = create_courses(raw_df)
+
+    # Organize courses by LevelENUM
+    with trace_span(profile, "organize_courses"):
+        org_by_level_dict = organize_courses(all_classes_list)
+    # {LevelENUM: {Course.course_id: Course obj, ...}, ...}
+
+    # Prioritize courses per level
+    with trace_span(profile, "prioritize_courses"):
+        prioritized_dict = {
+            k: prioritize_courses(v,in_person=in_person)
+            for k, v in org_by_level_dict.items()
+        }
+
+    out = []
+    for _, l in prioritized_dict.items():
+        out.extend(l)
+
+    return out
+
+
 def get_courses_pipeline(
         course_path: str,
         course_path_abs: bool,
         in_person: list|None|str = None,
+        profile = None,
+        catalog = None,
         ) -> list:
     """
     Process raw course data through the full pipeline:  
@@ -10,50 +60,130 @@ def get_courses_pipeline(
     3. Organize by level  
     4. Prioritize courses  
 
+    With a ProgramCatalog (get_program_catalog), steps 2-4 were done once for the
+    program: `course_path` is then the student's overlay CSV (course id, status,
+    session, intents), joined onto the catalog. Cost follows the overlay's row count.
+
     Args:
         in_person (list): Optional list of course IDs to treat as in-person for filtering logic.
+            Ignored with `catalog` (set when the catalog is built).
+        profile (RunProfile, optional): If passed, each intake stage is timed into it.
+        catalog (ProgramCatalog, optional): Prebuilt program catalog.
 
     Returns:
         courses: List of Course objects
     """
     # Imports to avoid high-level exposure
-    from src.intake import (
-        fetch_data,
-        create_courses,
-        organize_courses,
-        prioritize_courses
-    )
+    from src.intake import fetch_data, read_overlay
+    from src.telemetry import trace_span
     # Quick Validation:
     msg = "Get Courses Pipeline||Improper Arg: "
     assert isinstance(course_path, str), f"{msg} course_path: {type(course_path)}"
     assert isinstance(course_path_abs, bool), f"{msg} course_path_abs: {type(course_path_abs)}"
-    if in_person == None:
-        in_person = []
-    elif isinstance(in_person, str):
-        raise NotImplementedError(f"{msg} STR path for in_person not supported yet")
-    elif isinstance(in_person, list):
-        assert (all(isinstance(x, str) for x in in_person) or in_person == []), f"{msg} in_person contents: {in_person}"
-    else:
-        raise TypeError(f"{msg} in_person: {type(in_person)}")
+    in_person = _check_in_person(in_person, msg)
 
-    raw_df = fetch_data(course_path, is_absolute=course_path_abs)
+    if catalog is not None:
+        with trace_span(profile, "read_overlay"):
+            overlay = read_overlay(course_path, is_absolute=course_path_abs)
+        with trace_span(profile, "join_catalog"):
+            return catalog.join(overlay)
 
-    # Flattened list of Course objects
-    all_classes_list = create_courses(raw_df)
+    with trace_span(profile, "fetch_data"):
+        raw_df = fetch_data(course_path, is_absolute=course_path_abs)
 
-    # Organize courses by LevelENUM
-    org_by_level_dict = organize_courses(all_classes_list)
-    # {LevelENUM: {Course.course_id: Course obj, ...}, ...}
+    return _courses_from_df(raw_df, in_person, profile)
 
-    # Prioritize courses per level
-    
-    prioritized_dict = {
-        k: prioritize_courses(v,in_person=in_person)
-        for k, v in org_by_level_dict.items()
-    }
 
-    out = []
-    for _, l in prioritized_dict.items():
-        out.extend(l)
+def get_program_catalog(
+        catalog_path: str,
+        catalog_path_abs: bool,
+        in_person: list|None|str = None,
+        profile = None,
+        ):
+    """
+    Parse, validate and prioritize a program catalog once, for joining with student
+    overlays (get_courses_pipeline(catalog=...), get_courses_bulk(catalog=...)).
 
-    return out
+    Args:
+        catalog_path (str): Catalog CSV/Excel: course id, credit hours, level, prereqs,
+            capstone. A full course_input.csv also works (its student columns are ignored).
+        catalog_path_abs (bool): Whether `catalog_path` is absolute.
+        in_person (list): Optional list of course IDs to treat as in-person.
+        profile (RunProfile, optional): If passed, each intake stage is timed into it.
+
+    Returns:
+        ProgramCatalog: Prioritized catalog courses.
+    """
+    from src.intake import ProgramCatalog, fetch_catalog_data
+    from src.telemetry import trace_span
+
+    msg = "Get Program Catalog||Improper Arg: "
+    assert isinstance(catalog_path, str), f"{msg} catalog_path: {type(catalog_path)}"
+    assert isinstance(catalog_path_abs, bool), f"{msg} catalog_path_abs: {type(catalog_path_abs)}"
+    in_person = _check_in_person(in_person, msg)
+
+    with trace_span(profile, "fetch_catalog"):
+        raw_df = fetch_catalog_data(catalog_path, is_absolute=catalog_path_abs)
+
+    return ProgramCatalog(_courses_from_df(raw_df, in_person, profile))
+
+
+def get_courses_bulk(
+        course_path: str,
+        course_path_abs: bool,
+        in_person: list|None|str = None,
+        chunksize: int = 50_000,
+        catalog = None,
+        ) -> Iterator[tuple[Any, list]]:
+    """
+    Lazily run the course pipeline for many users at once. Accepts either:
+    - A single long-format CSV/Excel file with a `user id` column (rows for each
+      user contiguous), read `chunksize` rows at a time.
+    - A directory of per-user files (same format as get_courses_pipeline); the
+      user id is the file name without extension.
+
+    With a ProgramCatalog, the file (or each file in the directory) holds overlays
+    instead, and every user's overlay is joined onto the catalog. User ids from a
+    long-format overlay file are strings.
+
+    Each user's rows are validated with the same rules as a single file. Nothing
+    is read until iterated, and only one chunk is held at a time.
+
+    Args:
+        course_path (str): Bulk file or directory path.
+        course_path_abs (bool): Whether `course_path` is absolute.
+        in_person (list): Optional list of course IDs to treat as in-person.
+        chunksize (int): Rows read per chunk for long-format files.
+        catalog (ProgramCatalog, optional): Prebuilt program catalog (overlay input).
+
+    Yields:
+        tuple: (user id, list of prioritized Course objects)
+    """
+    from src.intake import fetch_bulk_data, fetch_dir_data
+    from pathlib import Path
+
+    msg = "Get Courses Bulk||Improper Arg: "
+    assert isinstance(course_path, str), f"{msg} course_path: {type(course_path)}"
+    assert isinstance(course_path_abs, bool), f"{msg} course_path_abs: {type(course_path_abs)}"
+    in_person = _check_in_person(in_person, msg)
+
+    path = Path(course_path) if course_path_abs else Path.cwd() / course_path
+    if catalog is not None:
+        from src.intake import read_bulk_overlays, read_overlay
+
+        if path.is_dir():
+            for f in sorted(path.iterdir()):
+                if f.suffix.lower() == ".csv":
+                    yield f.stem, catalog.join(read_overlay(str(f), is_absolute=True))
+        else:
+            for user_id, overlay in read_bulk_overlays(str(path), is_absolute=True):
+                yield user_id, catalog.join(overlay)
+        return
+
+    if path.is_dir():
+        frames = fetch_dir_data(str(path), is_absolute=True)
+    else:
+        frames = fetch_bulk_data(str(path), is_absolute=True, chunksize=chunksize)
+
+    for user_id, df in frames:
+        yield user_id, _courses_from_df(df, in_person)
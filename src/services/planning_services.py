@@ -0,0 +1,191 @@
+from src.scheduling import Restraints, Course, OptimizeConfig
+from src.scheduling.plan import Plan, UserState
+from .user_services import create_new_user
+from .scheduling_services import generate_schedule
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import astuple, replace
+from typing import Callable, Iterable, Mapping, Optional
+import datetime as dt
+import hashlib
+import threading
+import time
+
+
+def _as_mapping(catalog) -> Mapping[str, Course]:
+    if hasattr(catalog, "courses") and not isinstance(catalog, Mapping):
+        catalog = catalog.courses           # storage.Catalog
+    if not isinstance(catalog, Mapping):
+        catalog = {c.course_id: c for c in catalog}
+    return catalog
+
+
+def plan(
+    catalog: Mapping[str, Course] | Iterable[Course],
+    user_state: UserState,
+    restraints: Restraints,
+    as_of: Optional[dt.date] = None,
+    spread_between: Optional[int] = None,
+    optimize: Optional[OptimizeConfig] = None,
+) -> Plan:
+    """
+    Pure scheduling entry point: build a private User from immutable inputs, schedule
+    it and return the frozen result. Nothing passed in is modified and no global date
+    is read when `as_of` is given, so calls can run concurrently (e.g. on a thread
+    pool) on shared catalogs and restraints, and equal inputs give equal plans.
+
+        state = UserState.from_user(user)
+        p = plan(user.courses, state, restraints, as_of=dt.date(2026, 1, 1))
+        p.sessions[0].courses
+
+    Args:
+        catalog (Mapping[str, Course] | Iterable[Course]): Program courses (course_id,
+            credit hours, level, prereqs, priority). Only read; each plan copies the
+            courses it needs.
+        user_state (UserState): The user's course standing, grants and GI Bill.
+        restraints (Restraints): Scheduling constraints. Only read.
+        as_of (dt.date, optional): Date sessions are past/future from. Default today.
+        spread_between (int, optional): As generate_schedule.
+        optimize (OptimizeConfig, optional): As generate_schedule.
+
+    Returns:
+        Plan: Frozen sessions, assigned course ids and GI Bill ledger.
+
+    Raises:
+        KeyError: A user course is not in the catalog.
+        SchedulingError, ValueError: As generate_schedule.
+    """
+    as_of = as_of or dt.date.today()
+    catalog = _as_mapping(catalog)
+    courses = [
+        replace(
+            catalog[cs.course_id],
+            status=cs.status,
+            session=cs.session,
+            transfer_intent=cs.transfer_intent,
+            challenge_intent=cs.challenge_intent,
+        )
+        for cs in user_state.courses
+    ]
+    user = create_new_user(
+        first_ses_dt=user_state.first_ses_dt,
+        user_id=user_state.user_id,
+        courses=courses,
+        grant_amnt_per_ses=user_state.grants,
+        gib=user_state.gib.to_gib() if user_state.gib else None,
+    )
+    generate_schedule(user, restraints, spread_between, optimize=optimize, as_of=as_of)
+    return Plan.from_user(user, as_of)
+
+
+def plan_key(
+    catalog: Mapping[str, Course],
+    user_state: UserState,
+    restraints: Restraints,
+    as_of: dt.date,
+    spread_between: Optional[int] = None,
+    optimize: Optional[OptimizeConfig] = None,
+) -> str:
+    """
+    Canonical hash of plan() inputs. The user id is left out, so students with the same
+    catalog courses, standing, grants, GI Bill, restraints and dates share a key.
+    """
+    courses = tuple(
+        (catalog[cs.course_id].__getstate__(), astuple(replace(cs, course_id=""))) for cs in user_state.courses
+    )
+    r = dict(vars(restraints))
+    r["inperson_courses"] = tuple(sorted(r["inperson_courses"] or ()))
+    canon = (
+        courses,
+        user_state.first_ses_dt, float(user_state.grants or 0),
+        astuple(user_state.gib) if user_state.gib else None,
+        tuple(sorted(r.items())), as_of, spread_between,
+        astuple(optimize) if optimize else None,
+    )
+    return hashlib.sha256(repr(canon).encode()).hexdigest()
+
+
+class PlanCoalescer:
+    """
+    Single-flight front for plan(): concurrent calls with the same inputs (plan_key)
+    run the scheduler once and every caller gets the result, and results are kept for
+    `ttl` seconds to absorb bursts. Errors are shared with concurrent callers but not
+    cached. Safe to call from many threads.
+
+        coalescer = PlanCoalescer(ttl=30)
+        p = coalescer.plan(catalog, state, restraints, as_of=today, spread_between=15)
+        coalescer.stats     # {"requests", "executed", "coalesced", "cache_hits"}
+
+    Plans are returned with the caller's user id.
+
+    Args:
+        ttl (float): Seconds a result is reused. 0 disables the result cache.
+        max_entries (int): Cached results kept (oldest dropped first).
+        clock (Callable[[], float]): Time source, seconds.
+    """
+    def __init__(self, ttl: float = 30.0, max_entries: int = 10_000, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self._cache: OrderedDict[str, tuple[float, Plan]] = OrderedDict()
+        self.stats = {"requests": 0, "executed": 0, "coalesced": 0, "cache_hits": 0}
+
+    def plan(
+        self,
+        catalog: Mapping[str, Course] | Iterable[Course],
+        user_state: UserState,
+        restraints: Restraints,
+        as_of: Optional[dt.date] = None,
+        spread_between: Optional[int] = None,
+        optimize: Optional[OptimizeConfig] = None,
+    ) -> Plan:
+        """plan() with coalescing. Same arguments and errors."""
+        as_of = as_of or dt.date.today()
+        catalog = _as_mapping(catalog)
+        key = plan_key(catalog, user_state, restraints, as_of, spread_between, optimize)
+
+        with self._lock:
+            self.stats["requests"] += 1
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] > self.clock():
+                self.stats["cache_hits"] += 1
+                return self._for_user(hit[1], user_state)
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+                self.stats["executed"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if leader:
+            try:
+                result = plan(catalog, user_state, restraints, as_of, spread_between, optimize)
+            except BaseException as e:
+                fut.set_exception(e)
+                with self._lock:
+                    del self._inflight[key]
+                raise
+            with self._lock:
+                # Cache before leaving in-flight, so no identical call starts in between
+                if self.ttl > 0:
+                    self._cache[key] = (self.clock() + self.ttl, result)
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+                del self._inflight[key]
+            fut.set_result(result)
+        return self._for_user(fut.result(), user_state)
+
+    @staticmethod
+    def _for_user(result: Plan, user_state: UserState) -> Plan:
+        if result.user_id == user_state.user_id:
+            return result
+        return replace(result, user_id=user_state.user_id)
+
+    def clear(self) -> None:
+        """Drop cached results (in-flight calls are unaffected)."""
+        with self._lock:
+            self._cache.clear()
@@ -1,6 +1,15 @@
 from src.user import User
-from src.scheduling import Restraints, Scheduler as Sch, Session, Course
-from typing import Optional
+from src.scheduling import Restraints, Scheduler as Sch, Session, Course, SeatLedger, OptimizeConfig
+from src.scheduling.deadline import Deadline, check
+from src.scheduling.seats import priority_order
+from src.scheduling.estimate import Estimate, estimate_user
+from src.telemetry import trace_span
+from src.telemetry.metrics import REGISTRY, MetricsRegistry
+from src.scheduling.scheduler import error_category
+from contextlib import contextmanager
+from time import perf_counter
+from src.export import EXPORT_COLUMNS, session_row, export_users, export_delta as _export_delta
+from typing import Callable, Iterable, Iterator, Optional
 import datetime as dt
 import csv
 import os
@@ -9,6 +18,11 @@ def generate_schedule(
     user: User, 
     restraints: Optional[Restraints] = None, 
     spread_between: Optional[int] = None,
+    seats: Optional[SeatLedger] = None,
+    optimize: Optional[OptimizeConfig] = None,
+    as_of: Optional[dt.date] = None,
+    metrics: Optional[MetricsRegistry] = None,
+    deadline: Optional[Deadline] = None,
     **kwargs) -> None:
     """
     Generates a schedule for a user, using a Restraints object or individual kwargs.
@@ -19,31 +33,225 @@ def generate_schedule(
         restraints (Optional[Restraints]): Prebuilt Restraints object.
         spread_between (int): If an int is passed, sprease courses between <int> sessions.
             Default is None (Will not spread).
+        seats (Optional[SeatLedger]): Shared in-person seat capacities. See schedule_cohort.
+        optimize (Optional[OptimizeConfig]): Improve the greedy schedule with a time-boxed
+            local search, trading user cost against sessions used. Default None (greedy only).
+        as_of (Optional[dt.date]): Date sessions are past/future from. Default today.
+        metrics (Optional[MetricsRegistry]): Registry for stage latencies, users, sessions,
+            courses placed and failures by category. Default the process-wide REGISTRY.
+        deadline (Optional[Deadline]): Time limit / cancel flag, checked between stages and
+            inside the scheduling loops. Raises DeadlineExceeded (category TIMEOUT or
+            CANCELLED) when it passes. Default None (no limit).
         **kwargs: Optional fields to create a Restraints object if none provided.
+
+    If `user.profile` is set, each scheduling stage is timed into it.
     """
     print(f"Generating schedule for user {user.id_}")
     # Build restraints if not provided
     if restraints is None:
         restraints = generate_restraints(**kwargs)
 
+    prof = user.profile
+    as_of = as_of or dt.date.today()
+    metrics = metrics or REGISTRY
+    stages = metrics.histogram("scheduler_stage_seconds", "Scheduling stage duration in seconds", ("stage",))
+
+    try:
+        _prepare_schedule(user, restraints, spread_between, as_of, stages, deadline)
+
+        # Schedule Free courses or Raise (inside scheduler)
+        check(deadline, "schedule_free")
+        with _stage(prof, stages, "schedule_free"):
+            Sch.schedule_free(user, restraints, seats, optimize, as_of, deadline)
+    except Exception as e:
+        record_failure(metrics, error_category(e))
+        raise
+
+    _record_success(metrics, user, as_of)
+
+
+def stream_schedule(
+    user: User,
+    restraints: Optional[Restraints] = None,
+    spread_between: Optional[int] = None,
+    as_of: Optional[dt.date] = None,
+    metrics: Optional[MetricsRegistry] = None,
+    deadline: Optional[Deadline] = None,
+    **kwargs) -> Iterator[Session]:
+    """
+    Streaming generate_schedule: yields each free session as soon as the scheduler
+    commits it, with its courses placed and its grants and GI Bill charged. Use it
+    to show the next sessions before the whole plan is built:
+
+        for s in ser.stream_schedule(user, restraints, 15):
+            show(s)
+            if enough:
+                break       # the rest of the plan is never computed
+
+    Sessions, stage setup and errors are those of generate_schedule without seats or
+    optimize. Once the generator is exhausted, the user is in the same state as after
+    generate_schedule. If it stops early, user.schedule holds the set sessions and the
+    free sessions yielded so far. Intent courses are attached to the sessions after
+    the last one is yielded.
+
+    Args:
+        user: User object to schedule.
+        restraints, spread_between, as_of, metrics, deadline, **kwargs: As generate_schedule.
+            Metrics are recorded when the stream is exhausted or raises.
+
+    Yields:
+        Session: Each committed free session, in schedule order.
+    """
+    print(f"Streaming schedule for user {user.id_}")
+    if restraints is None:
+        restraints = generate_restraints(**kwargs)
+
+    prof = user.profile
+    as_of = as_of or dt.date.today()
+    metrics = metrics or REGISTRY
+    stages = metrics.histogram("scheduler_stage_seconds", "Scheduling stage duration in seconds", ("stage",))
+
+    try:
+        _prepare_schedule(user, restraints, spread_between, as_of, stages, deadline)
+        check(deadline, "schedule_free")
+        with trace_span(prof, "schedule_free"):
+            yield from Sch.iter_schedule_free(user, restraints, as_of, deadline)
+    except Exception as e:
+        record_failure(metrics, error_category(e))
+        raise
+
+    _record_success(metrics, user, as_of)
+
+
+def _prepare_schedule(user: User, restraints: Restraints, spread_between: Optional[int],
+                      as_of: dt.date, stages, deadline: Optional[Deadline]) -> None:
+    """Stages before free scheduling: create sessions, set courses, historical GI Bill."""
+    prof = user.profile
     # Create sessions
-    Sch.create_all_sessions(user, restraints, spread_between)
+    with _stage(prof, stages, "create_all_sessions"):
+        Sch.create_all_sessions(user, restraints, spread_between)
 
     print(f"User Sessions: {user.schedule}|||{user.free_sessions}")
 
     # Schedule Set courses
-    Sch.schedule_set(user)
+    check(deadline, "schedule_set")
+    with _stage(prof, stages, "schedule_set"):
+        Sch.schedule_set(user, as_of)
 
     # Schedule Session Levels
     # Sch._plan_session_levels(user, restraints, spread_between)
 
     # Update GI Bill before generating sessions
     if hasattr(user, "gib") and user.gib:
-        completed = [s for s in user.schedule if s.start_date <= dt.date.today()]
-        user.gib.charge_historical(completed)
+        with _stage(prof, stages, "charge_historical"):
+            completed = [s for s in user.schedule if s.start_date <= as_of]
+            user.gib.charge_historical(completed)
+
+
+def _record_success(metrics: MetricsRegistry, user: User, as_of: dt.date) -> None:
+    metrics.counter("scheduler_users", "Users scheduled, by result", ("result",)).inc(result="ok")
+    metrics.counter("scheduler_sessions", "Sessions in finished schedules").inc(len(user.schedule))
+    metrics.counter("scheduler_courses_placed", "Courses placed in sessions from as_of on").inc(
+        sum(len(s.courses) for s in user.schedule if s.start_date >= as_of))
+
+
+def record_failure(metrics: Optional[MetricsRegistry], category: str) -> None:
+    """Count one failed user under `category` (also used for jobs killed by a supervisor)."""
+    metrics = metrics or REGISTRY
+    metrics.counter("scheduler_users", "Users scheduled, by result", ("result",)).inc(result="error")
+    metrics.counter("scheduler_failures", "Scheduling failures by category", ("category",)).inc(
+        category=category)
+
 
-    # Schedule Free courses or Raise (inside scheduler)
-    Sch.schedule_free(user, restraints)
+@contextmanager
+def _stage(prof, histogram, name: str):
+    """trace_span plus a latency observation (recorded on success and on raise)."""
+    t0 = perf_counter()
+    try:
+        with trace_span(prof, name):
+            yield
+    finally:
+        histogram.observe(perf_counter() - t0, stage=name)
+
+
+def estimate_schedule(
+    user: User,
+    restraints: Optional[Restraints] = None,
+    per_session: Optional[int] = None,
+    as_of: Optional[dt.date] = None,
+    **kwargs) -> Estimate:
+    """
+    Instant time-to-degree estimate: bounds on remaining sessions, graduation date and
+    out-of-pocket cost, from course counts, the prereq critical path and GI Bill totals.
+    Nothing is scheduled and the user is not modified. See src/scheduling/estimate.py.
+
+    Args:
+        user: User object to estimate.
+        restraints (Optional[Restraints]): Prebuilt Restraints object.
+        per_session (Optional[int]): Courses per session. Default None (any from
+            ses_min_class to ses_max_class).
+        as_of (Optional[dt.date]): Date sessions start on/after. Default today.
+        **kwargs: Optional fields to create a Restraints object if none provided.
+    """
+    if restraints is None:
+        restraints = generate_restraints(**kwargs)
+    return estimate_user(user, restraints, per_session, as_of)
+
+
+def schedule_cohort(
+    users: Iterable[User],
+    restraints: Restraints,
+    capacities: Optional[dict] = None,
+    spread_between: Optional[int] = None,
+    priority: str | Callable = "graduation",
+    seats: Optional[SeatLedger] = None,
+    default_capacity: Optional[int] = None,
+    as_of: Optional[dt.date] = None,
+) -> dict:
+    """
+    Schedule many users jointly against shared in-person seat capacities.
+
+    Users are scheduled one at a time in fair-priority order (lowest key first), each
+    taking the in-person seats still free when their turn comes. When a section is
+    full, its course is taken online or in a later session; sessions left under
+    `min_inperson` by capacity are recorded as shortfalls rather than failing, and
+    courses placed into a full section are recorded in `seats.online`.
+
+    Pass an existing `seats` ledger to add or reschedule users against the same
+    capacities. To reschedule one user: `seats.release_user(user_id)` then call again
+    with a fresh copy of that user.
+
+    Args:
+        users (Iterable[User]): Unscheduled users.
+        restraints (Restraints): Restraints shared by the cohort.
+        capacities (dict, optional): {(course_id, start_date) | course_id: seats}.
+            Ignored if `seats` is passed.
+        spread_between (int, optional): As generate_schedule.
+        priority (str | Callable): "graduation" (fewest remaining courses first),
+            "gib_days" (fewest GI Bill days first) or a key function of a User.
+        seats (SeatLedger, optional): Existing ledger to continue.
+        default_capacity (int, optional): Seats for in-person courses missing from
+            `capacities`. None is unlimited.
+        as_of (Optional[dt.date]): As generate_schedule. Default today.
+
+    Returns:
+        dict: {"scheduled": [user ids], "failed": {user id: error}, "seats": SeatLedger}.
+            Any exception from one user (counted by generate_schedule, seats released)
+            goes in "failed" and the rest of the cohort is still scheduled.
+    """
+    if seats is None:
+        seats = SeatLedger(capacities, default_capacity)
+
+    scheduled, failed = [], {}
+    for user in priority_order(list(users), priority):
+        try:
+            generate_schedule(user, restraints, spread_between, seats=seats, as_of=as_of)
+        except Exception as e:
+            failed[user.id_] = f"{type(e).__name__}: {e}"
+            continue
+        scheduled.append(user.id_)
+
+    return {"scheduled": scheduled, "failed": failed, "seats": seats}
 
 
 def generate_restraints(**kwargs) -> Restraints:
@@ -78,6 +286,24 @@ def export_schedule(
     path: str = "schedule.csv",
     absoloute: bool = False
 ):
+    """
+    Export a user's schedule. Timed into `user.profile` if set.
+
+    Formats:
+        csv: The full schedule.
+        delta: Only the sessions changed since the last delta export of this path, as
+            CSV rows tagged insert/update/delete. Hashes are kept in <path>.state.json
+            and a manifest is written to <path>.manifest.json. See export_delta.
+    """
+    with trace_span(user.profile, "export_schedule"):
+        if format == "delta":
+            output_path = os.path.abspath(path) if absoloute else path
+            _export_delta([user], output_path, f"{output_path}.state.json",
+                          f"{output_path}.manifest.json", format="csv")
+            return
+        _export_csv(user, format, path, absoloute)
+
+def _export_csv(user: User, format: str, path: str, absoloute: bool) -> None:
     if format != "csv":
         raise ValueError(f"Unsupported format: {format}")
 
@@ -88,40 +314,60 @@ def export_schedule(
 
     with open(output_path, mode='w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
-        writer.writerow([
-            "Session", 
-            "Start Date", 
-            "Courses", 
-            "Intent Courses", 
-            "Total CH", 
-            "Total Cost", 
-            "User Cost",
-            "Grants Applied",
-            "GIB Benefits Applied",
-            "GI Bill Benefits Remaining"
-        ])
+        writer.writerow(EXPORT_COLUMNS)
 
         for session in user.schedule:
-            session_num = session.num
-            course_ids = ', '.join(course.course_id for course in session.courses)
-            intent_ids = ', '.join(course.course_id for course in session.intent)
-            start_date = session.start_date.isoformat() if hasattr(session.start_date, 'isoformat') else session.start_date
-            total_ch = session.tot_ch
-            total_cost = round(session.tot_cost)
-            user_cost = round(session.adj_cost)
-            grants_applied = round(session.grants_applied)
-            gib_applied = round(session.gib_applied)
-            gib_remaining = round(session.gib_remaining)
-
-            writer.writerow([
-                session_num,
-                start_date,
-                course_ids,
-                intent_ids,
-                total_ch,
-                total_cost,
-                user_cost,
-                grants_applied,
-                gib_applied,
-                gib_remaining
-            ])
+            writer.writerow(session_row(session))
+
+def export_batch(
+    users: Iterable[User],
+    format: str = "ndjson",
+    path: str = "schedules.ndjson",
+    absoloute: bool = False,
+    batch_rows: int = 10_000
+) -> int:
+    """
+    Export many scheduled users into one file, streaming. Memory stays bounded by
+    `batch_rows`, so `users` can be a generator over a whole cohort.
+
+    Args:
+        users (Iterable[User]): Scheduled users.
+        format (str): "ndjson", "csv" (combined, with a `User ID` column), "parquet" or
+            "arrow". Parquet/Arrow require pyarrow.
+        path (str): Output path.
+        absoloute (bool): Convert `path` to an absolute path.
+        batch_rows (int): Session rows per buffered write.
+
+    Returns:
+        int: Session rows written.
+    """
+    return export_users(users, path, format=format, batch_rows=batch_rows, absoloute=absoloute)
+
+
+def export_delta(
+    users: Iterable[User],
+    path: str,
+    state_path: str,
+    manifest_path: Optional[str] = None,
+    format: str = "ndjson",
+    complete: bool = False,
+) -> dict:
+    """
+    Export only the session rows that changed since the previous run, plus a manifest.
+    Rows are compared by per-session content hashes kept in `state_path`, so output
+    size follows the number of changed sessions, not the cohort size.
+
+    Args:
+        users (Iterable[User]): Scheduled users. Consumed lazily.
+        path (str): Delta output (insert/update/delete rows).
+        state_path (str): Hashes of the previous run, updated after the delta is written.
+            Missing on the first run (every session is an insert). Use
+            src.export.state_from_csv to start from an existing full CSV.
+        manifest_path (str, optional): Manifest JSON with per-operation counts.
+        format (str): "ndjson" or "csv".
+        complete (bool): `users` is the whole cohort; users left out are deleted.
+
+    Returns:
+        dict: The manifest.
+    """
+    return _export_delta(users, path, state_path, manifest_path, format, complete)
@@ -4,6 +4,7 @@ from typing import Any, Optional
 import datetime as dt
 from src.scheduling import Course
 from shortuuid import ShortUUID
+from src.telemetry import RunProfile
 
 
 
@@ -12,7 +13,8 @@ def create_new_user(
     user_id: Optional[Any] = None,
     courses: Optional[list[Course]] = None,
     grant_amnt_per_ses: Optional[int | float] = 0,
-    gib: Optional[GIB] = None
+    gib: Optional[GIB] = None,
+    profile: Optional[RunProfile] = None
 ) -> User:
     """
     Creates and returns a fully initialized User instance with optional courses, grants, and GI Bill benefits.
@@ -24,6 +26,7 @@ def create_new_user(
         courses (list[Course], optional): All Course objects available to the user.
         grant_amnt_per_ses (int | float, optional): Dollar amount of grant funding per session.
         gib (GIB, optional): GI Bill tracking object.
+        profile (RunProfile, optional): Profile to attach; scheduling stages are timed into it.
 
     Returns:
         User: A fully validated and constructed User instance.
@@ -53,6 +56,9 @@ def create_new_user(
         if first_ses_dt is not None:
             update_gib = True
 
+    if profile is not None and not isinstance(profile, RunProfile):
+        raise TypeError("profile must be an instance of RunProfile or None.")
+
     # Defaults
     if courses is None:
         courses = []
@@ -66,7 +72,8 @@ def create_new_user(
         all_courses=courses,
         course_schedule=[],
         grants_per_ses=grant_amnt_per_ses,
-        gib=gib
+        gib=gib,
+        profile=profile
     )
 
 def modify_user(
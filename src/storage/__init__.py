@@ -0,0 +1,7 @@
+from .codec import (
+    Catalog,
+    encode_user,
+    decode_user,
+)
+from .sqlite_store import SQLiteStore
+from .columnar import ColumnarScheduleStore
@@ -0,0 +1,296 @@
+"""Compact, versioned binary encoding of a scheduled User.
+
+Layout (little-endian, version 1). Per-user data is stored column by column so each
+column is one struct call:
+
+    header      magic b"CSU", version B, flags B (bit0: has GIB, bit1: is_scheduled)
+    user        id (utf-8, len-prefixed), first_ses_dt ordinal I (0 = None), grants d
+    courses     count I, then columns: catalog index, status B, intent flags B,
+                session h (-1 = None), priority h, dependent_count h
+    sessions    unique Session objects (a Session may sit in both free_sessions and
+                schedule): count I, then columns: num h, level b (-1 = None),
+                start ordinal I, length in days H, month B, grants d, GIB applied d,
+                GIB remaining d, course count, intent count; then flat course refs
+    lists       schedule, free_sessions, completed_sessions as session refs;
+                assigned_courses as course refs
+    gib         yearly amount d, benefit start I, active year start I,
+                remaining days i, as-of I, benefit years (start I, end I, amount d),
+                charged session numbers i
+
+Courses are referenced by index into a shared Catalog, so static course data (id,
+credit hours, level, prereqs, capstone) is never written per user. Derived values
+(Course.cost, Session totals) are recomputed on load.
+"""
+from typing import Sequence
+import struct
+
+from src.scheduling import Course, Session
+from src.user import User, GIB
+
+MAGIC = b"CSU"
+VERSION = 1
+
+_HEADER = struct.Struct("<3sBB")
+_USER = struct.Struct("<IdH")   # first_ses ordinal, grants, id byte length
+_COUNT = struct.Struct("<I")
+_GIB = struct.Struct("<dIIiIHH")
+
+FLAG_GIB = 1
+FLAG_SCHEDULED = 2
+TRANSFER_FLAG = 1
+CHALLENGE_FLAG = 2
+
+
+class Catalog:
+    """Static course data shared by every encoded user. Courses are referenced by their
+    position here, so encoder and decoder must use the same catalog order.
+    """
+    def __init__(self, courses: Sequence[Course]):
+        self.courses = list(courses)
+        self.index = {c.course_id: i for i, c in enumerate(self.courses)}
+        # Per-course attribute templates; decode copies these instead of re-running
+        # Course.__post_init__ for every user
+        self.templates = [dict(vars(c)) for c in self.courses]
+        # Narrowest index type that fits the catalog
+        self.idx_fmt = "H" if len(self.courses) < 1 << 16 else "I"
+
+    def __len__(self):
+        return len(self.courses)
+
+
+def _ref_fmt(n: int) -> str:
+    return "B" if n < 1 << 8 else "H" if n < 1 << 16 else "I"
+
+
+def _pack(buf: bytearray, fmt: str, vals) -> None:
+    buf += struct.pack(f"<{len(vals)}{fmt}", *vals)
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def take(self, fmt: str, n: int) -> tuple:
+        s = struct.Struct(f"<{n}{fmt}")
+        vals = s.unpack_from(self.data, self.pos)
+        self.pos += s.size
+        return vals
+
+    def take_struct(self, s: struct.Struct) -> tuple:
+        vals = s.unpack_from(self.data, self.pos)
+        self.pos += s.size
+        return vals
+
+    def take_bytes(self, n: int) -> bytes:
+        out = bytes(self.data[self.pos:self.pos + n])
+        self.pos += n
+        return out
+
+
+def encode_user(user: User, catalog: Catalog) -> bytes:
+    """
+    Encode a User to compact bytes. Lossless for scheduling state; `profile` is not kept.
+
+    Args:
+        user (User): User to encode.
+        catalog (Catalog): Catalog holding every course in `user.courses`.
+
+    Returns:
+        bytes: Encoded user.
+
+    Raises:
+        KeyError: If a course is not in the catalog.
+        ValueError: If a session holds a course that is not in `user.courses`.
+    """
+    flags = (FLAG_GIB if user.gib else 0) | (FLAG_SCHEDULED if user.is_scheduled else 0)
+    buf = bytearray(_HEADER.pack(MAGIC, VERSION, flags))
+
+    uid = str(user.id_).encode()
+    first_ord = user.first_ses_dt.toordinal() if user.first_ses_dt else 0
+    buf += _USER.pack(first_ord, float(user.grants or 0), len(uid))
+    buf += uid
+
+    # Courses
+    courses = user.courses
+    n = len(courses)
+    buf += _COUNT.pack(n)
+    _pack(buf, catalog.idx_fmt, [catalog.index[c.course_id] for c in courses])
+    _pack(buf, "B", [int(c.status) for c in courses])
+    _pack(buf, "B", [(TRANSFER_FLAG if c.transfer_intent else 0) | (CHALLENGE_FLAG if c.challenge_intent else 0)
+                     for c in courses])
+    _pack(buf, "h", [c.session if isinstance(c.session, int) else -1 for c in courses])
+    _pack(buf, "h", [int(c.priority) for c in courses])
+    _pack(buf, "h", [int(c.dependent_count) for c in courses])
+
+    course_ref = {id(c): i for i, c in enumerate(courses)}
+
+    def cref(c):
+        try:
+            return course_ref[id(c)]
+        except KeyError:
+            raise ValueError(f"Course not in user.courses: {c.course_id}") from None
+
+    # Unique sessions, in first-seen order
+    sessions, ses_ref = [], {}
+    for lst in (user.schedule, user.free_sessions, user.completed_sessions):
+        for s in lst:
+            if id(s) not in ses_ref:
+                ses_ref[id(s)] = len(sessions)
+                sessions.append(s)
+
+    m = len(sessions)
+    rf = _ref_fmt(n)
+    buf += _COUNT.pack(m)
+    _pack(buf, "h", [s.num for s in sessions])
+    _pack(buf, "b", [-1 if s.level is None else int(s.level) for s in sessions])
+    _pack(buf, "I", [s.start_date.toordinal() for s in sessions])
+    _pack(buf, "H", [(s.end_date - s.start_date).days for s in sessions])
+    _pack(buf, "B", [s._month for s in sessions])
+    _pack(buf, "d", [float(s.grants_applied) for s in sessions])
+    _pack(buf, "d", [float(s.gib_applied) for s in sessions])
+    _pack(buf, "d", [float(s.gib_remaining) for s in sessions])
+    _pack(buf, "H", [len(s.courses) for s in sessions])
+    _pack(buf, "H", [len(s.intent) for s in sessions])
+    _pack(buf, rf, [cref(c) for s in sessions for c in s.courses])
+    _pack(buf, rf, [cref(c) for s in sessions for c in s.intent])
+
+    # Lists
+    sf = _ref_fmt(m)
+    for lst in (user.schedule, user.free_sessions, user.completed_sessions):
+        buf += _COUNT.pack(len(lst))
+        _pack(buf, sf, [ses_ref[id(s)] for s in lst])
+    buf += _COUNT.pack(len(user.assigned_courses))
+    _pack(buf, rf, [cref(c) for c in user.assigned_courses])
+
+    # GI Bill
+    if user.gib:
+        g = user.gib
+        years = list(g.benefit_years.values())
+        buf += _GIB.pack(
+            float(g.yearly_amount),
+            g.benefit_start.toordinal(),
+            g.active_benefit_year.st.toordinal(),
+            int(g.remaining_days),
+            g.asof.toordinal(),
+            len(years),
+            len(g.charged_sessions),
+        )
+        _pack(buf, "I", [by.st.toordinal() for by in years])
+        _pack(buf, "I", [by.end.toordinal() for by in years])
+        _pack(buf, "d", [float(by.amount) for by in years])
+        _pack(buf, "i", [int(x) for x in g.charged_sessions])
+
+    return bytes(buf)
+
+
+def decode_user(data: bytes, catalog: Catalog) -> User:
+    """
+    Decode bytes from encode_user back into a User, with fresh Course, Session and GIB
+    objects. Object sharing (same Course in a session and user.courses, same Session
+    in free_sessions and schedule) is restored.
+
+    Raises:
+        ValueError: On bad magic or an unsupported version.
+    """
+    r = _Reader(data)
+    magic, version, flags = r.take_struct(_HEADER)
+    if magic != MAGIC:
+        raise ValueError(f"Not an encoded user: {magic!r}")
+    if version != VERSION:
+        raise ValueError(f"Unsupported user encoding version: {version}")
+
+    first_ord, grants, uid_len = r.take_struct(_USER)
+    uid = r.take_bytes(uid_len).decode()
+
+    # Courses
+    (n,) = r.take_struct(_COUNT)
+    idxs = r.take(catalog.idx_fmt, n)
+    statuses = r.take("B", n)
+    intents = r.take("B", n)
+    ses_nums = r.take("h", n)
+    priorities = r.take("h", n)
+    dep_counts = r.take("h", n)
+
+    # Static fields (and the derived cost) come from the catalog prototype's state
+    courses = []
+    new = Course.__new__
+    for idx, status, intent, ses, prio, deps in zip(idxs, statuses, intents, ses_nums, priorities, dep_counts):
+        c = new(Course)
+        d = catalog.templates[idx].copy()
+        d["status"] = status
+        d["session"] = None if ses == -1 else ses
+        d["transfer_intent"] = bool(intent & TRANSFER_FLAG)
+        d["challenge_intent"] = bool(intent & CHALLENGE_FLAG)
+        d["priority"] = prio
+        d["dependent_count"] = deps
+        c.__dict__ = d
+        courses.append(c)
+
+    # Sessions
+    (m,) = r.take_struct(_COUNT)
+    rf = _ref_fmt(n)
+    nums = r.take("h", m)
+    levels = r.take("b", m)
+    starts = r.take("I", m)
+    lengths = r.take("H", m)
+    months = r.take("B", m)
+    grants_applied = r.take("d", m)
+    gib_applied = r.take("d", m)
+    gib_remaining = r.take("d", m)
+    n_courses = r.take("H", m)
+    n_intent = r.take("H", m)
+    course_refs = r.take(rf, sum(n_courses))
+    intent_refs = r.take(rf, sum(n_intent))
+
+    sessions = []
+    ci = ii = 0
+    for j in range(m):
+        s = Session.__new__(Session)
+        ses_courses = [courses[k] for k in course_refs[ci:ci + n_courses[j]]]
+        ses_intent = [courses[k] for k in intent_refs[ii:ii + n_intent[j]]]
+        ci += n_courses[j]
+        ii += n_intent[j]
+        s.__setstate__((
+            nums[j],
+            None if levels[j] == -1 else levels[j],
+            ses_courses,
+            ses_intent,
+            grants_applied[j],
+            gib_applied[j],
+            gib_remaining[j],
+            starts[j],
+            starts[j] + lengths[j],
+            months[j],
+        ))
+        sessions.append(s)
+
+    # Lists
+    sf = _ref_fmt(m)
+    lists = []
+    for _ in range(3):
+        (k,) = r.take_struct(_COUNT)
+        lists.append([sessions[x] for x in r.take(sf, k)])
+    (k,) = r.take_struct(_COUNT)
+    assigned = [courses[x] for x in r.take(rf, k)]
+
+    # GI Bill
+    gib = None
+    if flags & FLAG_GIB:
+        yearly, start_ord, active_ord, remaining, asof_ord, n_years, n_charged = r.take_struct(_GIB)
+        sts = r.take("I", n_years)
+        ends = r.take("I", n_years)
+        amounts = r.take("d", n_years)
+        charged = r.take("i", n_charged)
+        gib = GIB.__new__(GIB)
+        gib.__setstate__((
+            yearly, start_ord, active_ord, tuple(zip(sts, ends, amounts)),
+            remaining, asof_ord, list(charged),
+        ))
+
+    user = User.__new__(User)
+    user.__setstate__((
+        uid, first_ord, courses, lists[0], grants, gib, bool(flags & FLAG_SCHEDULED),
+        lists[1], assigned, lists[2],
+    ))
+    return user
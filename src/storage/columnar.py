@@ -0,0 +1,305 @@
+"""Append-only columnar store for generated schedules, read back with numpy.memmap.
+
+A store is a directory of raw little-endian column files plus two text files:
+
+    users.txt           One user id per line, in append order (row i = user index i)
+    courses.txt         Course vocabulary, one course id per line (row i = course index i)
+    user_ses_off.bin    int64, first session row of each user
+    user_ses_count.bin  int32, sessions in each user's schedule
+    ses_*.bin           One fixed-width column per session field (SESSION_COLUMNS)
+    course_idx.bin      int32, flat course indices. A session's courses are
+                        course_idx[ses_course_off : +ses_n_courses], followed by its
+                        intent courses (ses_n_intent).
+
+Only `User.schedule` is stored (sorted by session number, like export_schedule).
+Rows are never rewritten: appending a user id again adds a new plan and the id
+index points at the latest one. User files are written after the session and
+course files for each batch; reopening a store truncates any half-written batch.
+"""
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+import os
+
+import numpy as np
+
+# Session column -> dtype
+SESSION_COLUMNS = {
+    "user": np.int32,           # user index
+    "num": np.int16,
+    "start_ord": np.int32,      # start_date.toordinal()
+    "level": np.int8,           # -1 if unset
+    "course_off": np.int64,     # into course_idx
+    "n_courses": np.int16,
+    "n_intent": np.int16,
+    "total_ch": np.int16,
+    "total_cost": np.float64,
+    "user_cost": np.float64,
+    "grants_applied": np.float64,
+    "gib_applied": np.float64,
+    "gib_remaining": np.float64,
+}
+USER_COLUMNS = {
+    "ses_off": np.int64,
+    "ses_count": np.int32,
+}
+
+
+def _memmap(path: Path, dtype) -> np.ndarray:
+    dtype = np.dtype(dtype).newbyteorder("<")
+    if not path.exists() or path.stat().st_size == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+class ColumnarScheduleStore:
+    """
+    Columnar, memory-mapped store of many users' schedules.
+
+    Write with append_users() (buffered, `flush_users` per write), read with
+    column()/user_plan()/scan(). Reads map the files, so scans over millions of
+    sessions never build Python objects.
+
+        with ColumnarScheduleStore("plans/") as store:
+            store.append_users(users)
+            costs = store.column("user_cost")
+            plan = store.user_plan("User1")
+    """
+    def __init__(self, path: str, flush_users: int = 10_000):
+        assert flush_users > 0, f"flush_users must be positive: {flush_users}"
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.flush_users = flush_users
+
+        self._user_ids: list[str] = self._read_lines("users.txt")
+        self._vocab: list[str] = self._read_lines("courses.txt")
+        self._vocab_index = {c: i for i, c in enumerate(self._vocab)}
+        self._id_index: Optional[dict] = None
+
+        self._n_sessions = 0
+        self._n_course_idx = 0
+        self._recover()
+
+        self._pending: list = []
+        self._maps: dict[str, np.ndarray] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._user_ids) + len(self._pending)
+
+    def _file(self, name: str) -> Path:
+        return self.path / f"{name}.bin"
+
+    def _read_lines(self, name: str) -> list[str]:
+        p = self.path / name
+        if not p.exists():
+            return []
+        return p.read_text(encoding="utf-8").splitlines()
+
+    def _rows_on_disk(self, name: str, dtype) -> int:
+        f = self._file(name)
+        return f.stat().st_size // np.dtype(dtype).itemsize if f.exists() else 0
+
+    def _recover(self) -> None:
+        """Find the last fully written batch and truncate anything after it."""
+        n_users = min(
+            len(self._user_ids),
+            self._rows_on_disk("user_ses_off", USER_COLUMNS["ses_off"]),
+            self._rows_on_disk("user_ses_count", USER_COLUMNS["ses_count"]),
+        )
+        self._user_ids = self._user_ids[:n_users]
+        if n_users:
+            off = _memmap(self._file("user_ses_off"), USER_COLUMNS["ses_off"])
+            cnt = _memmap(self._file("user_ses_count"), USER_COLUMNS["ses_count"])
+            self._n_sessions = int(off[n_users - 1] + cnt[n_users - 1])
+        if self._n_sessions:
+            i = self._n_sessions - 1
+            c_off = _memmap(self._file("ses_course_off"), SESSION_COLUMNS["course_off"])
+            n = _memmap(self._file("ses_n_courses"), SESSION_COLUMNS["n_courses"])
+            k = _memmap(self._file("ses_n_intent"), SESSION_COLUMNS["n_intent"])
+            self._n_course_idx = int(c_off[i] + n[i] + k[i])
+
+        sizes = {f"ses_{name}": (self._n_sessions, dtype) for name, dtype in SESSION_COLUMNS.items()}
+        sizes["course_idx"] = (self._n_course_idx, np.int32)
+        sizes.update({f"user_{name}": (n_users, dtype) for name, dtype in USER_COLUMNS.items()})
+        for name, (rows, dtype) in sizes.items():
+            f = self._file(name)
+            nbytes = rows * np.dtype(dtype).itemsize
+            if f.exists() and f.stat().st_size > nbytes:
+                os.truncate(f, nbytes)
+        if len(self._read_lines("users.txt")) > n_users:
+            (self.path / "users.txt").write_text("".join(i + "\n" for i in self._user_ids), encoding="utf-8")
+
+    # region Write
+    def append_user(self, user) -> None:
+        self.append_users([user])
+
+    def append_users(self, users: Iterable) -> int:
+        """Buffer users and write every `flush_users`. Returns users appended."""
+        count = 0
+        for user in users:
+            self._pending.append(user)
+            count += 1
+            if len(self._pending) >= self.flush_users:
+                self.flush()
+        return count
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        users, self._pending = self._pending, []
+
+        cols = {k: [] for k in SESSION_COLUMNS}
+        course_idx: list[int] = []
+        ses_off, ses_count, new_vocab = [], [], []
+        vocab = self._vocab_index
+        n_ses = self._n_sessions
+        n_crs = self._n_course_idx
+        first_user = len(self._user_ids)
+
+        def cidx(course_id: str) -> int:
+            i = vocab.get(course_id)
+            if i is None:
+                i = vocab[course_id] = len(vocab)
+                new_vocab.append(course_id)
+            return i
+
+        for u_i, user in enumerate(users, start=first_user):
+            sched = sorted(user.schedule)
+            ses_off.append(n_ses)
+            ses_count.append(len(sched))
+            for s in sched:
+                cols["user"].append(u_i)
+                cols["num"].append(s.num)
+                cols["start_ord"].append(s.start_date.toordinal())
+                cols["level"].append(-1 if s.level is None else int(s.level))
+                cols["course_off"].append(n_crs)
+                cols["n_courses"].append(len(s.courses))
+                cols["n_intent"].append(len(s.intent))
+                cols["total_ch"].append(s.tot_ch)
+                cols["total_cost"].append(s.tot_cost)
+                cols["user_cost"].append(s.adj_cost)
+                cols["grants_applied"].append(s.grants_applied)
+                cols["gib_applied"].append(s.gib_applied)
+                cols["gib_remaining"].append(s.gib_remaining)
+                for c in s.courses:
+                    course_idx.append(cidx(c.course_id))
+                for c in s.intent:
+                    course_idx.append(cidx(c.course_id))
+                n_crs += len(s.courses) + len(s.intent)
+                n_ses += 1
+
+        # Data first, then vocab, then the user rows that make it visible
+        for name, dtype in SESSION_COLUMNS.items():
+            self._append(f"ses_{name}", np.asarray(cols[name], dtype=dtype))
+        self._append("course_idx", np.asarray(course_idx, dtype=np.int32))
+        if new_vocab:
+            with open(self.path / "courses.txt", "a", encoding="utf-8") as f:
+                f.write("".join(c + "\n" for c in new_vocab))
+            self._vocab.extend(new_vocab)
+        self._append("user_ses_off", np.asarray(ses_off, dtype=USER_COLUMNS["ses_off"]))
+        self._append("user_ses_count", np.asarray(ses_count, dtype=USER_COLUMNS["ses_count"]))
+        ids = [str(u.id_) for u in users]
+        with open(self.path / "users.txt", "a", encoding="utf-8") as f:
+            f.write("".join(i + "\n" for i in ids))
+
+        self._user_ids.extend(ids)
+        if self._id_index is not None:
+            for i, uid in enumerate(ids, start=first_user):
+                self._id_index[uid] = i
+        self._n_sessions = n_ses
+        self._n_course_idx = n_crs
+        self._maps.clear()
+
+    def _append(self, name: str, arr: np.ndarray) -> None:
+        with open(self._file(name), "ab") as f:
+            f.write(arr.astype(arr.dtype.newbyteorder("<"), copy=False).tobytes())
+
+    def close(self) -> None:
+        self.flush()
+        self._maps.clear()
+    # endregion
+
+    # region Read
+    @property
+    def user_ids(self) -> list[str]:
+        return self._user_ids
+
+    @property
+    def vocab(self) -> list[str]:
+        """Course ids by course index."""
+        return self._vocab
+
+    @property
+    def n_sessions(self) -> int:
+        return self._n_sessions
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Memory-mapped column, trimmed to committed rows. Session columns are named as
+        in SESSION_COLUMNS; also "course_idx", "user_ses_off", "user_ses_count".
+        """
+        arr = self._maps.get(name)
+        if arr is None:
+            if name in SESSION_COLUMNS:
+                arr = _memmap(self._file(f"ses_{name}"), SESSION_COLUMNS[name])[:self._n_sessions]
+            elif name == "course_idx":
+                arr = _memmap(self._file(name), np.int32)[:self._n_course_idx]
+            elif name in ("user_ses_off", "user_ses_count"):
+                arr = _memmap(self._file(name), USER_COLUMNS[name[5:]])[:len(self._user_ids)]
+            else:
+                raise KeyError(f"Unknown column: {name}")
+            self._maps[name] = arr
+        return arr
+
+    def offset_of(self, user_id: Any) -> int:
+        """User index of the latest plan stored for `user_id`. Raises KeyError if absent."""
+        if self._id_index is None:
+            self._id_index = {uid: i for i, uid in enumerate(self._user_ids)}
+        return self._id_index[str(user_id)]
+
+    def user_plan(self, user_id: Any) -> dict:
+        """
+        One user's stored schedule without building Session objects.
+
+        Returns:
+            dict: Session columns (numpy slices, one entry per session), plus
+                "courses" and "intent_courses" as lists of course id lists.
+        """
+        u = self.offset_of(user_id)
+        off = int(self.column("user_ses_off")[u])
+        cnt = int(self.column("user_ses_count")[u])
+        out = {name: np.asarray(self.column(name)[off:off + cnt]) for name in SESSION_COLUMNS}
+
+        flat = self.column("course_idx")
+        courses, intent = [], []
+        for c_off, n, k in zip(out["course_off"], out["n_courses"], out["n_intent"]):
+            idx = flat[c_off:c_off + n + k]
+            courses.append([self._vocab[i] for i in idx[:n]])
+            intent.append([self._vocab[i] for i in idx[n:]])
+        out["courses"] = courses
+        out["intent_courses"] = intent
+        return out
+
+    def latest_mask(self) -> np.ndarray:
+        """Bool per session row: True if it belongs to the latest plan of its user id."""
+        if self._id_index is None:
+            self._id_index = {uid: i for i, uid in enumerate(self._user_ids)}
+        latest = np.zeros(len(self._user_ids), dtype=bool)
+        latest[np.fromiter(self._id_index.values(), dtype=np.int64, count=len(self._id_index))] = True
+        return latest[self.column("user")]
+
+    def scan(self, batch_rows: int = 1_000_000, columns: Optional[list[str]] = None) -> Iterator[dict]:
+        """
+        Yield session columns in slices of `batch_rows` rows, for aggregation over
+        stores larger than RAM. Slices are views into the mapped files.
+        """
+        names = columns or list(SESSION_COLUMNS)
+        for lo in range(0, self._n_sessions, batch_rows):
+            hi = min(lo + batch_rows, self._n_sessions)
+            yield {name: self.column(name)[lo:hi] for name in names}
+    # endregion
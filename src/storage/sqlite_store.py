@@ -0,0 +1,400 @@
+"""SQLite persistence for users, their courses, schedules and GI Bill state.
+
+Schema (one row per object, dates as ISO text, column names follow main.py):
+
+    users            user_id PK, first_session_date, grant_amount_per_session,
+                     is_scheduled, assigned_courses, GI Bill scalars (NULL if none)
+    user_courses     (user_id, pos) PK -> course fields, pre_reqs in intake format
+    sessions         (user_id, ses_idx) PK -> session fields and its position in
+                     schedule / free_sessions / completed_sessions (NULL if absent)
+    session_courses  (user_id, ses_idx, intent, pos) PK -> course_pos into user_courses
+    gib_years        (user_id, start_date) PK -> end_date, amount
+
+Every table is keyed by user_id first (WITHOUT ROWID), so loading a batch of users
+is one range/IN scan per table. Sessions shared by schedule and free_sessions are
+stored once and shared again on load.
+"""
+from typing import Any, Iterable, Iterator, Optional
+import datetime as dt
+import sqlite3
+
+from src.intake.org import parse_prereqs, format_prereqs
+from src.scheduling import Course, Session
+from src.user import User, GIB
+
+DEFAULT_BATCH_USERS = 1_000
+# Stays under SQLite's host-parameter limit on older builds (999)
+_IN_CHUNK = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    first_session_date TEXT,
+    grant_amount_per_session REAL NOT NULL,
+    is_scheduled INTEGER NOT NULL,
+    assigned_courses TEXT NOT NULL,
+    yearly_gib_amount REAL,
+    benefit_year_start TEXT,
+    active_benefit_year TEXT,
+    benefit_days_remaining INTEGER,
+    benefits_asof TEXT,
+    gib_charged_sessions TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS user_courses (
+    user_id TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    course_id TEXT NOT NULL,
+    credit_hours INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    pre_reqs TEXT NOT NULL,
+    dependent_count INTEGER NOT NULL,
+    capstone INTEGER NOT NULL,
+    session INTEGER,
+    transfer_intent INTEGER NOT NULL,
+    challenge_intent INTEGER NOT NULL,
+    priority INTEGER NOT NULL,
+    PRIMARY KEY (user_id, pos)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_user_courses_course ON user_courses (course_id, status);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    user_id TEXT NOT NULL,
+    ses_idx INTEGER NOT NULL,
+    num INTEGER NOT NULL,
+    level INTEGER,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    month INTEGER NOT NULL,
+    grants_applied REAL NOT NULL,
+    gib_applied REAL NOT NULL,
+    gib_remaining REAL NOT NULL,
+    schedule_pos INTEGER,
+    free_pos INTEGER,
+    completed_pos INTEGER,
+    PRIMARY KEY (user_id, ses_idx)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions (start_date);
+
+CREATE TABLE IF NOT EXISTS session_courses (
+    user_id TEXT NOT NULL,
+    ses_idx INTEGER NOT NULL,
+    intent INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    course_pos INTEGER NOT NULL,
+    course_id TEXT NOT NULL,
+    PRIMARY KEY (user_id, ses_idx, intent, pos)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_session_courses_course ON session_courses (course_id);
+
+CREATE TABLE IF NOT EXISTS gib_years (
+    user_id TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    amount REAL NOT NULL,
+    PRIMARY KEY (user_id, start_date)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_USER = """
+INSERT INTO users VALUES (?,?,?,?,?,?,?,?,?,?,?)
+ON CONFLICT (user_id) DO UPDATE SET
+    first_session_date = excluded.first_session_date,
+    grant_amount_per_session = excluded.grant_amount_per_session,
+    is_scheduled = excluded.is_scheduled,
+    assigned_courses = excluded.assigned_courses,
+    yearly_gib_amount = excluded.yearly_gib_amount,
+    benefit_year_start = excluded.benefit_year_start,
+    active_benefit_year = excluded.active_benefit_year,
+    benefit_days_remaining = excluded.benefit_days_remaining,
+    benefits_asof = excluded.benefits_asof,
+    gib_charged_sessions = excluded.gib_charged_sessions
+"""
+_CHILD_TABLES = ("user_courses", "sessions", "session_courses", "gib_years")
+
+
+def _iso(d: Optional[dt.date]) -> Optional[str]:
+    return d.isoformat() if d else None
+
+
+def _date(s: Optional[str]) -> Optional[dt.date]:
+    return dt.date.fromisoformat(s) if s else None
+
+
+def _ints(s: str) -> list[int]:
+    return [int(x) for x in s.split(",")] if s else []
+
+
+def _chunks(seq: list, size: int) -> Iterator[list]:
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+class SQLiteStore:
+    """
+    Persists Users to one SQLite file.
+
+    Saves are batched: `batch_users` users per transaction, each table written with
+    one executemany. Re-saving a user replaces its rows (upsert on users; child rows
+    are deleted and re-inserted so removed sessions/courses do not linger).
+
+    Loaded users are equal to the saved ones in scheduling state; `profile` is not
+    stored. User ids are stored and returned as str.
+
+        with SQLiteStore("schedules.db") as store:
+            store.save_users(users)
+            user = store.load_user("User1")
+    """
+    def __init__(self, path: str = ":memory:", batch_users: int = DEFAULT_BATCH_USERS):
+        assert batch_users > 0, f"batch_users must be positive: {batch_users}"
+        self.path = path
+        self.batch_users = batch_users
+        # Autocommit mode: transactions are opened explicitly around each batch
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # region Save
+    def save_user(self, user: User) -> None:
+        self.save_users([user])
+
+    def save_users(self, users: Iterable[User]) -> int:
+        """
+        Upsert users in batches of `batch_users`, one transaction per batch.
+
+        Returns:
+            int: Users saved.
+        """
+        total, batch = 0, []
+        for user in users:
+            batch.append(user)
+            if len(batch) >= self.batch_users:
+                total += self._save_batch(batch)
+                batch = []
+        if batch:
+            total += self._save_batch(batch)
+        return total
+
+    def _save_batch(self, users: list[User]) -> int:
+        user_rows, course_rows, ses_rows, ses_course_rows, year_rows = [], [], [], [], []
+        # Users loaded from one catalog share pre_reqs lists; format each once per batch
+        prereq_text = {}
+        for u in users:
+            self._user_rows(u, user_rows, course_rows, ses_rows, ses_course_rows, year_rows, prereq_text)
+
+        ids = [(r[0],) for r in user_rows]
+        cur = self.conn.cursor()
+        cur.execute("BEGIN")
+        try:
+            for table in _CHILD_TABLES:
+                cur.executemany(f"DELETE FROM {table} WHERE user_id = ?", ids)
+            cur.executemany(_UPSERT_USER, user_rows)
+            cur.executemany("INSERT INTO user_courses VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)", course_rows)
+            cur.executemany("INSERT INTO sessions VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)", ses_rows)
+            cur.executemany("INSERT INTO session_courses VALUES (?,?,?,?,?,?)", ses_course_rows)
+            cur.executemany("INSERT INTO gib_years VALUES (?,?,?,?)", year_rows)
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        return len(users)
+
+    @staticmethod
+    def _user_rows(u: User, user_rows, course_rows, ses_rows, ses_course_rows, year_rows,
+                   prereq_text: dict) -> None:
+        uid = str(u.id_)
+        course_pos = {id(c): i for i, c in enumerate(u.courses)}
+        for i, c in enumerate(u.courses):
+            pre = prereq_text.get(id(c.pre_reqs))
+            if pre is None:
+                pre = prereq_text[id(c.pre_reqs)] = format_prereqs(c.pre_reqs)
+            course_rows.append((
+                uid, i, c.course_id, int(c.credit_hours), int(c.status), int(c.level),
+                pre, int(c.dependent_count), int(bool(c.capstone)),
+                c.session if isinstance(c.session, int) else None,
+                int(bool(c.transfer_intent)), int(bool(c.challenge_intent)), int(c.priority),
+            ))
+
+        # Unique sessions and their position in each list
+        sessions, ses_idx, positions = [], {}, {}
+        for slot, lst in enumerate((u.schedule, u.free_sessions, u.completed_sessions)):
+            for pos, s in enumerate(lst):
+                if id(s) not in ses_idx:
+                    ses_idx[id(s)] = len(sessions)
+                    sessions.append(s)
+                    positions[id(s)] = [None, None, None]
+                if positions[id(s)][slot] is not None:
+                    raise ValueError(f"User {uid}: session {s.num} appears twice in one list")
+                positions[id(s)][slot] = pos
+
+        for j, s in enumerate(sessions):
+            sp, fp, cp = positions[id(s)]
+            ses_rows.append((
+                uid, j, s.num, None if s.level is None else int(s.level),
+                s.start_date.isoformat(), s.end_date.isoformat(), s._month,
+                float(s.grants_applied), float(s.gib_applied), float(s.gib_remaining),
+                sp, fp, cp,
+            ))
+            for intent, lst in ((0, s.courses), (1, s.intent)):
+                for pos, c in enumerate(lst):
+                    ses_course_rows.append((uid, j, intent, pos, course_pos[id(c)], c.course_id))
+
+        g = u.gib
+        if g:
+            gib_cols = (
+                float(g.yearly_amount), g.benefit_start.isoformat(),
+                g.active_benefit_year.st.isoformat(), int(g.remaining_days), g.asof.isoformat(),
+                ",".join(str(int(x)) for x in g.charged_sessions),
+            )
+            for by in g.benefit_years.values():
+                year_rows.append((uid, by.st.isoformat(), by.end.isoformat(), float(by.amount)))
+        else:
+            gib_cols = (None,) * 6
+
+        user_rows.append((
+            uid, _iso(u.first_ses_dt), float(u.grants or 0), int(bool(u.is_scheduled)),
+            ",".join(str(course_pos[id(c)]) for c in u.assigned_courses),
+            *gib_cols,
+        ))
+    # endregion
+
+    # region Load
+    def load_user(self, user_id: Any) -> User:
+        return self.load_users([user_id])[0]
+
+    def load_users(self, user_ids: Iterable[Any]) -> list[User]:
+        """
+        Load users in the order given. One indexed query per table per 900 ids.
+
+        Raises:
+            KeyError: If any user id is not stored.
+        """
+        ids = [str(x) for x in user_ids]
+        found = {}
+        for chunk in _chunks(ids, _IN_CHUNK):
+            found.update(self._load_where(f"user_id IN ({','.join('?' * len(chunk))})", chunk))
+        missing = [i for i in ids if i not in found]
+        if missing:
+            raise KeyError(f"Users not found: {missing[:10]}")
+        return [found[i] for i in ids]
+
+    def iter_users(self, batch_users: Optional[int] = None) -> Iterator[User]:
+        """Yield every stored user in user_id order, `batch_users` per set of queries."""
+        size = batch_users or self.batch_users
+        last = ""
+        while True:
+            rows = self.conn.execute(
+                "SELECT user_id FROM users WHERE user_id > ? ORDER BY user_id LIMIT ?", (last, size)
+            ).fetchall()
+            if not rows:
+                return
+            lo, hi = rows[0][0], rows[-1][0]
+            batch = self._load_where("user_id BETWEEN ? AND ?", (lo, hi))
+            for (uid,) in rows:
+                yield batch[uid]
+            last = hi
+
+    def user_ids(self) -> list[str]:
+        return [r[0] for r in self.conn.execute("SELECT user_id FROM users ORDER BY user_id")]
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def delete_users(self, user_ids: Iterable[Any]) -> None:
+        ids = [(str(x),) for x in user_ids]
+        cur = self.conn.cursor()
+        cur.execute("BEGIN")
+        try:
+            for table in _CHILD_TABLES + ("users",):
+                cur.executemany(f"DELETE FROM {table} WHERE user_id = ?", ids)
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+
+    def _load_where(self, where: str, params) -> dict[str, User]:
+        q = self.conn.execute
+
+        # Courses. pre_reqs strings are parsed once per distinct value and cost (derived
+        # from level and credit hours) computed once per pair.
+        courses: dict[str, list] = {}
+        prereq_cache: dict[str, list] = {}
+        costs: dict[tuple, float] = {}
+        for (uid, _, cid, ch, status, level, pre, deps, cap, ses, tr, chal, prio) in q(
+                f"SELECT * FROM user_courses WHERE {where} ORDER BY user_id, pos", params):
+            pre_reqs = prereq_cache.get(pre)
+            if pre_reqs is None:
+                pre_reqs = prereq_cache[pre] = parse_prereqs(pre)
+            cost = costs.get((level, ch))
+            if cost is None:
+                cost = costs[level, ch] = Course(cid, ch, status, level, pre_reqs).cost
+            c = Course.__new__(Course)
+            c.__dict__ = {
+                "course_id": cid, "credit_hours": ch, "status": status, "level": level,
+                "pre_reqs": pre_reqs, "dependent_count": deps, "capstone": bool(cap),
+                "session": ses, "transfer_intent": bool(tr), "challenge_intent": bool(chal),
+                "priority": prio, "cost": cost,
+            }
+            courses.setdefault(uid, []).append(c)
+
+        ses_courses: dict[tuple, tuple[list, list]] = {}
+        for uid, j, intent, _, cpos, _ in q(
+                f"SELECT * FROM session_courses WHERE {where} ORDER BY user_id, ses_idx, intent, pos", params):
+            ses_courses.setdefault((uid, j), ([], []))[intent].append(courses[uid][cpos])
+
+        # {user_id: ([(pos, Session)] per list)}
+        lists: dict[str, tuple[list, list, list]] = {}
+        for (uid, j, num, level, start, end, month, grants, gib_applied, gib_rem,
+             sp, fp, cp) in q(f"SELECT * FROM sessions WHERE {where} ORDER BY user_id, ses_idx", params):
+            s = Session.__new__(Session)
+            crs, intent = ses_courses.get((uid, j), ([], []))
+            s.__setstate__((num, level, crs, intent, grants, gib_applied, gib_rem,
+                            dt.date.fromisoformat(start).toordinal(),
+                            dt.date.fromisoformat(end).toordinal(), month))
+            slots = lists.setdefault(uid, ([], [], []))
+            for slot, pos in enumerate((sp, fp, cp)):
+                if pos is not None:
+                    slots[slot].append((pos, s))
+
+        years: dict[str, list] = {}
+        for uid, st, end, amount in q(
+                f"SELECT * FROM gib_years WHERE {where} ORDER BY user_id, start_date", params):
+            years.setdefault(uid, []).append((dt.date.fromisoformat(st).toordinal(),
+                                              dt.date.fromisoformat(end).toordinal(), amount))
+
+        out = {}
+        for (uid, first, grants, is_sched, assigned, yearly, b_start, active, days, asof,
+             charged) in q(f"SELECT * FROM users WHERE {where}", params):
+            crs = courses.get(uid, [])
+            sched, free, done = (
+                [s for _, s in sorted(lst, key=lambda x: x[0])]
+                for lst in lists.get(uid, ([], [], []))
+            )
+            gib = None
+            if yearly is not None:
+                gib = GIB.__new__(GIB)
+                gib.__setstate__((
+                    yearly, _date(b_start).toordinal(), _date(active).toordinal(),
+                    tuple(years.get(uid, ())), days, _date(asof).toordinal(), _ints(charged),
+                ))
+            user = User.__new__(User)
+            first_dt = _date(first)
+            user.__setstate__((
+                uid, first_dt.toordinal() if first_dt else 0, crs, sched, grants, gib,
+                bool(is_sched), free, [crs[i] for i in _ints(assigned)], done,
+            ))
+            out[uid] = user
+        return out
+    # endregion
@@ -0,0 +1,9 @@
+from .profile import (
+    RunProfile,
+    Span,
+    trace_span,
+    aggregate_profiles,
+    dump_chrome_trace,
+)
+from .memory import MemoryProfile, rss_bytes, rss_peak_bytes
+from .metrics import MetricsRegistry, REGISTRY
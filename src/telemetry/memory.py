@@ -0,0 +1,140 @@
+"""Per-stage memory peaks: tracemalloc (Python allocations) and process RSS.
+
+RSS is read from /proc/self/statm and the RSS high-water mark from /proc/self/status
+(VmHWM), which is reset at each stage start through /proc/self/clear_refs. Off Linux,
+the RSS figures are None and only tracemalloc peaks are reported.
+"""
+from contextlib import contextmanager
+from typing import Optional
+import json
+import os
+import re
+import tracemalloc
+
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_HWM = re.compile(rb"VmHWM:\s+(\d+) kB")
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size, or None if /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def rss_peak_bytes() -> Optional[int]:
+    """RSS high-water mark since start (or the last reset_rss_peak), or None."""
+    try:
+        with open("/proc/self/status", "rb") as f:
+            m = _HWM.search(f.read())
+    except OSError:
+        return None
+    return int(m.group(1)) * 1024 if m else None
+
+
+def reset_rss_peak() -> bool:
+    """Reset the RSS high-water mark to the current RSS. False if not supported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class MemoryProfile:
+    """
+    Peak memory per named stage, for sizing batch workers.
+
+        mem = MemoryProfile()
+        with mem.stage("schedule"):
+            ...
+        mem.summary()   # {"schedule": {"count", "peak_traced_bytes", "peak_rss_bytes", ...}}
+
+    Stages may nest; an outer stage's peak includes its inner stages.
+
+    Args:
+        trace (bool): Track Python allocations with tracemalloc (started here if not
+            already running, stopped by close()). Slows allocation-heavy code.
+    """
+    def __init__(self, trace: bool = True):
+        self.trace = trace
+        self._started = trace and not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        self.stages: dict[str, dict] = {}
+        # Per open stage: (traced, RSS) peak seen before the last counter reset
+        self._stack: list[tuple[int, Optional[int]]] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started = False
+
+    def _peaks(self) -> tuple[int, Optional[int]]:
+        traced = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+        return traced, rss_peak_bytes()
+
+    def _reset(self) -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        reset_rss_peak()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Record the peak traced memory and peak RSS of the enclosed block under `name`."""
+        if self._stack:
+            # The counters are about to be reset: keep the enclosing stage's peak so far
+            self._stack[-1] = _max_pair(self._stack[-1], self._peaks())
+        self._stack.append((0, None))
+        self._reset()
+        rss_start = rss_bytes()
+        try:
+            yield
+        finally:
+            traced, rss = _max_pair(self._stack.pop(), self._peaks())
+            self._add(name, traced, rss, rss_start, rss_bytes())
+            if self._stack:
+                self._stack[-1] = _max_pair(self._stack[-1], (traced, rss))
+
+    def _add(self, name, traced, rss, rss_start, rss_end) -> None:
+        st = self.stages.setdefault(name, {
+            "count": 0, "peak_traced_bytes": 0, "peak_rss_bytes": None, "max_rss_growth_bytes": None,
+        })
+        st["count"] += 1
+        st["peak_traced_bytes"] = max(st["peak_traced_bytes"], traced)
+        st["peak_rss_bytes"] = _max(st["peak_rss_bytes"], rss)
+        if rss_start is not None and rss_end is not None:
+            st["max_rss_growth_bytes"] = _max(st["max_rss_growth_bytes"], rss_end - rss_start)
+
+    def summary(self) -> dict[str, dict]:
+        """{stage: {"count", "peak_traced_bytes", "peak_rss_bytes", "max_rss_growth_bytes"}}"""
+        return {name: dict(st) for name, st in self.stages.items()}
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """Dump summary() as JSON. Writes to `path` if given; always returns the JSON str."""
+        out = json.dumps(self.summary())
+        if path:
+            with open(path, mode="w", encoding="utf-8") as f:
+                f.write(out)
+        return out
+
+
+def _max(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def _max_pair(a: tuple, b: tuple) -> tuple[int, Optional[int]]:
+    return max(a[0], b[0]), _max(a[1], b[1])
@@ -0,0 +1,210 @@
+"""Counters and latency histograms, exposed as Prometheus/OpenMetrics text.
+
+    from src.telemetry import REGISTRY
+    REGISTRY.write("metrics.prom")          # or REGISTRY.serve(9108) for a local /metrics
+
+generate_schedule records into REGISTRY (or the registry passed as `metrics`) once per
+user and stage, never inside the scheduling loops:
+
+    scheduler_users_total{result}           users scheduled ("ok") or failed ("error")
+    scheduler_failures_total{category}      failures by SessErrENUM name, or exception type
+    scheduler_sessions_total                sessions in finished schedules
+    scheduler_courses_placed_total          courses placed in sessions from as_of on
+    scheduler_stage_seconds{stage}          histogram of stage durations
+
+Registries are per process. Batch workers can send snapshot() to the parent, which
+merge()s them.
+"""
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+import threading
+
+# Seconds; a scheduling stage runs from microseconds to seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+class Counter:
+    """Monotonic counter, optionally labelled. inc(**labels) takes label values by name."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), lock: Optional[threading.Lock] = None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self.values: dict[tuple, float] = {}
+        self._lock = lock or threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(labels[n] for n in self.labelnames)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self.values.get(tuple(labels[n] for n in self.labelnames), 0)
+
+    def lines(self) -> list[str]:
+        return [f"{self.name}_total{_labels(self.labelnames, k)} {_num(v)}" for k, v in sorted(self.values.items())]
+
+    def snapshot(self) -> dict:
+        return dict(self.values)
+
+    def merge(self, values: dict) -> None:
+        with self._lock:
+            for k, v in values.items():
+                self.values[k] = self.values.get(k, 0) + v
+
+
+class Histogram:
+    """Bucketed observations (cumulative buckets on output), optionally labelled."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS,
+                 lock: Optional[threading.Lock] = None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self.values: dict[tuple, list] = {}
+        self._lock = lock or threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels[n] for n in self.labelnames)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            v = self.values.get(key)
+            if v is None:
+                v = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            v[0][i] += 1
+            v[1] += value
+            v[2] += 1
+
+    def count(self, **labels) -> int:
+        v = self.values.get(tuple(labels[n] for n in self.labelnames))
+        return v[2] if v else 0
+
+    def lines(self) -> list[str]:
+        out = []
+        for key, (counts, total, n) in sorted(self.values.items()):
+            cum = 0
+            for le, c in zip(self.buckets + (float("inf"),), counts):
+                cum += c
+                le = 'le="+Inf"' if le == float("inf") else f'le="{le!r}"'
+                out.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cum}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(total)}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, key)} {n}")
+        return out
+
+    def snapshot(self) -> dict:
+        return {k: [list(c), s, n] for k, (c, s, n) in self.values.items()}
+
+    def merge(self, values: dict) -> None:
+        with self._lock:
+            for k, (counts, total, n) in values.items():
+                v = self.values.get(k)
+                if v is None:
+                    v = self.values[k] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                v[0] = [a + b for a, b in zip(v[0], counts)]
+                v[1] += total
+                v[2] += n
+
+
+class MetricsRegistry:
+    """
+    Named metrics of one process. counter()/histogram() return the existing metric if
+    the name is already registered.
+    """
+    def __init__(self):
+        self.metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str = "", labels: tuple = ()) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def histogram(self, name: str, help: str = "", labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def _get(self, cls, name, help, labels, **kw):
+        with self._lock:
+            m = self.metrics.get(name)
+            if m is None:
+                m = self.metrics[name] = cls(name, help, labels, **kw)
+            assert isinstance(m, cls), f"Metric {name} is a {m.kind}"
+            return m
+
+    def to_openmetrics(self) -> str:
+        """All metrics in OpenMetrics text format (also readable by Prometheus)."""
+        out = []
+        for name, m in sorted(self.metrics.items()):
+            out.append(f"# HELP {name} {m.help}")
+            out.append(f"# TYPE {name} {m.kind}")
+            out.extend(m.lines())
+        out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write to_openmetrics() to `path` (e.g. for the node exporter textfile collector)."""
+        with open(path, mode="w", encoding="utf-8") as f:
+            f.write(self.to_openmetrics())
+
+    def snapshot(self) -> dict:
+        """Picklable values, for merge() into another process's registry."""
+        return {name: (m.kind, m.help, m.labelnames, m.snapshot()) for name, m in self.metrics.items()}
+
+    def merge(self, snapshot: dict) -> None:
+        """Add a snapshot()'s values into this registry."""
+        for name, (kind, help, labels, values) in snapshot.items():
+            m = self.counter(name, help, labels) if kind == "counter" else self.histogram(name, help, labels)
+            m.merge(values)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.metrics.clear()
+
+    def serve(self, port: int = 9108, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serve to_openmetrics() at http://host:port/metrics from a daemon thread.
+        Call .shutdown() on the returned server to stop.
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.to_openmetrics().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+# Process-wide default registry
+REGISTRY = MetricsRegistry()
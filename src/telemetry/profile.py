@@ -0,0 +1,172 @@
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Iterable, Optional
+import json
+import math
+
+# Span names used across the pipeline. Per-level scheduling spans are suffixed
+# with the lowercase LevelENUM name, e.g. "schedule_free.undergrad".
+PIPELINE_STAGES = [
+    "fetch_data",
+    "create_courses",
+    "organize_courses",
+    "prioritize_courses",
+    "create_all_sessions",
+    "schedule_set",
+    "charge_historical",
+    "schedule_free",
+    "place_intents",
+    "export_schedule",
+]
+
+
+@dataclass
+class Span:
+    """
+    One timed pipeline stage.
+
+    Attributes:
+        name (str): Stage name (see PIPELINE_STAGES).
+        start_ns (int): perf_counter_ns() at stage start.
+        end_ns (int): perf_counter_ns() at stage end. 0 while the span is open.
+        meta (dict): Optional small, JSON-friendly annotations (level, counts...).
+    """
+    name: str
+    start_ns: int
+    end_ns: int = 0
+    meta: dict = field(default_factory=dict)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+
+class RunProfile:
+    """Collects timing spans for one run (one user). Attach to User.profile to record
+    scheduling stages; pass to intake/export services to record those as well.
+    """
+    def __init__(self, run_id=None):
+        self.run_id = run_id
+        self.spans: list[Span] = []
+        self._origin_ns = perf_counter_ns()
+
+    def __repr__(self):
+        return f"RunProfile({self.run_id}: {len(self.spans)} spans)"
+
+    @contextmanager
+    def span(self, name: str, **meta):
+        """Time the enclosed block as a span named `name`. Spans are recorded on exit,
+        including when the block raises.
+        """
+        s = Span(name, perf_counter_ns(), meta=meta)
+        try:
+            yield s
+        finally:
+            s.end_ns = perf_counter_ns()
+            self.spans.append(s)
+
+    def totals(self) -> dict[str, int]:
+        """Total nanoseconds per span name."""
+        out = {}
+        for s in self.spans:
+            out[s.name] = out.get(s.name, 0) + s.duration_ns
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "spans": [
+                {
+                    "name": s.name,
+                    "start_ns": s.start_ns - self._origin_ns,
+                    "duration_ns": s.duration_ns,
+                    "meta": s.meta,
+                }
+                for s in self.spans
+            ],
+        }
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """Dump spans as JSON. Writes to `path` if given; always returns the JSON str."""
+        out = json.dumps(self.to_dict(), default=str)
+        if path:
+            with open(path, mode="w", encoding="utf-8") as f:
+                f.write(out)
+        return out
+
+    def chrome_events(self, pid: int = 0, tid: int = 0) -> list[dict]:
+        """Spans as Chrome trace 'complete' events (timestamps in microseconds)."""
+        return [
+            {
+                "name": s.name,
+                "ph": "X",
+                "ts": (s.start_ns - self._origin_ns) / 1000,
+                "dur": s.duration_ns / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": {"run_id": str(self.run_id), **{k: str(v) for k, v in s.meta.items()}},
+            }
+            for s in self.spans
+        ]
+
+    def to_chrome_trace(self, path: Optional[str] = None) -> str:
+        """Dump spans in Chrome trace format (chrome://tracing, Perfetto)."""
+        return dump_chrome_trace([self], path)
+
+
+def trace_span(profile: Optional[RunProfile], name: str, **meta):
+    """Return `profile.span(...)`, or a no-op context if no profile is attached."""
+    if profile is None:
+        return nullcontext()
+    return profile.span(name, **meta)
+
+
+def _percentile(sorted_vals: list[int], pct: float) -> int:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(math.ceil(pct / 100 * len(sorted_vals)), 1)
+    return sorted_vals[rank - 1]
+
+
+def aggregate_profiles(
+        profiles: Iterable[RunProfile],
+        percentiles: tuple = (50, 95, 99),
+        ) -> dict[str, dict]:
+    """
+    Aggregate span durations across a batch of runs, per stage.
+
+    Spans with the same name inside one run are summed first, so a stage that
+    runs more than once per user is reported as its per-user total.
+
+    Args:
+        profiles (Iterable[RunProfile]): Profiles to aggregate.
+        percentiles (tuple, optional): Percentiles to report. Defaults to (50, 95, 99).
+
+    Returns:
+        dict: {stage: {"count": int, "total_ns": int, "p50_ns": int, ...}}
+    """
+    per_stage: dict[str, list[int]] = {}
+    for p in profiles:
+        for name, ns in p.totals().items():
+            per_stage.setdefault(name, []).append(ns)
+
+    out = {}
+    for name, vals in per_stage.items():
+        vals.sort()
+        stats = {"count": len(vals), "total_ns": sum(vals)}
+        for pct in percentiles:
+            stats[f"p{pct}_ns"] = _percentile(vals, pct)
+        out[name] = stats
+    return out
+
+
+def dump_chrome_trace(profiles: Iterable[RunProfile], path: Optional[str] = None) -> str:
+    """Dump many profiles as one Chrome trace, one row (tid) per run."""
+    events = []
+    for i, p in enumerate(profiles):
+        events.extend(p.chrome_events(pid=0, tid=i))
+    out = json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
+    if path:
+        with open(path, mode="w", encoding="utf-8") as f:
+            f.write(out)
+    return out
@@ -13,6 +13,14 @@ class BenefitYear:
     end: dt.date
     amount: float
 
+    def __reduce__(self):
+        return (_benefit_year, (self.st.toordinal(), self.end.toordinal(), self.amount))
+
+
+def _benefit_year(st_ord: int, end_ord: int, amount: float) -> BenefitYear:
+    """Unpickle helper for BenefitYear (dates stored as ordinals)."""
+    return BenefitYear(dt.date.fromordinal(st_ord), dt.date.fromordinal(end_ord), amount)
+
 
 class GIB:
     def __init__(
@@ -47,6 +55,32 @@ class GIB:
         # Track charged Sessions
         self.charged_sessions = []
 
+    # region Pickle
+    # Dates as ordinals. active_benefit_year is stored as its key, so it stays the
+    # same object as its entry in benefit_years after loading.
+    def __getstate__(self):
+        return (
+            self.yearly_amount,
+            self.benefit_start.toordinal(),
+            self.active_benefit_year.st.toordinal(),
+            tuple((by.st.toordinal(), by.end.toordinal(), by.amount) for by in self.benefit_years.values()),
+            self.remaining_days,
+            self.asof.toordinal(),
+            list(self.charged_sessions),
+        )
+
+    def __setstate__(self, state):
+        (self.yearly_amount, start_ord, active_ord, years, self.remaining_days,
+         asof_ord, self.charged_sessions) = state
+        self.benefit_start = dt.date.fromordinal(start_ord)
+        self.asof = dt.date.fromordinal(asof_ord)
+        self.benefit_years = {}
+        for st, end, amount in years:
+            by = _benefit_year(st, end, amount)
+            self.benefit_years[by.st] = by
+        self.active_benefit_year = self.benefit_years[dt.date.fromordinal(active_ord)]
+    # endregion
+
     # Must be called upon INIT and changes
     def charge_historical(self, sessions: list[Session]) -> None:
         """
@@ -124,18 +158,16 @@ class GIB:
 
         Returns:
             float: Amount the user must pay (0 if fully covered).
+                If final, (amount user must pay, amount covered).
         """
         ses_date = session.start_date
         ses_cost = session.adj_cost
 
         if not was_covered:
-            return ses_cost
+            return (ses_cost, 0) if final else ses_cost
 
         # Determine the benefit year for this session
-        year_start = dt.date(ses_date.year, self.benefit_start.month, self.benefit_start.day)
-        if ses_date < year_start:
-            year_start = year_start.replace(year=year_start.year - 1)
-
+        year_start = self.year_start_for(ses_date)
         year_end = year_start + relativedelta(years=1) - dt.timedelta(days=1)
 
         # Use working copy if not final
@@ -162,6 +194,13 @@ class GIB:
 
 
 
+    def year_start_for(self, date: dt.date) -> dt.date:
+        """Start date of the benefit year containing `date`."""
+        year_start = dt.date(date.year, self.benefit_start.month, self.benefit_start.day)
+        if date < year_start:
+            year_start = year_start.replace(year=year_start.year - 1)
+        return year_start
+
     def get_total_remaining(self, year) -> float:
         by = self.benefit_years.get(year, None)
         return by.amount if by else by
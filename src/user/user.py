@@ -13,6 +13,7 @@ class User:
         course_schedule: Optional[list[sch.Session]] = None,
         grants_per_ses: int | float = 0,
         gib: Optional[GIB] = None,
+        profile=None,
     ):
         """
         A lightweight container class for course scheduling and benefit tracking.
@@ -24,12 +25,33 @@ class User:
         self.schedule = course_schedule or []
         self.grants = grants_per_ses
         self.gib = gib
+        self.profile = profile      # Optional RunProfile; stage timings are recorded when set
 
         self.is_scheduled = False
         self.free_sessions = []
         self.assigned_courses = []
         self.completed_sessions = []
 
+    # region Pickle
+    # `profile` is run telemetry, not scheduling state; it is not pickled.
+    def __getstate__(self):
+        return (
+            self.id_,
+            self.first_ses_dt.toordinal() if self.first_ses_dt else 0,
+            self.courses,
+            self.schedule,
+            self.grants,
+            self.gib,
+            self.is_scheduled,
+            self.free_sessions,
+            self.assigned_courses,
+            self.completed_sessions,
+        )
 
-
-
+    def __setstate__(self, state):
+        (self.id_, first_ord, self.courses, self.schedule, self.grants, self.gib,
+         self.is_scheduled, self.free_sessions, self.assigned_courses,
+         self.completed_sessions) = state
+        self.first_ses_dt = dt.date.fromordinal(first_ord) if first_ord else None
+        self.profile = None
+    # endregion
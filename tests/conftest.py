@@ -0,0 +1,64 @@
+import contextlib
+import datetime as dt
+import io
+
+import pytest
+
+import src.services as ser
+
+# Scheduling is relative to "today"; tests run as of this date so they don't age out
+AS_OF = dt.date(2026, 10, 19)
+
+# main.py's restraints
+RESTRAINTS = dict(
+    inperson_courses=[], in_person_end_dt=None, min_inperson=1, max_inperson=1,
+    ses_max_cost=0.0, ses_min_class=2, ses_max_class=4, exceed_benefits=True,
+)
+
+
+class Inputs:
+    """
+    main.py's User1 setup (course_input.csv, GI Bill, grants), pinned to AS_OF.
+
+        user, restraints = inputs()                   # fresh, unscheduled
+        user = inputs.scheduled()                     # scheduled as of inputs.as_of
+        user, restraints = inputs(ses_max_class=5)    # restraint overrides
+    """
+    as_of = AS_OF
+
+    def __call__(self, courses=None, user_id="User1", **restraints):
+        with contextlib.redirect_stdout(io.StringIO()):
+            gib = ser.create_gib(27120.0, (8, 1), (23, 10), dt.date(2025, 8, 27))
+            if courses is None:
+                courses = ser.get_courses_pipeline("course_input.csv", False, [])
+            user = ser.create_new_user(dt.date(2025, 5, 1), user_id, courses, 2015.0, gib)
+        return user, ser.generate_restraints(**{**RESTRAINTS, **restraints})
+
+    def scheduled(self, spread_between=15, optimize=None, **restraints):
+        user, r = self(**restraints)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ser.generate_schedule(user, r, spread_between, optimize=optimize, as_of=self.as_of)
+        return user
+
+    @staticmethod
+    def snapshot(u) -> tuple:
+        """Everything a lossless round trip of a user must keep."""
+        def ses(s):
+            return (s.num, s.level, [c.course_id for c in s.courses], [c.course_id for c in s.intent],
+                    s.start_date, s.end_date, s._tot_ch, s._tot_cost, s._adj_cost,
+                    s._grants_applied, s._gib_applied, s.gib_remaining, s._pre_reqs)
+        g = u.gib
+        return (
+            u.id_, u.first_ses_dt, u.grants, u.is_scheduled,
+            [vars(c) for c in u.courses],
+            [ses(s) for s in u.schedule], [ses(s) for s in u.free_sessions],
+            [ses(s) for s in u.completed_sessions],
+            [c.course_id for c in u.assigned_courses],
+            (g.yearly_amount, g.benefit_start, g.active_benefit_year, g.benefit_years,
+             g.remaining_days, g.asof, g.charged_sessions),
+        )
+
+
+@pytest.fixture
+def inputs() -> Inputs:
+    return Inputs()
@@ -0,0 +1,77 @@
+import csv
+import json
+
+import pytest
+
+import src.services as ser
+from src.export import EXPORT_COLUMNS, BatchExporter, user_records
+
+
+def _users(inputs):
+    a = inputs.scheduled()
+    b = inputs.scheduled()
+    b.id_ = "User2"
+    return [a, b]
+
+
+def test_ndjson_and_csv_rows_match_per_user_export(tmp_path, inputs):
+    """One row per session for every user; CSV rows are export_schedule's rows plus User ID."""
+    users = _users(inputs)
+    expected = [rec for u in users for rec in user_records(u)]
+
+    out = tmp_path / "all.ndjson"
+    assert ser.export_batch(iter(users), "ndjson", str(out)) == len(expected)
+    assert [json.loads(line) for line in out.read_text().splitlines()] == expected
+
+    out = tmp_path / "all.csv"
+    assert ser.export_batch(users, "csv", str(out)) == len(expected)
+    with open(out, newline="") as f:
+        rows = list(csv.reader(f))
+    single = tmp_path / "user1.csv"
+    ser.export_schedule(users[0], "csv", str(single))
+    with open(single, newline="") as f:
+        per_user = list(csv.reader(f))
+
+    assert rows[0] == ["User ID"] + EXPORT_COLUMNS
+    assert len(rows) == len(expected) + 1
+    assert [r[1:] for r in rows[1:] if r[0] == "User1"] == per_user[1:]
+    assert [r[0] for r in rows[1:]] == [rec["user_id"] for rec in expected]
+
+
+def test_batches_flush_at_batch_rows(tmp_path, inputs):
+    """Rows are written batch_rows at a time; the remainder is written on close."""
+    user = inputs.scheduled()
+    n = len(user.schedule)
+    out = tmp_path / "rows.ndjson"
+
+    with BatchExporter(str(out), "ndjson", batch_rows=3) as ex:
+        ex.write_user(user)
+        assert ex.rows_written == n - n % 3
+        assert len(ex._batch) == n % 3
+        ex.write_records("Other", [])
+    assert ex.rows_written == n and ex.users_written == 2
+    assert len(out.read_text().splitlines()) == n
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    """An unknown format raises before any file is created."""
+    with pytest.raises(ValueError, match="Unsupported format"):
+        BatchExporter(str(tmp_path / "out.xml"), "xml")
+    assert not (tmp_path / "out.xml").exists()
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_columnar_formats(tmp_path, inputs, format):
+    """Parquet and Arrow IPC read back as the ndjson rows (optional pyarrow dependency)."""
+    pa = pytest.importorskip("pyarrow")
+    users = _users(inputs)
+    out = tmp_path / f"all.{format}"
+    ser.export_batch(users, format, str(out), batch_rows=4)
+
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(out)
+    else:
+        with pa.OSFile(str(out), "rb") as f:
+            table = pa.ipc.open_file(f).read_all()
+    assert table.to_pylist() == [rec for u in users for rec in user_records(u)]
@@ -0,0 +1,83 @@
+import contextlib
+import io
+
+import pandas as pd
+import pytest
+
+import src.services as ser
+
+
+def _key(c):
+    return (c.course_id, int(c.status), c.session, bool(c.transfer_intent), bool(c.challenge_intent),
+            c.priority, c.pre_reqs, bool(c.capstone), c.cost, c.credit_hours, c.level)
+
+
+def _frames() -> dict:
+    """Three students' course files: course_input.csv, one with an extra transfer intent."""
+    base = pd.read_csv("course_input.csv")
+    b = base.copy()
+    b.loc[b["Course ID"] == "SPCH275", "Transfer Intent"] = 1
+    return {"A": base, "B": b, "C": base}
+
+
+def _long(frames: dict) -> pd.DataFrame:
+    return pd.concat([df.assign(**{"User ID": uid}) for uid, df in frames.items()], ignore_index=True)
+
+
+def _expected(tmp_path, frames: dict) -> dict:
+    out = {}
+    for uid, df in frames.items():
+        path = tmp_path / f"single_{uid}.csv"
+        df.to_csv(path, index=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            out[uid] = [_key(c) for c in ser.get_courses_pipeline(str(path), True, [])]
+    return out
+
+
+@pytest.mark.parametrize("ext", [".csv", ".xlsx"])
+def test_bulk_file_matches_per_user_pipeline_across_chunks(tmp_path, ext):
+    """Users split across chunk boundaries come out whole, as the single-file pipeline builds them."""
+    frames = _frames()
+    path = tmp_path / f"bulk{ext}"
+    df = _long(frames)
+    if ext == ".csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+    expected = _expected(tmp_path, frames)
+
+    # 38 rows per user: chunks of 25 or 7 put user boundaries mid-chunk and split every user
+    for chunksize in (25, 7, len(df)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            got = [(uid, [_key(c) for c in courses])
+                   for uid, courses in ser.get_courses_bulk(str(path), True, [], chunksize=chunksize)]
+        assert [uid for uid, _ in got] == ["A", "B", "C"]
+        assert dict(got) == expected
+    assert expected["A"] != expected["B"]
+
+
+def test_bulk_file_rejects_non_contiguous_user(tmp_path):
+    """A user whose rows reappear after another user's is an error, even in a later chunk."""
+    frames = _frames()
+    df = _long(frames)
+    df = pd.concat([df, df[df["User ID"] == "A"].head(3)], ignore_index=True)
+    path = tmp_path / "bulk.csv"
+    df.to_csv(path, index=False)
+
+    with pytest.raises(ValueError, match="user A are not contiguous"), contextlib.redirect_stdout(io.StringIO()):
+        list(ser.get_courses_bulk(str(path), True, [], chunksize=25))
+
+
+def test_bulk_directory_matches_per_user_pipeline(tmp_path):
+    """A directory of per-user files yields one user per supported file, named by file stem."""
+    frames = _frames()
+    expected = _expected(tmp_path, frames)
+    students = tmp_path / "students"
+    students.mkdir()
+    for uid, df in frames.items():
+        df.to_csv(students / f"{uid}.csv", index=False)
+    (students / "notes.txt").write_text("not a course file")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        got = {uid: [_key(c) for c in courses] for uid, courses in ser.get_courses_bulk(str(students), True, [])}
+    assert got == expected
@@ -0,0 +1,74 @@
+import contextlib
+import csv
+import io
+
+import pytest
+
+import src.services as ser
+from src.export import session_record
+from src.intake import read_overlay
+
+OVERLAY_HEADER = ["Course ID", "Status", "Session", "Transfer Intent", "Challenge Intent"]
+
+
+def _write_overlay(path, rows=None):
+    """The per-student columns of course_input.csv, only for courses not in default state."""
+    if rows is None:
+        with open("course_input.csv", newline="") as f:
+            rows = [[r[h] for h in OVERLAY_HEADER] for r in csv.DictReader(f)
+                    if any(r[h] not in ("", "0") for h in OVERLAY_HEADER[1:])]
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows([OVERLAY_HEADER] + rows)
+    return str(path)
+
+
+def _key(c):
+    return (c.course_id, int(c.status), c.session, bool(c.transfer_intent), bool(c.challenge_intent),
+            c.priority, c.pre_reqs, bool(c.capstone), c.cost)
+
+
+def test_catalog_join_matches_full_pipeline_and_schedule(tmp_path, inputs):
+    """Catalog + overlay gives the same courses, and the same schedule, as the full file."""
+    overlay = _write_overlay(tmp_path / "User1.csv")
+    with contextlib.redirect_stdout(io.StringIO()):
+        full = ser.get_courses_pipeline("course_input.csv", False, [])
+        catalog = ser.get_program_catalog("course_input.csv", False, [])
+        joined = ser.get_courses_pipeline(overlay, True, catalog=catalog)
+    assert [_key(c) for c in joined] == [_key(c) for c in full]
+
+    # Courses outside the overlay are shared with the catalog, which stays "not started"
+    assert sum(a is b for a, b in zip(joined, catalog.courses)) == len(catalog) - len(read_overlay(overlay))
+    assert all(c.status == 0 and c.session is None for c in catalog.courses)
+
+    plans = []
+    for courses in (full, joined):
+        with contextlib.redirect_stdout(io.StringIO()):
+            user, restraints = inputs(courses)
+            ser.generate_schedule(user, restraints, 15, as_of=inputs.as_of)
+        plans.append([session_record(s) for s in sorted(user.schedule)])
+    assert plans[0] == plans[1]
+
+
+def test_overlay_errors_and_bulk_overlays(tmp_path):
+    """Unknown courses and bad values are rejected; bulk overlays yield one list per student."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        catalog = ser.get_program_catalog("course_input.csv", False, [])
+
+    bad = _write_overlay(tmp_path / "bad.csv", [["NOPE101", "2", "1", "", ""]])
+    with pytest.raises(ValueError, match="not in catalog"):
+        ser.get_courses_pipeline(bad, True, catalog=catalog)
+    bad = _write_overlay(tmp_path / "bad.csv", [["CEIS101", "7", "1", "", ""]])
+    with pytest.raises(ValueError, match="invalid status"):
+        ser.get_courses_pipeline(bad, True, catalog=catalog)
+
+    bulk = tmp_path / "overlays.csv"
+    with open(bulk, "w", newline="") as f:
+        csv.writer(f).writerows([["User ID"] + OVERLAY_HEADER,
+                                 ["a", "CEIS101", "2", "1", "", ""],
+                                 ["a", "SPCH275", "0", "", "1", ""],
+                                 ["b", "CEIS101", "1", "2", "", ""]])
+    users = dict(ser.get_courses_bulk(str(bulk), True, catalog=catalog))
+    assert sorted(users) == ["a", "b"]
+    by_id = {c.course_id: c for c in users["a"]}
+    assert by_id["CEIS101"].status == 2 and by_id["SPCH275"].transfer_intent
+    assert {c.course_id: c for c in users["b"]}["CEIS101"].session == 2
@@ -0,0 +1,78 @@
+import io
+import json
+
+from src.batch import CheckpointJournal
+from src.cli import main
+
+JOB = {
+    "user_id": "User1", "grant_amount_per_session": 2015.0, "first_session_date": "2025-05-01",
+    "yearly_gib_amount": 27120.0, "benefit_year_start": [8, 1], "benefits_remaining": [23, 10],
+    "benefits_asof": "2025-08-27", "ses_max_cost": 0.0, "exceed_benefits": True, "spread_between": 15,
+}
+
+
+def test_cli_streams_one_result_per_job(tmp_path, inputs):
+    """Every non-blank line gets a result; bad lines are error results, not crashes."""
+    path = tmp_path / "jobs.ndjson"
+    lines = [json.dumps(JOB), "", json.dumps({**JOB, "user_id": "User2"}), json.dumps({"bogus": 1}), "{"]
+    path.write_text("\n".join(lines) + "\n")
+
+    out = io.StringIO()
+    code = main([str(path), "--jobs", "2", "--as-of", inputs.as_of.isoformat()], stdout=out)
+    results = {r["line"]: r for r in map(json.loads, out.getvalue().splitlines())}
+
+    assert code == 1
+    assert sorted(results) == [1, 3, 4, 5]
+    assert results[1]["status"] == results[3]["status"] == "ok"
+    assert results[3]["user_id"] == "User2"
+    assert results[1]["sessions"] == results[3]["sessions"]
+    assert results[4]["error"].startswith("ValueError")
+    assert results[5]["status"] == "error"
+
+
+def test_checkpoint_resume_skips_finished_jobs(tmp_path, inputs):
+    """A rerun with the same journal only schedules jobs not recorded, even after a torn write."""
+    path, journal = tmp_path / "jobs.ndjson", tmp_path / "run.journal"
+    path.write_text("".join(json.dumps({**JOB, "user_id": f"U{i}"}) + "\n" for i in range(4)))
+    argv = [str(path), "--as-of", inputs.as_of.isoformat(), "--checkpoint", str(journal)]
+
+    main(argv, stdout=io.StringIO())
+    entries = list(CheckpointJournal.read(str(journal)))
+    assert [e["key"] for e in entries] == ["U0", "U1", "U2", "U3"]
+
+    # Crash: last record lost mid-write
+    lines = journal.read_bytes().splitlines(keepends=True)
+    journal.write_bytes(b"".join(lines[:2]) + lines[2][:20])
+
+    out = io.StringIO()
+    assert main(argv, stdout=out) == 0
+    assert [json.loads(r)["user_id"] for r in out.getvalue().splitlines()] == ["U2", "U3"]
+    assert [e["key"] for e in CheckpointJournal.read(str(journal))] == ["U0", "U1", "U2", "U3"]
+
+
+def test_shards_partition_jobs_and_merge(tmp_path, inputs):
+    """K shard runs cover every job exactly once; the merge matches an unsharded run."""
+    path = tmp_path / "jobs.ndjson"
+    path.write_text("".join(json.dumps({**JOB, "user_id": f"U{i}"}) + "\n" for i in range(12)))
+    base = [str(path), "--as-of", inputs.as_of.isoformat()]
+
+    outs = []
+    for i in range(3):
+        out = tmp_path / f"out.{i}.ndjson"
+        with open(out, "w") as f:
+            main(base + ["--shard", f"{i}/3"], stdout=f)
+        outs.append(str(out))
+    ids = [json.loads(line)["user_id"] for p in outs for line in open(p)]
+    assert sorted(ids) == sorted(f"U{i}" for i in range(12))
+
+    export, summary = tmp_path / "all.csv", tmp_path / "summary.json"
+    main(["--merge", *outs, outs[0], "--export", str(export), "--summary", str(summary)], stdout=io.StringIO())
+    merged = json.loads(summary.read_text())
+    assert merged["users"] == merged["ok"] == 12
+    assert merged["duplicates"] == len(open(outs[0]).readlines())
+
+    single = io.StringIO()
+    main(base, stdout=single)
+    results = [json.loads(line) for line in single.getvalue().splitlines()]
+    assert merged["sessions"] == sum(len(r["sessions"]) for r in results)
+    assert len(export.read_text().splitlines()) == merged["sessions"] + 1
@@ -0,0 +1,94 @@
+import contextlib
+import datetime as dt
+import io
+import pickle
+
+import src.services as ser
+from src.scheduling import Scheduler, SeatLedger
+
+
+def _cohort(n: int, min_inperson=1):
+    with contextlib.redirect_stdout(io.StringIO()):
+        courses = ser.get_courses_pipeline("course_input.csv", False, [])
+    inperson = [c.course_id for c in courses
+                if c.status == 0 and not c.capstone and not (c.transfer_intent or c.challenge_intent)][:12]
+    with contextlib.redirect_stdout(io.StringIO()):
+        courses = ser.get_courses_pipeline("course_input.csv", False, inperson)
+    data = pickle.dumps(courses)
+    users = [ser.create_new_user(dt.date(2025, 5, 1), f"U{i}", pickle.loads(data), 2015.0, None)
+             for i in range(n)]
+    restraints = ser.generate_restraints(
+        inperson_courses=inperson, in_person_end_dt=dt.date(2027, 1, 15), min_inperson=min_inperson,
+        max_inperson=min_inperson, ses_min_class=2, ses_max_class=4, exceed_benefits=True,
+    )
+    return users, restraints
+
+
+def _inperson_placed(user, restraints, as_of) -> list:
+    """In-person courses of the sessions the cohort run scheduled."""
+    return sorted((c.course_id, s.start_date, s.num) for s in user.schedule for c in s.courses
+                  if c in restraints.inperson_courses and as_of <= s.start_date <= restraints.in_person_end_dt)
+
+
+def test_cohort_respects_capacity_and_falls_back_online(inputs):
+    """No section is overbooked; students past capacity are scheduled online, not failed."""
+    users, restraints = _cohort(6)
+    with contextlib.redirect_stdout(io.StringIO()):
+        res = ser.schedule_cohort(users, restraints, default_capacity=2, spread_between=15, as_of=inputs.as_of)
+
+    seats = res["seats"]
+    assert len(res["scheduled"]) == 6 and not res["failed"]
+    assert seats.booked and max(seats.booked.values()) <= 2
+    # Ties keep input order: the first students get seats, the last hit capacity
+    assert "U0" not in seats.shortfalls and "U5" in seats.shortfalls
+
+    # Incremental: releasing one student's seats frees exactly those sections
+    held = seats.inperson_courses("U0")
+    assert seats.release_user("U0") == len(held)
+    assert all(seats.available(c, d) == 1 for c, d, _ in held)
+
+
+def test_full_sections_picked_by_the_fill_are_recorded_online(inputs):
+    """Without min_inperson, in-person courses the fill places in a full section are
+    recorded as taken online; every in-person placement is either held or online."""
+    users, restraints = _cohort(3, min_inperson=None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        res = ser.schedule_cohort(users, restraints, default_capacity=1, spread_between=15, as_of=inputs.as_of)
+
+    seats = res["seats"]
+    assert len(res["scheduled"]) == 3 and max(seats.booked.values()) == 1
+    assert "U0" not in seats.online and seats.online["U2"]
+    for user in users:
+        got = seats.inperson_courses(user.id_) + seats.online.get(user.id_, [])
+        assert sorted(got) == _inperson_placed(user, restraints, inputs.as_of)
+    seats.release_user("U2")
+    assert "U2" not in seats.online
+
+
+def test_seat_ledger_capacity_lookup():
+    """Per-session capacity overrides per-course, which overrides the default."""
+    day = dt.date(2026, 11, 2)
+    ledger = SeatLedger({("A", day): 1, "A": 5}, default_capacity=0)
+    assert ledger.capacity("A", day) == 1
+    assert ledger.capacity("A", dt.date(2027, 1, 4)) == 5
+    assert ledger.capacity("B", day) == 0
+    assert ledger.reserve("u", "A", day, 1) and not ledger.reserve("v", "A", day, 1)
+
+
+def test_one_users_crash_is_recorded_and_the_cohort_continues(inputs, monkeypatch):
+    """An invariant failure (AssertionError) for one user goes in "failed" with its seats
+    released; the users around it are still scheduled."""
+    users, restraints = _cohort(3)
+    place_intents = Scheduler._place_intents.__func__
+
+    def crash_u1(cls, user, *args):
+        assert user.id_ != "U1", "invariant"
+        return place_intents(cls, user, *args)
+
+    monkeypatch.setattr(Scheduler, "_place_intents", classmethod(crash_u1))
+    with contextlib.redirect_stdout(io.StringIO()):
+        res = ser.schedule_cohort(users, restraints, default_capacity=2, spread_between=15, as_of=inputs.as_of)
+
+    assert res["scheduled"] == ["U0", "U2"]
+    assert res["failed"]["U1"].startswith("AssertionError: invariant")
+    assert res["seats"].inperson_courses("U1") == [] and res["seats"].inperson_courses("U2")
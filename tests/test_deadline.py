@@ -0,0 +1,73 @@
+import contextlib
+import io
+import itertools
+import time
+
+import pytest
+
+import src.services as ser
+from config.course_enums import SessErrENUM
+from src.batch import SupervisedPool
+from src.scheduling import Deadline, DeadlineExceeded, OptimizeConfig
+from src.telemetry import MetricsRegistry
+
+
+def _nap(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def test_deadline_stops_inside_the_session_loop_and_is_counted(inputs):
+    """A deadline is checked per session; passing it raises TIMEOUT, cancel() raises CANCELLED."""
+    metrics = MetricsRegistry()
+    user, restraints = inputs()
+    ticks = itertools.count()           # one "second" per checkpoint
+    with pytest.raises(DeadlineExceeded) as exc, contextlib.redirect_stdout(io.StringIO()):
+        ser.generate_schedule(user, restraints, 15, as_of=inputs.as_of, metrics=metrics,
+                              deadline=Deadline(4, clock=lambda: next(ticks)))
+    assert exc.value.code is SessErrENUM.TIMEOUT
+    assert "schedule_level" in str(exc.value)
+    assert metrics.counter("scheduler_failures").get(category="TIMEOUT") == 1
+
+    deadline = Deadline()
+    deadline.cancel()
+    user, restraints = inputs()
+    with pytest.raises(DeadlineExceeded) as exc, contextlib.redirect_stdout(io.StringIO()):
+        ser.generate_schedule(user, restraints, 15, as_of=inputs.as_of, deadline=deadline)
+    assert exc.value.code is SessErrENUM.CANCELLED
+
+
+def test_deadline_ends_optimizer_search_under_max_iters(inputs):
+    """max_iters does not outlast the deadline: the search stops with the best schedule found."""
+    user, restraints = inputs()
+    start = time.monotonic()
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        ser.generate_schedule(user, restraints, 15, as_of=inputs.as_of,
+                              optimize=OptimizeConfig(max_iters=10**9, seed=0), deadline=Deadline(0.5))
+    assert time.monotonic() - start < 10
+    assert "Optimized:" in out.getvalue()
+    assert user.schedule
+
+
+def test_lost_result_is_counted():
+    """Killed and lost workers get an error result and a failure count."""
+    metrics = MetricsRegistry()
+    assert ser.lost_result("U1", "timeout", metrics) == {
+        "user_id": "U1", "status": "error", "category": "TIMEOUT",
+        "error": "DeadlineExceeded: Worker killed||timeout"}
+    assert ser.lost_result("U2", "exited", metrics)["category"] == "WorkerLost"
+    failures = metrics.counter("scheduler_failures")
+    assert failures.get(category="TIMEOUT") == 1 and failures.get(category="WorkerLost") == 1
+
+
+def test_supervised_pool_replaces_overrunning_worker():
+    """A stuck task gets the on_lost result after hard_timeout while the others finish."""
+    start = time.monotonic()
+    with contextlib.redirect_stderr(io.StringIO()), SupervisedPool(2, hard_timeout=0.5) as pool:
+        results = list(pool.imap_unordered(_nap, [0.01, 30, 0.01, 0.01, 0.01],
+                                           lambda task, reason: (task, reason)))
+        replaced = pool.replaced
+
+    assert sorted(results, key=str) == sorted([0.01] * 4 + [(30, "timeout")], key=str)
+    assert replaced == 1
+    assert time.monotonic() - start < 10
@@ -0,0 +1,53 @@
+import json
+
+import src.services as ser
+from src.export import EXPORT_COLUMNS, DeltaExporter, session_record, state_from_csv
+from src.export.delta import save_state
+
+
+def _ops(path):
+    with open(path, encoding="utf-8") as f:
+        return [(r["op"], r["user_id"], r["session"]) for r in map(json.loads, f)]
+
+
+def test_delta_writes_only_changed_sessions(tmp_path, inputs):
+    """Reruns write nothing; edits, removals and dropped users become update/delete rows."""
+    sessions = [session_record(s) for s in sorted(inputs.scheduled().schedule)]
+    state, out = str(tmp_path / "state.json"), str(tmp_path / "delta.ndjson")
+
+    with DeltaExporter(out, state) as ex:
+        ex.write_records("A", sessions)
+        ex.write_records("B", sessions)
+    assert ex.manifest["counts"]["insert"] == 2 * len(sessions)
+
+    with DeltaExporter(out, state) as ex:
+        ex.write_records("A", sessions)
+        ex.write_records("B", sessions)
+    assert ex.manifest["rows_written"] == 0 and _ops(out) == []
+
+    edited = [dict(sessions[0], user_cost=sessions[0]["user_cost"] + 1)] + sessions[1:-1]
+    manifest_path = tmp_path / "manifest.json"
+    with DeltaExporter(out, state, str(manifest_path), complete=True) as ex:
+        ex.write_records("A", edited)
+    last = str(sessions[-1]["session"])
+    assert _ops(out)[:2] == [("update", "A", sessions[0]["session"]), ("delete", "A", int(last))]
+    assert sorted(_ops(out)[2:]) == sorted(("delete", "B", s["session"]) for s in sessions)
+    manifest = json.loads(manifest_path.read_text())
+    assert manifest["counts"] == {"insert": 0, "update": 1, "delete": len(sessions) + 1,
+                                  "unchanged": len(sessions) - 2}
+    assert manifest["users_deleted"] == 1
+
+
+def test_state_from_full_csv_matches_live_sessions(tmp_path, inputs):
+    """A previous export_schedule CSV seeds the state, so an unchanged plan exports nothing."""
+    user = inputs.scheduled()
+    full, state = tmp_path / "schedule.csv", tmp_path / "schedule.csv.state.json"
+    ser.export_schedule(user, "csv", str(full))
+    save_state(str(state), state_from_csv(str(full), user.id_))
+
+    delta = full                      # the nightly run's output path stays the same
+    ser.export_schedule(user, "delta", str(delta))
+    manifest = json.loads((tmp_path / "schedule.csv.manifest.json").read_text())
+    assert manifest["rows_written"] == 0
+    assert manifest["counts"]["unchanged"] == len(user.schedule)
+    assert delta.read_text().splitlines() == ["Op,User ID,Hash," + ",".join(EXPORT_COLUMNS)]
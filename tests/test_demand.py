@@ -0,0 +1,35 @@
+from collections import Counter
+
+from src.analytics import DemandMatrix
+from src.storage import ColumnarScheduleStore
+
+
+def _naive(users) -> dict:
+    return dict(Counter((c.course_id, s.start_date) for u in users for s in u.schedule for c in s.courses))
+
+
+def _by_cell(dm: DemandMatrix) -> dict:
+    return dm.to_frame().groupby(["course_id", "start_date"])["students"].sum().to_dict()
+
+
+def test_demand_matches_naive_count_and_updates(tmp_path, inputs):
+    """Vectorized counts equal a Python count, from users and from a columnar store."""
+    a, b = inputs.scheduled(), inputs.scheduled()
+    b.id_ = "User2"
+    inperson = [a.schedule[0].courses[0].course_id]
+
+    dm = DemandMatrix.from_users([a, b], inperson)
+    assert _by_cell(dm) == _naive([a, b])
+    df = dm.to_frame()
+    assert set(df.loc[df["inperson"], "course_id"]) == set(inperson)
+
+    with ColumnarScheduleStore(str(tmp_path)) as store:
+        store.append_users([a, b])
+    assert _by_cell(DemandMatrix.from_store(ColumnarScheduleStore(str(tmp_path)), inperson)) == _naive([a, b])
+
+    # Incremental: drop one course from one user's plan
+    b.schedule[0].courses.pop()
+    dm.update_user(b)
+    assert _by_cell(dm) == _naive([a, b])
+    dm.remove_user("User1")
+    assert dm.total() == sum(len(s.courses) for s in b.schedule)
@@ -0,0 +1,52 @@
+import contextlib
+import datetime as dt
+import io
+
+import src.services as ser
+from benchmarks.synthetic import generate_catalog
+from config.course_enums import LevelENUM, StatusENUM
+from src.scheduling import Course
+from src.scheduling.estimate import critical_path
+
+
+def _course(cid, pre=()):
+    return Course(cid, 3, StatusENUM.NONE, LevelENUM.UNDERGRAD, list(pre))
+
+
+def test_critical_path_or_groups():
+    """OR groups give the shortest and longest chain; prereqs outside the set are done."""
+    cs = [_course("A"), _course("B", ["A"]), _course("C", [["B", "A"]]), _course("D", [["C", "DONE"]])]
+    assert critical_path(cs) == (2, 4)
+
+
+def test_estimate_bounds_full_schedule(inputs):
+    """The full scheduler's sessions, graduation and cost fall inside the estimate."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        user, restraints = inputs()
+        est = ser.estimate_schedule(user, restraints, as_of=inputs.as_of)
+        fast = ser.estimate_schedule(user, restraints, per_session=4, as_of=inputs.as_of)
+        ser.generate_schedule(user, restraints, 15, as_of=inputs.as_of)
+
+    future = [s for s in user.schedule if s.start_date >= inputs.as_of]
+    assert est.sessions[0] <= len(future) <= est.sessions[1]
+    assert est.graduation[0] <= max(s.end_date for s in future) <= est.graduation[1]
+    assert est.cost[0] <= sum(s.adj_cost for s in future) <= est.cost[1]
+    # Fixing courses per session narrows the bounds
+    assert fast.sessions[0] == est.sessions[0] and fast.sessions[1] < est.sessions[1]
+
+
+def test_estimate_starts_at_a_future_first_session(tmp_path, inputs):
+    """A user whose first session is after as_of is bounded from that session, not as_of."""
+    cat = generate_catalog(seed=0, completed_frac=0, in_progress_frac=0, as_of=dt.date(2028, 4, 20))
+    assert cat.first_ses_dt == dt.date(2028, 5, 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        courses = ser.get_courses_pipeline(cat.write_csv(str(tmp_path / "c.csv")), True, cat.inperson_courses)
+        user = ser.create_new_user(cat.first_ses_dt, "Future", courses, 2015.0, None)
+        restraints = ser.generate_restraints(**cat.restraints_kwargs())
+        est = ser.estimate_schedule(user, restraints, as_of=inputs.as_of)
+        ser.generate_schedule(user, restraints, cat.spread_between, as_of=inputs.as_of)
+
+    used = [s for s in sorted(user.schedule) if s.courses]
+    assert est.first_start == cat.first_ses_dt
+    assert est.sessions[0] <= len(used) <= est.sessions[1]
+    assert est.graduation[0] <= used[-1].end_date <= est.graduation[1]
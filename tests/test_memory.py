@@ -0,0 +1,70 @@
+import contextlib
+import datetime as dt
+import io
+
+import src.services as ser
+from src.export import user_records
+from src.telemetry import MemoryProfile
+
+
+def _users(inputs, n):
+    for i in range(n):
+        user, _ = inputs(user_id=f"U{i}")
+        yield user
+
+
+def test_bounded_batch_spills_and_round_trips(inputs):
+    """Spilled users come back identical to an unbounded run; stage peaks are recorded."""
+    _, restraints = inputs()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = []
+        for user in _users(inputs, 5):
+            ser.generate_schedule(user, restraints, 15, as_of=inputs.as_of)
+            expected.extend(user_records(user))
+
+        with MemoryProfile() as mem:
+            with ser.schedule_bounded(_users(inputs, 5), restraints, 15, max_held=2, memory=mem, as_of=inputs.as_of) as buf:
+                with mem.stage("export"):
+                    got = [rec for user in buf for rec in user_records(user)]
+                stats = buf.stats()
+
+    assert got == expected
+    assert stats["users"] == 5 and stats["spilled"] == 4 and stats["held"] == 1
+    summary = mem.summary()
+    assert summary["schedule"]["count"] == 5 and summary["spill"]["count"] == 2
+    assert all(st["peak_traced_bytes"] > 0 for st in summary.values())
+
+
+def test_nested_stage_peak_includes_inner():
+    """An outer stage's peak covers allocations made in its nested stages."""
+    with MemoryProfile() as mem:
+        with mem.stage("outer"):
+            with mem.stage("inner"):
+                block = bytearray(8 << 20)
+                del block
+            with mem.stage("after"):
+                pass
+    s = mem.summary()
+    assert s["outer"]["peak_traced_bytes"] >= s["inner"]["peak_traced_bytes"] >= 8 << 20
+    assert s["after"]["peak_traced_bytes"] < 8 << 20
+
+
+def test_bounded_batch_records_failed_user_and_keeps_going(inputs):
+    """A user that fails is recorded in `failed`; users spilled before and after it are kept."""
+    _, restraints = inputs()
+
+    def users():
+        yield from _users(inputs, 3)
+        bad, _ = inputs(user_id="Bad")
+        bad.first_ses_dt = dt.date(2025, 6, 1)     # not a session month
+        yield bad
+        yield from _users(inputs, 2)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ser.schedule_bounded(users(), restraints, 15, max_held=2, as_of=inputs.as_of) as buf:
+            ids = [user.id_ for user in buf]
+            stats = buf.stats()
+
+    assert ids == ["U0", "U1", "U2", "U0", "U1"]
+    assert list(buf.failed) == ["Bad"] and buf.failed["Bad"].startswith("ValueError")
+    assert stats["users"] == 5 and stats["failed"] == 1 and stats["spilled"] == 4
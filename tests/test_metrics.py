@@ -0,0 +1,47 @@
+import contextlib
+import io
+import pickle
+
+import pytest
+
+import src.services as ser
+from config.course_enums import SessErrENUM
+from src.scheduling import SchedulingError, error_category
+from src.telemetry import MetricsRegistry
+
+
+def test_failures_are_counted_by_sesserr_code(inputs):
+    """A coded SchedulingError keeps its code through pickling and is counted under it."""
+    metrics = MetricsRegistry()
+    user, restraints = inputs(exceed_benefits=False)
+    with pytest.raises(SchedulingError) as exc, contextlib.redirect_stdout(io.StringIO()):
+        ser.generate_schedule(user, restraints, 15, as_of=inputs.as_of, metrics=metrics)
+
+    assert exc.value.code is SessErrENUM.OUT_OF_BENEFITS
+    assert pickle.loads(pickle.dumps(exc.value)).code is SessErrENUM.OUT_OF_BENEFITS
+    assert error_category(ValueError("x")) == "ValueError"
+    assert metrics.counter("scheduler_failures").get(category="OUT_OF_BENEFITS") == 1
+    assert metrics.counter("scheduler_users").get(result="error") == 1
+
+
+def test_successes_and_stage_timings_merge_into_openmetrics(inputs):
+    """Per-worker snapshots merge into one registry and render as OpenMetrics text."""
+    workers = []
+    for _ in range(2):
+        metrics = MetricsRegistry()
+        user, restraints = inputs()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ser.generate_schedule(user, restraints, 15, as_of=inputs.as_of, metrics=metrics)
+        workers.append(metrics.snapshot())
+
+    total = MetricsRegistry()
+    for snap in workers:
+        total.merge(pickle.loads(pickle.dumps(snap)))
+    text = total.to_openmetrics()
+
+    assert total.counter("scheduler_users").get(result="ok") == 2
+    assert total.counter("scheduler_sessions").get() == 2 * len(user.schedule)
+    assert total.histogram("scheduler_stage_seconds").count(stage="create_all_sessions") == 2
+    assert 'scheduler_users_total{result="ok"} 2' in text
+    assert 'scheduler_stage_seconds_bucket{stage="create_all_sessions",le="+Inf"} 2' in text
+    assert text.endswith("# EOF\n")
@@ -0,0 +1,44 @@
+from src.scheduling import OptimizeConfig
+
+
+def _user(inputs, optimize=None):
+    return inputs.scheduled(18, optimize, ses_min_class=1, ses_max_class=5)
+
+
+def test_optimizer_uses_fewer_sessions_and_keeps_rules(inputs):
+    """The local search packs the spread-out greedy plan into fewer sessions without
+    raising cost or breaking prereq order, class counts or capstone-last."""
+    greedy = _user(inputs)
+    opt = _user(inputs, OptimizeConfig(max_iters=3000, seed=1))
+
+    assert len(opt.schedule) < len(greedy.schedule)
+    assert sum(s.adj_cost for s in opt.schedule) <= sum(s.adj_cost for s in greedy.schedule)
+    assert sorted(c.course_id for s in opt.schedule for c in s.courses) == \
+        sorted(c.course_id for s in greedy.schedule for c in s.courses)
+
+    done = {c.course_id for c in opt.assigned_courses} - {c.course_id for s in opt.schedule for c in s.courses}
+    for s in sorted(opt.schedule):
+        assert 1 <= len(s.courses) <= 5
+        for c in s.courses:
+            for pre in c.pre_reqs:
+                options = pre if isinstance(pre, list) else [pre]
+                assert any(p in done for p in options), (c.course_id, pre)
+        done |= {c.course_id for c in s.courses}
+    assert any(c.capstone for c in sorted(opt.schedule)[-1].courses)
+
+    # GI Bill re-charged in order: each future benefit year's ledger matches its sessions
+    g = opt.gib
+    this_year = g.year_start_for(inputs.as_of)
+    for st, year in g.benefit_years.items():
+        if st <= this_year:
+            continue
+        used = sum(s.gib_applied for s in opt.schedule if g.year_start_for(s.start_date) == st)
+        assert abs(g.yearly_amount - year.amount - used) < 1e-6
+
+
+def test_optimizer_is_repeatable_with_seed(inputs):
+    """Same seed and iteration budget, same schedule."""
+    a = _user(inputs, OptimizeConfig(max_iters=1000, seed=7))
+    b = _user(inputs, OptimizeConfig(max_iters=1000, seed=7))
+    assert [(s.num, [c.course_id for c in s.courses]) for s in a.schedule] == \
+        [(s.num, [c.course_id for c in s.courses]) for s in b.schedule]
@@ -0,0 +1,63 @@
+import contextlib
+import copy
+import io
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import src.services as ser
+from src.scheduling import Plan, UserState
+
+
+def test_plan_matches_mutating_api_and_leaves_inputs_alone(inputs):
+    """plan() gives the same schedule as generate_schedule without touching its inputs."""
+    user, restraints = inputs()
+    state = UserState.from_user(user)
+    catalog = copy.deepcopy(user.courses)
+    before = [vars(c).copy() for c in catalog]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        p = ser.plan(catalog, state, restraints, as_of=inputs.as_of, spread_between=15)
+        ser.generate_schedule(user, restraints, 15, as_of=inputs.as_of)
+
+    assert p == Plan.from_user(user, inputs.as_of)
+    assert [vars(c) for c in catalog] == before
+    assert UserState.from_user(user).courses == state.courses
+    hash(p)
+
+
+def test_plan_is_repeatable_across_threads(inputs):
+    """Concurrent plans on shared inputs are identical."""
+    user, restraints = inputs()
+    state = UserState.from_user(user)
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(4) as pool:
+            plans = list(pool.map(
+                lambda _: ser.plan(user.courses, state, restraints, as_of=inputs.as_of, spread_between=15),
+                range(8),
+            ))
+    assert len(set(plans)) == 1
+
+
+def test_coalescer_runs_identical_requests_once(inputs):
+    """Identical concurrent requests (any user id) share one run until the TTL expires."""
+    user, restraints = inputs()
+    state = UserState.from_user(user)
+    other = replace(state, user_id="User2")
+    now = [0.0]
+    co = ser.PlanCoalescer(ttl=10, clock=lambda: now[0])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(4) as pool:
+            plans = list(pool.map(
+                lambda s: co.plan(user.courses, s, restraints, as_of=inputs.as_of, spread_between=15),
+                [state, other] * 4,
+            ))
+        assert co.stats["executed"] == 1
+        assert co.stats["coalesced"] + co.stats["cache_hits"] == 7
+        assert {p.user_id for p in plans} == {"User1", "User2"}
+        assert len({replace(p, user_id=None) for p in plans}) == 1
+
+        now[0] = 11
+        co.plan(user.courses, state, restraints, as_of=inputs.as_of, spread_between=15)
+        co.plan(user.courses, state, restraints, as_of=inputs.as_of, spread_between=16)
+    assert co.stats["executed"] == 3
@@ -0,0 +1,36 @@
+from src.telemetry import RunProfile, Span, aggregate_profiles
+
+
+def _profile(run_id, durations: dict) -> RunProfile:
+    p = RunProfile(run_id)
+    for name, ns in durations.items():
+        p.spans.append(Span(name, 0, ns))
+    return p
+
+
+def test_aggregate_profiles():
+    """
+    Unit test for aggregate_profiles(), nearest-rank percentiles per stage, with
+    repeated spans in one run summed first.
+    """
+    profiles = [_profile(i, {"schedule_free": (i + 1) * 100}) for i in range(100)]
+    # Two spans with the same name in one run count as one per-run total
+    profiles[0].spans.append(Span("schedule_free", 0, 50))
+
+    stats = aggregate_profiles(profiles)["schedule_free"]
+    assert stats["count"] == 100
+    assert stats["p50_ns"] == 5000, stats
+    assert stats["p95_ns"] == 9500, stats
+    assert stats["p99_ns"] == 9900, stats
+
+
+def test_span_recorded_on_raise():
+    """Spans are kept even when the timed stage raises."""
+    p = RunProfile("u")
+    try:
+        with p.span("schedule_set"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert [s.name for s in p.spans] == ["schedule_set"]
+    assert p.spans[0].duration_ns >= 0
@@ -0,0 +1,72 @@
+import datetime as dt
+from types import SimpleNamespace
+
+from config.course_enums import LevelENUM, SessErrENUM, StatusENUM
+from src.scheduling import Course, Restraints, Session
+from src.scheduling.propagation import propagate
+
+
+def _course(cid, pre=(), capstone=False):
+    return Course(cid, 3, StatusENUM.NONE, LevelENUM.UNDERGRAD, list(pre), capstone=capstone)
+
+
+def _sessions(n):
+    out = []
+    for i in range(n):
+        s = Session(i + 1, dt.date(2030, 1, 1) + dt.timedelta(weeks=8 * i), 1 + (2 * i) % 12)
+        s.level = LevelENUM.UNDERGRAD
+        out.append(s)
+    return out
+
+
+def test_prereq_chain_and_capstone_bounds():
+    """Depth sets the earliest session, height the latest; capstones go last."""
+    courses = [
+        _course("A"), _course("B", ["A"]), _course("C", ["B"]),
+        _course("D", [["B", "X"]]),             # X is done, so D is free
+        _course("CAP", capstone=True), _course("E"),
+    ]
+    dom = propagate(courses, _sessions(3), Restraints(), ["X"], capacity=[2, 2, 2])
+
+    assert dom.feasible
+    assert dom.bounds["A"] == (0, 0)
+    assert dom.bounds["B"] == (1, 1)
+    assert dom.bounds["C"] == (2, 2)
+    assert dom.bounds["D"] == (0, 2)
+    assert dom.bounds["CAP"] == (2, 2)
+    assert dom.due(0) == ["A"]
+
+
+def test_infeasible_levels_detected_up_front():
+    """Chains longer than the sessions, too many courses forced late, and missing
+    prereqs are reported before anything is placed."""
+    chain = [_course("A"), _course("B", ["A"]), _course("C", ["B"])]
+    assert not propagate(chain, _sessions(2), Restraints(), [], capacity=[2, 1]).feasible
+
+    late = [_course("A"), _course("B", ["A"]), _course("C", ["A"]), _course("D", ["A"])]
+    dom = propagate(late, _sessions(2), Restraints(), [], capacity=[2, 2])
+    assert any("courses" in c for c in dom.conflicts)
+
+    missing = [_course("A", ["ZZZ"]), _course("B")]
+    dom = propagate(missing, _sessions(1), Restraints(), [], capacity=[2])
+    assert any("ZZZ" in c for c in dom.conflicts)
+
+
+def test_no_feasible_session_reports_the_capping_rule():
+    """A course ruled out by the GI Bill or the in-person window is coded by that rule,
+    not as a prereq failure; a chain longer than the sessions stays PREREQ_NOT_MET."""
+    chain = [_course("A"), _course("B", ["A"]), _course("C", ["B"])]
+
+    def codes(dom):
+        return {c.split(":")[0]: code for c, code in zip(dom.conflicts, dom.codes)}
+
+    gib = SimpleNamespace(remaining_days=60, asof=dt.date(2000, 1, 1))     # covers two sessions
+    dom = propagate(chain, _sessions(3), Restraints(), [], capacity=[1, 1, 1], minimum=[0, 0, 0], gib=gib)
+    assert codes(dom)["C"] is SessErrENUM.OUT_OF_BENEFITS
+
+    r = Restraints(inperson_courses=["C"], in_person_end_dt=dt.date(2030, 1, 1), min_inperson=1)
+    dom = propagate(chain, _sessions(3), r, [], capacity=[1, 1, 1], capstone_last=False)
+    assert codes(dom)["C"] is SessErrENUM.NOT_INPERSON
+
+    dom = propagate(chain, _sessions(2), Restraints(), [], capacity=[2, 1])
+    assert codes(dom)["C"] is SessErrENUM.PREREQ_NOT_MET
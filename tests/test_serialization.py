@@ -0,0 +1,36 @@
+import pickle
+
+import pytest
+
+from src.storage import Catalog, encode_user, decode_user
+
+
+@pytest.mark.parametrize("method", ["pickle", "codec"])
+def test_user_round_trip_is_lossless(method, inputs):
+    """A scheduled user survives pickle and the binary codec unchanged, with object sharing kept."""
+    user = inputs.scheduled()
+    catalog = Catalog(user.courses)
+    if method == "pickle":
+        loaded = pickle.loads(pickle.dumps(user))
+    else:
+        loaded = decode_user(encode_user(user, catalog), catalog)
+
+    assert inputs.snapshot(loaded) == inputs.snapshot(user)
+    # Sessions in both schedule and free_sessions are still one object
+    sched = {id(s) for s in loaded.schedule}
+    assert any(id(s) in sched for s in loaded.free_sessions)
+    # Session courses are the user's Course objects
+    owned = {id(c) for c in loaded.courses}
+    assert all(id(c) in owned for s in loaded.schedule for c in s.courses)
+    assert loaded.gib.active_benefit_year is loaded.gib.benefit_years[loaded.gib.active_benefit_year.st]
+
+
+def test_codec_rejects_foreign_bytes(inputs):
+    """Bad magic and unknown versions raise ValueError."""
+    user = inputs.scheduled()
+    catalog = Catalog(user.courses)
+    data = encode_user(user, catalog)
+    with pytest.raises(ValueError):
+        decode_user(b"XYZ" + data[3:], catalog)
+    with pytest.raises(ValueError):
+        decode_user(data[:3] + bytes([99]) + data[4:], catalog)
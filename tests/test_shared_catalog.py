@@ -0,0 +1,49 @@
+import datetime as dt
+import pickle
+
+import src.services as ser
+from src.batch import SharedCatalog, UserOverlay
+from src.export import session_record
+from src.scheduling import Course
+
+
+def _fields(c: Course) -> tuple:
+    return (c.course_id, c.credit_hours, c.status, c.level, c.pre_reqs, c.capstone,
+            c.session, c.transfer_intent, c.challenge_intent, c.priority, c.cost)
+
+
+def test_shared_catalog_round_trip():
+    """Courses rebuilt from the shared catalog plus an overlay match the originals."""
+    courses = [
+        Course("ENG101", 3, 2, 0, [], session=1, priority=3),
+        Course("ENG102", 3, 1, 0, ["ENG101"], session=2, priority=2),
+        Course("CS200", 4, 0, 0, ["ENG101", ["MATH1", "MATH1C"]], transfer_intent=True, priority=1),
+        Course("CAP499", 2, 0, 0, ["CS200"], capstone=True, priority=-5),
+        Course("MBA500", 3, 0, 1, [], challenge_intent=True),
+    ]
+    with SharedCatalog.create(courses) as cat:
+        overlay = UserOverlay.from_courses("u1", courses, cat)
+        worker = SharedCatalog.attach(cat.spec)
+        try:
+            rebuilt = worker.build_courses(pickle.loads(pickle.dumps(overlay)))
+        finally:
+            worker.close()
+
+        assert [_fields(c) for c in rebuilt] == [_fields(c) for c in courses]
+        # A student with no history ships no per-course entries
+        assert UserOverlay.from_courses("new", cat.build_courses(), cat).entries == b""
+
+
+def test_schedule_shared_matches_in_process_schedule(inputs):
+    """Pool workers schedule each overlay as generate_schedule does, at the given as_of."""
+    user = inputs.scheduled()
+    fresh, restraints = inputs()
+    gib = (27120.0, (8, 1), (23, 10), dt.date(2025, 8, 27).toordinal())     # as the fixture's GI Bill
+    with SharedCatalog.create(fresh.courses) as cat:
+        overlays = [UserOverlay.from_courses(uid, fresh.courses, cat, fresh.first_ses_dt, fresh.grants, gib)
+                    for uid in ("User1", "User2")]
+        results = list(ser.schedule_shared(cat, overlays, restraints, 15, processes=1, as_of=inputs.as_of))
+
+    expected = [session_record(s) for s in sorted(user.schedule)]
+    assert sorted(r["user_id"] for r in results) == ["User1", "User2"]
+    assert all(r["status"] == "ok" and r["sessions"] == expected for r in results)
@@ -0,0 +1,39 @@
+import pytest
+
+from src.intake import parse_prereqs, format_prereqs
+from src.storage import SQLiteStore
+from src.user import User
+
+
+def test_format_prereqs_inverts_parse():
+    """format_prereqs writes the intake string parse_prereqs reads."""
+    for s in ["", "A", "A|B", "A|[B|C]|D", "[X]"]:
+        assert format_prereqs(parse_prereqs(s)) == s
+
+
+def test_sqlite_round_trip(tmp_path, inputs):
+    """Saved users load back unchanged; re-saving replaces rows instead of duplicating."""
+    user = inputs.scheduled()
+    with SQLiteStore(str(tmp_path / "s.db")) as store:
+        store.save_users([user])
+        user.schedule.pop()
+        store.save_user(user)
+        assert store.count() == 1
+
+        loaded = store.load_user("User1")
+        assert inputs.snapshot(loaded) == inputs.snapshot(user)
+        sched = {id(s) for s in loaded.schedule}
+        assert any(id(s) in sched for s in loaded.free_sessions)
+
+        with pytest.raises(KeyError):
+            store.load_users(["User1", "nobody"])
+
+
+def test_sqlite_user_without_gib(inputs):
+    """A user with no GI Bill and no schedule round-trips through the iterator."""
+    user = User("u2", all_courses=inputs.scheduled().courses)
+    with SQLiteStore() as store:
+        store.save_user(user)
+        (loaded,) = list(store.iter_users())
+    assert loaded.gib is None and loaded.first_ses_dt is None
+    assert [vars(c) for c in loaded.courses] == [vars(c) for c in user.courses]
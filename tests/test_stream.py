@@ -0,0 +1,43 @@
+import contextlib
+import io
+import itertools
+
+import src.services as ser
+from src.export import session_record
+
+
+def _records(user):
+    return [session_record(s) for s in sorted(user.schedule)]
+
+
+def test_exhausted_stream_matches_generate_schedule(inputs):
+    """Draining stream_schedule leaves the user exactly as generate_schedule does."""
+    full, restraints = inputs()
+    streamed, _ = inputs()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ser.generate_schedule(full, restraints, 15, as_of=inputs.as_of)
+        yielded = list(ser.stream_schedule(streamed, restraints, 15, as_of=inputs.as_of))
+
+    assert yielded and all(s in streamed.schedule for s in yielded)
+    assert [s.start_date for s in yielded] == sorted(s.start_date for s in yielded)
+    assert _records(streamed) == _records(full)
+    assert streamed.gib.remaining_days == full.gib.remaining_days
+
+
+def test_stopping_early_skips_the_rest_of_the_plan(inputs):
+    """Taking two sessions commits just those two, already charged."""
+    full, restraints = inputs()
+    user, _ = inputs()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ser.generate_schedule(full, restraints, 15, as_of=inputs.as_of)
+        stream = ser.stream_schedule(user, restraints, 15, as_of=inputs.as_of)
+        first = list(itertools.islice(stream, 2))
+        stream.close()
+
+    full_records = {r["start_date"]: r for r in _records(full)}
+    past = len([s for s in full.schedule if s.start_date < inputs.as_of])
+    assert len(user.schedule) == past + 2
+    for s in first:
+        rec = session_record(s)
+        # Intents are attached after the last session; everything else is final
+        assert {**rec, "intent_courses": []} == {**full_records[rec["start_date"]], "intent_courses": []}
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from benchmarks.synthetic import CSV_COLUMNS, generate_catalog
+from benchmarks.bench_stages import run_pipeline
+
+
+def test_catalog_schema(tmp_path):
+    """Generated files use the exact course_input.csv columns and pass intake validation."""
+    cat = generate_catalog(60, inperson_frac=0.1, grad_frac=0.2, seed=3)
+    path = cat.write_csv(str(tmp_path / "c.csv"))
+
+    assert list(pd.read_csv(path).columns) == CSV_COLUMNS
+    assert generate_catalog(60, inperson_frac=0.1, grad_frac=0.2, seed=3).rows == cat.rows
+
+
+def test_catalog_schedules(tmp_path):
+    """A generated catalog schedules end-to-end with every stage timed."""
+    cat = generate_catalog(80, depth=5, or_density=0.4, inperson_frac=0.05, seed=1)
+    path = cat.write_csv(str(tmp_path / "c.csv"))
+
+    prof = run_pipeline(path, cat, str(tmp_path / "out.csv"))
+    names = {s.name for s in prof.spans}
+    assert {"fetch_data", "create_all_sessions", "schedule_free", "export_schedule"} <= names
+    assert len(pd.read_csv(tmp_path / "out.csv")) > 0
@@ -0,0 +1,88 @@
+import contextlib
+import copy
+import io
+
+import src.services as ser
+from src.analytics import ScheduleValidator
+from src.storage import ColumnarScheduleStore
+
+
+def _scheduled(inputs):
+    user, restraints = inputs()
+    catalog = copy.deepcopy(user.courses)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ser.generate_schedule(user, restraints, 15, as_of=inputs.as_of)
+    return user, restraints, catalog
+
+
+def test_clean_schedules_pass_from_users_and_store(tmp_path, inputs):
+    """Scheduler output has no violations, read from users or a columnar store."""
+    a, restraints, catalog = _scheduled(inputs)
+    b = copy.deepcopy(a)
+    b.id_ = "User2"
+    v = ScheduleValidator(catalog, restraints, as_of=inputs.as_of)
+
+    report = v.validate_users([a, b])
+    assert report.ok, report.violations
+    assert report.n_users == 2
+
+    with ColumnarScheduleStore(str(tmp_path)) as store:
+        store.append_users([a, b])
+    g = a.gib
+    v = ScheduleValidator(catalog, restraints, as_of=inputs.as_of, yearly_amount=g.yearly_amount,
+                          benefit_start=(g.benefit_start.month, g.benefit_start.day))
+    # Statuses are not stored: only prereqs done outside the plan are left unverified
+    viol = v.validate_store(ColumnarScheduleStore(str(tmp_path))).violations
+    planned = {c.course_id for s in a.schedule for c in s.courses}
+    assert set(viol["rule"]) == {"prereq_unverified"}
+    pre = {c.course_id: c for c in catalog}
+    for cid in set(viol["course_id"]):
+        assert any(not set(g if isinstance(g, list) else [g]) & planned for g in pre[cid].pre_reqs), cid
+
+
+def test_injected_faults_reported_by_user_and_rule(inputs):
+    """Swapped prereqs, duplicates, bad counts and bad costs are each found."""
+    good, restraints, catalog = _scheduled(inputs)
+    bad = copy.deepcopy(good)
+    bad.id_ = "Bad"
+    future = [s for s in sorted(bad.schedule) if s.start_date >= inputs.as_of and s.courses]
+    pre = {c.course_id: c for c in catalog}
+
+    # Move a course with a scheduled prereq ahead of that prereq
+    later = next(c for s in future[1:] for c in s.courses
+                 if any(p in {x.course_id for x in future[0].courses} for g in pre[c.course_id].pre_reqs
+                        for p in (g if isinstance(g, list) else [g])))
+    future[0].courses.append(later)
+    future[0]._adj_cost += 1
+    future[-1].courses.extend([future[-1].courses[0]] * 4)
+
+    report = ScheduleValidator(catalog, restraints, as_of=inputs.as_of).validate_users([good, bad])
+    summary = report.summary()
+    assert not report.ok
+    assert report.bad_users() == ["Bad"]
+    for rule in ("prereq", "duplicate", "class_count", "cost"):
+        assert summary[rule] > 0, rule
+    assert later.course_id in set(report.violations.loc[report.violations["rule"] == "prereq", "course_id"])
+    assert report.by_user().loc["Bad"].sum() == len(report.violations)
+
+
+def test_dropped_prereq_is_a_violation_not_done(tmp_path, inputs):
+    """A dependent whose only prereq was dropped from the plan is a prereq violation for
+    users (the prereq is not completed or intended), and unverified from a store."""
+    user, restraints, catalog = _scheduled(inputs)
+    future = [s for s in sorted(user.schedule) if s.start_date >= inputs.as_of and s.courses]
+    where = {c.course_id: s for s in future for c in s.courses}
+    dep, dropped = next((c.course_id, g) for s in future for c in s.courses for g in c.pre_reqs
+                        if isinstance(g, str) and g in where)
+    s = where[dropped]
+    s.courses.remove(next(c for c in s.courses if c.course_id == dropped))
+
+    viol = ScheduleValidator(catalog, restraints, as_of=inputs.as_of).validate_users([user]).violations
+    assert dep in set(viol.loc[viol["rule"] == "prereq", "course_id"])
+
+    with ColumnarScheduleStore(str(tmp_path)) as store:
+        store.append_users([user])
+    viol = ScheduleValidator(catalog, restraints, as_of=inputs.as_of).validate_store(
+        ColumnarScheduleStore(str(tmp_path))).violations
+    assert dep in set(viol.loc[viol["rule"] == "prereq_unverified", "course_id"])
+    assert dep not in set(viol.loc[viol["rule"] == "prereq", "course_id"])